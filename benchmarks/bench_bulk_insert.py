@@ -0,0 +1,56 @@
+"""
+Compara a vazão (linhas/s) do POST /products/ linha a linha com o
+caminho em lote (COPY) do ProductUsecase.
+
+    python -m benchmarks.bench_bulk_insert --rows 10000
+"""
+import argparse
+import asyncio
+
+from benchmarks.common import Stopwatch, open_pool, synthetic_products
+from store.schemas.schemas_product import ProductIn
+from store.usecases.usecases_product import ProductUsecase
+
+
+async def _aiter(items):
+    for item in items:
+        yield item
+
+
+async def _cleanup(pool, ids) -> None:
+    async with pool.connection() as conn:
+        await conn.execute("DELETE FROM products WHERE id = ANY(%s);", (list(ids),))
+
+
+async def main(rows: int, concurrency: int) -> None:
+    data = synthetic_products(rows)
+
+    async with open_pool(max_size=concurrency) as pool:
+        usecase = ProductUsecase(pool=pool)
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def create_one(item):
+            async with semaphore:
+                return await usecase.create(body=ProductIn(**item))
+
+        with Stopwatch() as single:
+            created = await asyncio.gather(*(create_one(item) for item in data))
+        await _cleanup(pool, [product.id for product in created])
+
+        with Stopwatch() as bulk:
+            result = await usecase.bulk_create(items=_aiter(data))
+        await _cleanup(pool, result.ids)
+
+    print(f"rows={rows} concurrency={concurrency}")
+    print(f"single-row create: {rows / single.elapsed:10.0f} rows/s")
+    print(f"bulk COPY:         {rows / bulk.elapsed:10.0f} rows/s")
+    print(f"speedup:           {single.elapsed / bulk.elapsed:10.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--concurrency", type=int, default=10)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.concurrency))
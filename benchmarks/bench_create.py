@@ -0,0 +1,75 @@
+"""
+Pico de criações independentes: centenas de clientes chamando
+ProductUsecase.create() ao mesmo tempo.
+
+Compara o caminho atual (um INSERT e um commit por chamada, cada uma com a
+sua conexão) com o group commit (WriteCoalescer), que junta as chamadas
+de uma janela num único INSERT ... SELECT unnest(). Reporta vazão,
+latências e quantos lotes foram gravados.
+
+    python -m benchmarks.bench_create --clients 200 --creates 20 \\
+        --window 0.002 --max-batch 256
+"""
+import argparse
+import asyncio
+import time
+
+from benchmarks.common import open_pool, summarize, synthetic_products
+from store.core.core_coalescer import WriteCoalescer
+from store.schemas.schemas_product import ProductIn
+from store.usecases.usecases_product import ProductUsecase
+
+
+async def _run(usecase: ProductUsecase, clients: int, creates: int) -> dict:
+    bodies = [ProductIn(**item) for item in synthetic_products(clients * creates)]
+    samples = []
+    ids = []
+
+    async def client(offset: int) -> None:
+        for body in bodies[offset : offset + creates]:
+            began = time.perf_counter()
+            ids.append((await usecase.create(body=body)).id)
+            samples.append(time.perf_counter() - began)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client(n * creates) for n in range(clients)))
+    stats = summarize(samples, time.perf_counter() - start)
+
+    async with usecase.pool.connection() as conn:
+        await conn.execute("DELETE FROM products WHERE id = ANY(%s);", (ids,))
+    return stats
+
+
+async def main(
+    clients: int, creates: int, window: float, max_batch: int, pool_size: int
+) -> None:
+    async with open_pool(max_size=pool_size) as pool:
+        for name, coalescer in (
+            ("um INSERT por chamada", None),
+            (
+                f"group commit ({window * 1000:g} ms / {max_batch})",
+                WriteCoalescer(window=window, max_batch=max_batch),
+            ),
+        ):
+            stats = await _run(
+                ProductUsecase(pool=pool, coalescer=coalescer), clients, creates
+            )
+            batches = f"  lotes={coalescer.batches}" if coalescer else ""
+            print(
+                f"{name:30} {stats['throughput']:8.1f} op/s  "
+                f"p50={stats['p50_ms']:7.2f}  p99={stats['p99_ms']:7.2f} ms"
+                f"{batches}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--creates", type=int, default=20, help="por cliente")
+    parser.add_argument("--window", type=float, default=0.002, help="segundos")
+    parser.add_argument("--max-batch", type=int, default=256)
+    parser.add_argument("--pool-size", type=int, default=10)
+    args = parser.parse_args()
+    asyncio.run(
+        main(args.clients, args.creates, args.window, args.max_batch, args.pool_size)
+    )
@@ -0,0 +1,76 @@
+"""
+Codificação da resposta de GET /products/ (ProductPage), sem banco.
+
+Antes: o caminho padrão do FastAPI para `-> ProductPage` (validação do
+response_model, conversão para dict em modo JSON e json.dumps da
+JSONResponse). Depois: FastJSONResponse(page), que serializa direto do
+schema pelo pydantic-core. Também mede FastJSONResponse com conteúdo já
+convertido (rotas que continuam devolvendo o modelo ao FastAPI).
+
+    python -m benchmarks.bench_json --items 1000 10000
+"""
+import argparse
+import asyncio
+import time
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from benchmarks.bench_serialization import _rows, trusted_row
+from store.core.core_json import FastJSONResponse
+from store.schemas.schemas_product import ProductPage
+
+FIELD = create_model_field(name="Response_pesquisar_produto", type_=ProductPage)
+
+
+async def _fastapi_default(page: ProductPage) -> bytes:
+    content = await serialize_response(field=FIELD, response_content=page)
+    return JSONResponse(content).body
+
+
+async def _fast_response_dict(page: ProductPage) -> bytes:
+    content = await serialize_response(field=FIELD, response_content=page)
+    return FastJSONResponse(content).body
+
+
+async def _fast_response_model(page: ProductPage) -> bytes:
+    return FastJSONResponse(page).body
+
+
+async def _best_of(repeat: int, encode, page: ProductPage) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await encode(page)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+async def main(sizes: list[int], repeat: int) -> None:
+    for size in sizes:
+        page = ProductPage(
+            items=[trusted_row(values) for values in _rows(size)], next_cursor=None
+        )
+        # Os três caminhos precisam gerar o mesmo JSON
+        assert await _fastapi_default(page) == await _fast_response_model(page)
+
+        print(f"items={size} (best of {repeat})")
+        for name, encode in (
+            ("FastAPI padrão (antes)", _fastapi_default),
+            ("FastJSONResponse(dict)", _fast_response_dict),
+            ("FastJSONResponse(page)", _fast_response_model),
+        ):
+            elapsed = await _best_of(repeat, encode, page)
+            print(
+                f"  {name:24} {elapsed * 1000:8.2f} ms  "
+                f"{elapsed / size * 1e6:6.2f} us/item"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, nargs="+", default=[1000, 10_000])
+    parser.add_argument("--repeat", type=int, default=15)
+    args = parser.parse_args()
+    asyncio.run(main(args.items, args.repeat))
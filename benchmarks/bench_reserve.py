@@ -0,0 +1,98 @@
+"""
+Linha quente: centenas de clientes reservando o mesmo SKU ao mesmo tempo.
+
+Compara a reserva atômica (ProductUsecase.reserve, UPDATE condicional)
+com o fluxo antigo de ler o produto e gravar a quantidade absoluta via
+PATCH (get + update), reportando vazão, latências e unidades vendidas a
+mais ou perdidas.
+
+    python -m benchmarks.bench_reserve --clients 300 --stock 5000
+"""
+import argparse
+import asyncio
+import time
+from decimal import Decimal
+
+from benchmarks.common import open_pool, summarize
+from store.core.core_exceptions import InsufficientStockException
+from store.schemas.schemas_product import ProductIn, ProductReserve, ProductUpdate
+from store.usecases.usecases_product import ProductUsecase
+
+
+async def _reserve(usecase: ProductUsecase, product_id) -> bool:
+    try:
+        await usecase.reserve(id=product_id, body=ProductReserve(quantity=1))
+        return True
+    except InsufficientStockException:
+        return False
+
+
+async def _read_modify_write(usecase: ProductUsecase, product_id) -> bool:
+    product = await usecase.get(id=product_id)
+    if product.quantity < 1:
+        return False
+    await usecase.update(
+        id=product_id, body=ProductUpdate(quantity=product.quantity - 1)
+    )
+    return True
+
+
+async def _run(usecase, operation, product_id, clients: int, attempts: int) -> dict:
+    samples = []
+    sold = 0
+
+    async def client() -> None:
+        nonlocal sold
+        for _ in range(attempts):
+            began = time.perf_counter()
+            ok = await operation(usecase, product_id)
+            samples.append(time.perf_counter() - began)
+            sold += ok
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(clients)))
+    stats = summarize(samples, time.perf_counter() - start)
+    stats["sold"] = sold
+    return stats
+
+
+async def main(clients: int, attempts: int, stock: int, pool_size: int) -> None:
+    async with open_pool(max_size=pool_size) as pool:
+        usecase = ProductUsecase(pool=pool)
+        for name, operation in (
+            ("reserve (UPDATE condicional)", _reserve),
+            ("get + PATCH absoluto", _read_modify_write),
+        ):
+            product = await usecase.create(
+                body=ProductIn(
+                    name="Hot SKU",
+                    description="Flash sale",
+                    quantity=stock,
+                    price=Decimal("9.90"),
+                    status=True,
+                )
+            )
+            try:
+                stats = await _run(usecase, operation, product.id, clients, attempts)
+                remaining = (await usecase.get(id=product.id)).quantity
+            finally:
+                await usecase.delete(id=product.id)
+
+            # Sem perdas: estoque inicial == vendidos + restante
+            lost = stock - stats["sold"] - remaining
+            print(
+                f"{name:30} {stats['throughput']:8.1f} op/s  "
+                f"p50={stats['p50_ms']:7.2f}  p99={stats['p99_ms']:7.2f} ms  "
+                f"vendidos={stats['sold']}  restante={remaining}  "
+                f"inconsistência={-lost}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clients", type=int, default=300)
+    parser.add_argument("--attempts", type=int, default=20, help="por cliente")
+    parser.add_argument("--stock", type=int, default=5000)
+    parser.add_argument("--pool-size", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.clients, args.attempts, args.stock, args.pool_size))
@@ -0,0 +1,101 @@
+"""
+Micro-benchmark da conversão linha -> ProductOut -> JSON, sem banco.
+
+Compara o caminho antigo (validação completa do schema + a volta
+Decimal -> str -> Decimal que o validator de OutSchema fazia) com o
+caminho confiável usado hoje (store.db.db_rows.model_row).
+
+    python -m benchmarks.bench_serialization --rows 10000
+"""
+import argparse
+import time
+from datetime import datetime, timezone
+from decimal import Decimal
+from uuid import uuid4
+
+from pydantic import TypeAdapter
+
+from benchmarks.common import synthetic_products
+from store.db.db_rows import model_row
+from store.schemas.schemas_product import ProductOut
+
+COLUMNS = [
+    "id",
+    "name",
+    "description",
+    "price",
+    "quantity",
+    "status",
+    "created_at",
+    "updated_at",
+]
+
+
+def _rows(count: int) -> list[tuple]:
+    now = datetime.now(timezone.utc)
+    return [
+        (
+            uuid4(),
+            item["name"],
+            item["description"],
+            item["price"],
+            item["quantity"],
+            item["status"],
+            now,
+            now,
+        )
+        for item in synthetic_products(count)
+    ]
+
+
+def legacy_row(values: tuple) -> ProductOut:
+    data = dict(zip(COLUMNS, values))
+    for key, value in data.items():
+        if isinstance(value, Decimal):
+            data[key] = Decimal(str(value))
+    return ProductOut(**data)
+
+
+class _Column:
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+
+class _Cursor:
+    description = [_Column(name) for name in COLUMNS]
+
+
+trusted_row = model_row(ProductOut)(_Cursor())
+
+
+def _best_of(repeat: int, fn) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(rows: int, repeat: int) -> None:
+    data = _rows(rows)
+    adapter = TypeAdapter(list[ProductOut])
+    products = [trusted_row(values) for values in data]
+
+    results = {
+        "legacy build": _best_of(repeat, lambda: [legacy_row(v) for v in data]),
+        "trusted build": _best_of(repeat, lambda: [trusted_row(v) for v in data]),
+        "json encode": _best_of(repeat, lambda: adapter.dump_json(products)),
+    }
+
+    print(f"rows={rows} (best of {repeat})")
+    for name, elapsed in results.items():
+        print(f"{name:14} {elapsed * 1000:8.1f} ms  {elapsed / rows * 1e6:6.2f} us/row")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=15)
+    args = parser.parse_args()
+    main(args.rows, args.repeat)
@@ -0,0 +1,96 @@
+"""
+Latência p50/p99 do ProductUsecase com e sem statements preparados e
+pipeline mode (settings DB_PREPARED_STATEMENTS / DB_PIPELINE).
+
+    python -m benchmarks.bench_statements --iterations 2000
+"""
+import argparse
+import asyncio
+import random
+import time
+from decimal import Decimal
+
+from benchmarks.common import open_pool, summarize, synthetic_products
+from store.schemas.schemas_product import (
+    ProductBatchUpdate,
+    ProductFilter,
+    ProductIn,
+    ProductUpdate,
+)
+from store.usecases.usecases_product import ProductUsecase
+
+# Um item por formato de PATCH: força um statement por formato no lote
+BATCH_SHAPES = [
+    {"quantity": 1},
+    {"price": Decimal("1.00")},
+    {"status": True},
+    {"quantity": 2, "price": Decimal("2.00")},
+    {"quantity": 3, "status": False},
+    {"price": Decimal("3.00"), "status": True},
+]
+
+
+async def _measure(iterations: int, operation) -> dict:
+    samples = []
+    start = time.perf_counter()
+    for _ in range(iterations):
+        began = time.perf_counter()
+        await operation()
+        samples.append(time.perf_counter() - began)
+    return summarize(samples, time.perf_counter() - start)
+
+
+async def _run(usecase: ProductUsecase, ids, iterations: int) -> dict:
+    rng = random.Random(7)
+    return {
+        "get": await _measure(iterations, lambda: usecase.get(id=rng.choice(ids))),
+        "update": await _measure(
+            iterations,
+            lambda: usecase.update(
+                id=rng.choice(ids), body=ProductUpdate(quantity=rng.randint(0, 99))
+            ),
+        ),
+        "query": await _measure(
+            iterations, lambda: usecase.query(filters=ProductFilter(status=True))
+        ),
+        "batch_update": await _measure(
+            iterations // 10,
+            lambda: usecase.batch_update(
+                items=[
+                    ProductBatchUpdate(id=rng.choice(ids), **shape)
+                    for shape in BATCH_SHAPES
+                ]
+            ),
+        ),
+    }
+
+
+async def main(iterations: int, rows: int) -> None:
+    async with open_pool(max_size=1) as pool:
+        seed = ProductUsecase(pool=pool)
+        ids = [
+            (await seed.create(body=ProductIn(**item))).id
+            for item in synthetic_products(rows)
+        ]
+        try:
+            for prepare, pipeline in ((False, False), (True, True)):
+                usecase = ProductUsecase(pool=pool, prepare=prepare, pipeline=pipeline)
+                await _run(usecase, ids, iterations // 10)  # aquecimento
+                results = await _run(usecase, ids, iterations)
+                print(f"prepare={prepare} pipeline={pipeline}")
+                for name, stats in results.items():
+                    print(
+                        f"  {name:13} p50={stats['p50_ms']:7.3f} ms "
+                        f"p99={stats['p99_ms']:7.3f} ms"
+                    )
+        finally:
+            async with pool.connection() as conn:
+                await conn.execute("DELETE FROM products WHERE id = ANY(%s);", (ids,))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--rows", type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(main(args.iterations, args.rows))
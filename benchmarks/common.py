@@ -0,0 +1,85 @@
+"""
+Utilitários compartilhados pelos benchmarks.
+
+Os scripts usam o mesmo DATABASE_URL da aplicação (o Postgres do
+docker-compose serve). Rode-os contra um banco descartável.
+"""
+import os
+import random
+import statistics
+import time
+from contextlib import asynccontextmanager
+from decimal import Decimal
+from typing import AsyncIterator, Dict, List
+
+from dotenv import load_dotenv
+from psycopg_pool import AsyncConnectionPool
+
+from store.db.db_migrations import migrate
+
+load_dotenv()
+
+
+def database_url() -> str:
+    dsn = os.getenv("DATABASE_URL")
+    if not dsn:
+        raise SystemExit("DATABASE_URL environment variable not set.")
+    return dsn
+
+
+@asynccontextmanager
+async def open_pool(max_size: int = 10) -> AsyncIterator[AsyncConnectionPool]:
+    """Abre um pool dedicado, com o schema atualizado pelas migrations."""
+    await migrate(database_url())
+    pool = AsyncConnectionPool(
+        database_url(), min_size=1, max_size=max_size, open=False
+    )
+    await pool.open()
+    try:
+        yield pool
+    finally:
+        await pool.close()
+
+
+def synthetic_products(count: int, seed: int = 42) -> List[Dict]:
+    """Gera `count` produtos determinísticos para os testes de carga."""
+    rng = random.Random(seed)
+    return [
+        {
+            "name": f"Bench product {i}",
+            "description": f"Synthetic product {i} for benchmarks.",
+            "quantity": rng.randint(0, 500),
+            "price": Decimal(rng.randint(100, 1_000_000)) / 100,
+            "status": rng.random() > 0.1,
+        }
+        for i in range(count)
+    ]
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(samples: List[float], elapsed: float) -> Dict[str, float]:
+    """Resume latências (segundos) em ms e calcula a vazão."""
+    return {
+        "count": len(samples),
+        "throughput": len(samples) / elapsed if elapsed else 0.0,
+        "mean_ms": statistics.fmean(samples) * 1000 if samples else 0.0,
+        "p50_ms": percentile(samples, 50) * 1000,
+        "p95_ms": percentile(samples, 95) * 1000,
+        "p99_ms": percentile(samples, 99) * 1000,
+    }
+
+
+class Stopwatch:
+    def __enter__(self) -> "Stopwatch":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.elapsed = time.perf_counter() - self.start
@@ -0,0 +1,401 @@
+"""
+Suíte de carga da API de produtos.
+
+Cria a aplicação com store.main.get_application() e dispara requisições
+contra cada rota de controllers_product.py, com concorrência
+configurável, em processo (httpx.ASGITransport) ou contra um uvicorn em
+execução. Antes, esvazia a tabela products (TRUNCATE pelo DATABASE_URL)
+e a popula com N produtos sintéticos pela própria API (POST
+/products/bulk), para que cada execução parta do mesmo estado.
+
+Para cada endpoint reporta vazão e latências p50/p95/p99, grava o
+resultado em JSON e falha (exit 1) quando algum endpoint regredir além
+da tolerância em relação ao baseline, quando o baseline pedido não
+existir ou quando alguma requisição tiver resposta inesperada.
+
+    python -m benchmarks.load --seed 10000 --concurrency 32 \\
+        --output bench_output.json --baseline benchmarks/baseline.json
+
+Rode contra um banco descartável (ex.: o Postgres do docker-compose).
+"""
+import argparse
+import asyncio
+import json
+import platform
+import random
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import httpx
+import psycopg
+
+from benchmarks.common import database_url, summarize, synthetic_products
+from store.db.db_migrations import migrate
+
+SEED_CHUNK = 1000
+
+
+@dataclass
+class Context:
+    """Estado compartilhado entre os cenários (IDs disponíveis etc.)."""
+
+    ids: List[str]
+    rng: random.Random
+    created: List[str] = field(default_factory=list)
+    etags: Dict[str, str] = field(default_factory=dict)
+
+    def product(self, index: int) -> Dict[str, Any]:
+        item = synthetic_products(1, seed=index)[0]
+        return {**item, "name": f"Load product {index}", "price": str(item["price"])}
+
+
+@dataclass
+class Scenario:
+    name: str
+    request: Callable[[Context, int], Dict[str, Any]]
+    # Fração de --requests usada por este cenário (rotas pesadas rodam menos)
+    share: float = 1.0
+    expected: tuple = (200,)
+    # Chamado com cada resposta esperada (ex.: guardar IDs criados)
+    after: Optional[Callable[[Context, httpx.Response], None]] = None
+
+
+def _create(ctx: Context, i: int) -> Dict[str, Any]:
+    return {"method": "POST", "url": "/products/", "json": ctx.product(i)}
+
+
+def _get(ctx: Context, i: int) -> Dict[str, Any]:
+    return {"method": "GET", "url": f"/products/{ctx.rng.choice(ctx.ids)}"}
+
+
+def _remember_created(ctx: Context, response: httpx.Response) -> None:
+    ctx.created.append(response.json()["id"])
+
+
+def _remember_etag(ctx: Context, response: httpx.Response) -> None:
+    if response.status_code == 200:
+        ctx.etags[response.json()["id"]] = response.headers["etag"]
+
+
+def _batch_get(ctx: Context, i: int) -> Dict[str, Any]:
+    return {
+        "method": "POST",
+        "url": "/products/batch-get",
+        "json": {"ids": ctx.rng.sample(ctx.ids, 50)},
+    }
+
+
+def _get_conditional(ctx: Context, i: int) -> Dict[str, Any]:
+    product_id = ctx.rng.choice(ctx.ids[:100])
+    headers = {}
+    if product_id in ctx.etags:
+        headers["If-None-Match"] = ctx.etags[product_id]
+    return {"method": "GET", "url": f"/products/{product_id}", "headers": headers}
+
+
+def _list(ctx: Context, i: int) -> Dict[str, Any]:
+    return {"method": "GET", "url": "/products/", "params": {"limit": 50}}
+
+
+def _list_filtered(ctx: Context, i: int) -> Dict[str, Any]:
+    return {
+        "method": "GET",
+        "url": "/products/",
+        "params": {
+            "limit": 50,
+            "status": "true",
+            "min_price": "100",
+            "max_price": "5000",
+            "sort": "name",
+        },
+    }
+
+
+def _list_sparse(ctx: Context, i: int) -> Dict[str, Any]:
+    return {
+        "method": "GET",
+        "url": "/products/",
+        "params": {"limit": 50, "fields": "id,name,price,status"},
+    }
+
+
+def _search(ctx: Context, i: int) -> Dict[str, Any]:
+    return {"method": "GET", "url": "/products/search", "params": {"q": "product 42"}}
+
+
+def _stats(ctx: Context, i: int) -> Dict[str, Any]:
+    return {"method": "GET", "url": "/products/stats"}
+
+
+def _export(ctx: Context, i: int) -> Dict[str, Any]:
+    return {"method": "GET", "url": "/products/export"}
+
+
+def _bulk(ctx: Context, i: int) -> Dict[str, Any]:
+    return {
+        "method": "POST",
+        "url": "/products/bulk",
+        "json": [ctx.product(i * 100 + n) for n in range(100)],
+    }
+
+
+def _patch(ctx: Context, i: int) -> Dict[str, Any]:
+    return {
+        "method": "PATCH",
+        "url": f"/products/{ctx.rng.choice(ctx.ids)}",
+        "json": {"quantity": ctx.rng.randint(0, 500)},
+    }
+
+
+def _patch_batch(ctx: Context, i: int) -> Dict[str, Any]:
+    return {
+        "method": "PATCH",
+        "url": "/products/batch",
+        "json": [
+            {"id": product_id, "quantity": ctx.rng.randint(0, 500)}
+            for product_id in ctx.rng.sample(ctx.ids, 10)
+        ],
+    }
+
+
+def _reserve(ctx: Context, i: int) -> Dict[str, Any]:
+    # Poucos SKUs quentes: mede a disputa pela mesma linha
+    return {
+        "method": "POST",
+        "url": f"/products/{ctx.ids[i % 5]}/reserve",
+        "json": {"quantity": 1},
+    }
+
+
+def _reserve_batch(ctx: Context, i: int) -> Dict[str, Any]:
+    # Carrinho de 5 itens entre os mesmos SKUs quentes: tudo ou nada
+    return {
+        "method": "POST",
+        "url": "/products/reserve",
+        "json": [
+            {"id": product_id, "quantity": 1}
+            for product_id in ctx.rng.sample(ctx.ids[:20], 5)
+        ],
+    }
+
+
+def _delete(ctx: Context, i: int) -> Dict[str, Any]:
+    return {"method": "DELETE", "url": f"/products/{ctx.created.pop()}"}
+
+
+SCENARIOS = [
+    Scenario("POST /products/", _create, expected=(201,), after=_remember_created),
+    Scenario("GET /products/{id}", _get),
+    Scenario("POST /products/batch-get (50 ids)", _batch_get),
+    Scenario(
+        "GET /products/{id} (304)",
+        _get_conditional,
+        expected=(200, 304),
+        after=_remember_etag,
+    ),
+    Scenario("GET /products/", _list),
+    Scenario("GET /products/ (filtered)", _list_filtered),
+    Scenario("GET /products/ (fields)", _list_sparse),
+    Scenario("GET /products/search", _search),
+    Scenario("GET /products/stats", _stats),
+    Scenario("GET /products/export", _export, share=0.02),
+    Scenario("POST /products/bulk", _bulk, share=0.05, expected=(201,)),
+    Scenario("PATCH /products/{id}", _patch),
+    Scenario("PATCH /products/batch", _patch_batch, share=0.2),
+    Scenario("POST /products/{id}/reserve", _reserve, expected=(200, 409)),
+    Scenario("POST /products/reserve", _reserve_batch, expected=(200, 409)),
+    # Apaga os produtos criados pelo cenário de POST
+    Scenario("DELETE /products/{id}", _delete, expected=(204,)),
+]
+
+
+async def _reset() -> None:
+    # Tabela vazia a cada execução: sem isso ela cresce entre execuções e
+    # os números deixam de ser comparáveis com o baseline
+    await migrate(database_url())
+    async with await psycopg.AsyncConnection.connect(database_url()) as conn:
+        await conn.execute("TRUNCATE TABLE products;")
+
+
+async def _seed(client: httpx.AsyncClient, count: int) -> List[str]:
+    ids: List[str] = []
+    for start in range(0, count, SEED_CHUNK):
+        items = [
+            {**item, "price": str(item["price"])}
+            for item in synthetic_products(min(SEED_CHUNK, count - start), seed=start)
+        ]
+        response = await client.post("/products/bulk", json=items)
+        response.raise_for_status()
+        ids.extend(response.json()["ids"])
+    return ids
+
+
+async def _run_scenario(
+    client: httpx.AsyncClient,
+    scenario: Scenario,
+    ctx: Context,
+    total: int,
+    concurrency: int,
+) -> Dict[str, Any]:
+    samples: List[float] = []
+    errors = 0
+    counter = iter(range(total))
+
+    async def worker() -> None:
+        nonlocal errors
+        for i in counter:
+            kwargs = scenario.request(ctx, i)
+            began = time.perf_counter()
+            response = await client.request(**kwargs)
+            samples.append(time.perf_counter() - began)
+            if response.status_code not in scenario.expected:
+                errors += 1
+            elif scenario.after is not None:
+                scenario.after(ctx, response)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    summary = summarize(samples, time.perf_counter() - start)
+    summary["errors"] = errors
+    return summary
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    # Antes do startup da App, que pré-carrega o cache com a tabela
+    await _reset()
+    app = None
+    if args.mode == "inprocess":
+        from store.main import get_application
+
+        app = get_application()
+        # ASGITransport não dispara o lifespan: roda o startup da App
+        await app.router.startup()
+        client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://bench"
+        )
+    else:
+        client = httpx.AsyncClient(base_url=args.base_url, timeout=60)
+
+    results: Dict[str, Any] = {}
+    try:
+        ctx = Context(ids=await _seed(client, args.seed), rng=random.Random(1))
+        for scenario in SCENARIOS:
+            if args.only and args.only not in scenario.name:
+                continue
+            total = max(1, int(args.requests * scenario.share))
+            if scenario.name.startswith("DELETE"):
+                total = min(total, len(ctx.created))
+            results[scenario.name] = await _run_scenario(
+                client, scenario, ctx, total, args.concurrency
+            )
+            print(_format(scenario.name, results[scenario.name]))
+    finally:
+        await client.aclose()
+        if app is not None:
+            await app.router.shutdown()
+
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "mode": args.mode,
+            "seed": args.seed,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "python": platform.python_version(),
+        },
+        "endpoints": results,
+    }
+
+
+def _format(name: str, stats: Dict[str, Any]) -> str:
+    return (
+        f"{name:28} {stats['throughput']:9.1f} req/s  "
+        f"p50={stats['p50_ms']:8.2f}  p95={stats['p95_ms']:8.2f}  "
+        f"p99={stats['p99_ms']:8.2f} ms  errors={stats['errors']}"
+    )
+
+
+def compare(
+    results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float
+) -> List[str]:
+    """
+    Lista as regressões: p95 acima de (1 + tolerance) vezes o baseline,
+    vazão abaixo de (1 - tolerance) vezes o baseline, ou erros novos.
+    """
+    regressions = []
+    for name, base in baseline.get("endpoints", {}).items():
+        current = results["endpoints"].get(name)
+        if current is None:
+            continue
+        if current["p95_ms"] > base["p95_ms"] * (1 + tolerance):
+            regressions.append(
+                f"{name}: p95 {base['p95_ms']:.2f} -> {current['p95_ms']:.2f} ms"
+            )
+        if current["throughput"] < base["throughput"] * (1 - tolerance):
+            regressions.append(
+                f"{name}: throughput {base['throughput']:.1f} -> "
+                f"{current['throughput']:.1f} req/s"
+            )
+        base_errors = base.get("errors", 0)
+        if current["errors"] > base_errors:
+            regressions.append(f"{name}: errors {base_errors} -> {current['errors']}")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--mode", choices=["inprocess", "http"], default="inprocess")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--seed", type=int, default=10_000, help="produtos iniciais")
+    parser.add_argument("--requests", type=int, default=1000, help="por endpoint")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--only", help="roda só cenários que contêm este texto")
+    parser.add_argument("--output", type=Path, help="grava os resultados em JSON")
+    parser.add_argument("--baseline", type=Path, help="JSON de uma execução anterior")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    parser.add_argument(
+        "--write-baseline", action="store_true", help="grava o resultado em --baseline"
+    )
+    args = parser.parse_args(argv)
+
+    if args.baseline and not args.write_baseline and not args.baseline.exists():
+        # Antes de rodar: sem baseline não há como detectar regressão
+        print(
+            f"baseline {args.baseline} não encontrado; grave um com "
+            "make bench-baseline (ou --write-baseline)"
+        )
+        return 1
+
+    results = asyncio.run(run(args))
+    status = 0
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2))
+    if args.baseline and args.write_baseline:
+        args.baseline.write_text(json.dumps(results, indent=2))
+        print(f"baseline gravado em {args.baseline}")
+    elif args.baseline:
+        regressions = compare(
+            results, json.loads(args.baseline.read_text()), args.tolerance
+        )
+        if regressions:
+            print("REGRESSÕES em relação ao baseline:", *regressions, sep="\n  ")
+            status = 1
+        else:
+            print("sem regressões em relação ao baseline")
+
+    errors = sum(stats["errors"] for stats in results["endpoints"].values())
+    if errors:
+        print(f"{errors} requisições com resposta inesperada")
+        status = 1
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,75 @@
+"""
+Comandos administrativos.
+
+    python -m store.cli migrate [--target N]
+    python -m store.cli migrate-status
+    python -m store.cli rebuild-stats
+"""
+import argparse
+import asyncio
+import sys
+from typing import List, Optional
+
+from psycopg_pool import AsyncConnectionPool
+
+from store.core.core_config import settings
+from store.core.core_exceptions import MigrationException
+from store.db.db_migrations import migrate, migration_status
+from store.usecases.usecases_product import ProductUsecase
+
+
+async def _migrate(args: argparse.Namespace) -> int:
+    applied = await migrate(args.database_url, target=args.target)
+    for migration in applied:
+        print(f"aplicada {migration.version:04d}_{migration.name}")
+    if not applied:
+        print("nenhuma migration pendente")
+    return 0
+
+
+async def _migrate_status(args: argparse.Namespace) -> int:
+    for migration, applied in await migration_status(args.database_url):
+        state = "aplicada" if applied else "pendente"
+        print(f"{migration.version:04d}_{migration.name}: {state}")
+    return 0
+
+
+async def _rebuild_stats(args: argparse.Namespace) -> int:
+    pool = AsyncConnectionPool(args.database_url, min_size=1, max_size=1, open=False)
+    async with pool:
+        stats = await ProductUsecase(pool=pool).rebuild_stats()
+    print(stats.model_dump_json(indent=2))
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="store.cli", description=__doc__)
+    parser.add_argument("--database-url", default=settings.DATABASE_URL)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    migrate_parser = commands.add_parser("migrate", help="aplica as migrations")
+    migrate_parser.add_argument(
+        "--target", type=int, help="para na versão informada (inclusive)"
+    )
+    migrate_parser.set_defaults(handler=_migrate)
+
+    status_parser = commands.add_parser(
+        "migrate-status", help="lista as migrations e se já foram aplicadas"
+    )
+    status_parser.set_defaults(handler=_migrate_status)
+
+    stats_parser = commands.add_parser(
+        "rebuild-stats", help="recalcula os totais de GET /products/stats"
+    )
+    stats_parser.set_defaults(handler=_rebuild_stats)
+
+    args = parser.parse_args(argv)
+    try:
+        return asyncio.run(args.handler(args))
+    except MigrationException as exc:
+        print(f"erro: {exc.message}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
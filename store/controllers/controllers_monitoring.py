@@ -0,0 +1,256 @@
+from typing import Iterator, List
+from fastapi import APIRouter, HTTPException, Request, Response, status
+
+from store.core.core_admission import admission_limiters
+from store.core.core_cache import product_cache
+from store.core.core_changes import product_change_publisher
+from store.core.core_coalescer import product_create_coalescer
+from store.core.core_metrics import CONTENT_TYPE, Sample, metrics
+from store.core.core_singleflight import product_flights
+from store.db.db_postgres import db_client
+from store.schemas.schemas_monitoring import HealthOut, PoolStatsOut
+
+router = APIRouter(tags=["monitoring"])
+
+
+# Estatísticas do pool de conexões deste worker
+@router.get(path="/monitoring/pool", status_code=status.HTTP_200_OK)
+async def estatisticas_pool() -> PoolStatsOut:
+    try:
+        return PoolStatsOut(**db_client.stats())
+    except ConnectionError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(exc)
+        )
+
+
+# Estatísticas dos pools das réplicas de leitura (lista vazia sem réplicas)
+@router.get(path="/monitoring/pool/replicas", status_code=status.HTTP_200_OK)
+async def estatisticas_replicas() -> List[PoolStatsOut]:
+    try:
+        return [
+            PoolStatsOut(**db_client.stats(pool)) for pool in db_client.replica_pools
+        ]
+    except ConnectionError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(exc)
+        )
+
+
+# Liveness: o processo responde (não depende do banco)
+@router.get(path="/health/live", status_code=status.HTTP_200_OK)
+async def saude_processo() -> HealthOut:
+    return HealthOut(status="alive")
+
+
+# Readiness: startup concluído (pool aquecido, cache carregado) e pools
+# abertos. 503 enquanto não estiver pronto, para o balanceador esperar.
+@router.get(path="/health/ready", status_code=status.HTTP_200_OK)
+async def saude_prontidao(request: Request, response: Response) -> HealthOut:
+    pools = [("primary", db_client.pool)] + [
+        (f"replica-{index}", pool) for index, pool in enumerate(db_client.replica_pools)
+    ]
+    stats = {}
+    for name, pool in pools:
+        try:
+            stats[name] = PoolStatsOut(**db_client.stats(pool))
+        except ConnectionError:
+            continue
+
+    if not getattr(request.app.state, "ready", False):
+        health = "starting"
+    elif len(stats) < len(pools):
+        health = "unavailable"
+    else:
+        health = "ready"
+    if health != "ready":
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return HealthOut(status=health, pools=stats)
+
+
+# Métricas lidas do pool em cada coleta: (nome, tipo, ajuda, chave do get_stats)
+POOL_METRICS = (
+    ("store_db_pool_size", "gauge", "Conexões abertas", "pool_size"),
+    ("store_db_pool_available", "gauge", "Conexões livres", "pool_available"),
+    ("store_db_pool_in_use", "gauge", "Conexões emprestadas", "connections_in_use"),
+    ("store_db_pool_max", "gauge", "Tamanho máximo do pool", "pool_max"),
+    (
+        "store_db_pool_requests_waiting",
+        "gauge",
+        "Requisições esperando conexão",
+        "requests_waiting",
+    ),
+    (
+        "store_db_pool_requests_total",
+        "counter",
+        "Pedidos de conexão",
+        "requests_num",
+    ),
+    (
+        "store_db_pool_requests_queued_total",
+        "counter",
+        "Pedidos que precisaram esperar",
+        "requests_queued",
+    ),
+    (
+        "store_db_pool_requests_wait_ms_total",
+        "counter",
+        "Tempo total de espera por conexão (ms)",
+        "requests_wait_ms",
+    ),
+    (
+        "store_db_pool_requests_errors_total",
+        "counter",
+        "Pedidos de conexão com erro ou timeout",
+        "requests_errors",
+    ),
+)
+
+
+@metrics.collector
+def _pool_samples() -> Iterator[Sample]:
+    pools = [("primary", db_client.pool)] + [
+        (f"replica-{index}", pool) for index, pool in enumerate(db_client.replica_pools)
+    ]
+    stats = {}
+    for name, pool in pools:
+        try:
+            stats[name] = db_client.stats(pool)
+        except ConnectionError:
+            continue
+    for metric, kind, help, key in POOL_METRICS:
+        for name, values in stats.items():
+            yield metric, kind, help, {"pool": name}, values.get(key, 0)
+
+
+CACHE_METRICS = (
+    ("store_cache_hits_total", "counter", "Acertos do cache", "hits"),
+    ("store_cache_misses_total", "counter", "Faltas no cache", "misses"),
+    ("store_cache_evictions_total", "counter", "Itens descartados", "evictions"),
+    ("store_cache_size", "gauge", "Itens no cache", "size"),
+)
+
+
+@metrics.collector
+def _cache_samples() -> Iterator[Sample]:
+    if product_cache is None:
+        return
+    stats = product_cache.stats()
+    labels = {"cache": "product"}
+    for metric, kind, help, key in CACHE_METRICS:
+        yield metric, kind, help, labels, stats[key]
+    lookups = stats["hits"] + stats["misses"]
+    ratio = stats["hits"] / lookups if lookups else 0.0
+    yield "store_cache_hit_ratio", "gauge", "Acertos / consultas", labels, ratio
+
+
+@metrics.collector
+def _singleflight_samples() -> Iterator[Sample]:
+    if product_flights is None:
+        return
+    stats = product_flights.stats()
+    labels = {"group": "product"}
+    yield (
+        "store_singleflight_calls_total",
+        "counter",
+        "Consultas disparadas ao banco",
+        labels,
+        stats["calls"],
+    )
+    yield (
+        "store_singleflight_coalesced_total",
+        "counter",
+        "Requisições atendidas por uma consulta já em andamento",
+        labels,
+        stats["coalesced"],
+    )
+    yield (
+        "store_singleflight_in_flight",
+        "gauge",
+        "Consultas em andamento",
+        labels,
+        stats["in_flight"],
+    )
+
+
+@metrics.collector
+def _coalescer_samples() -> Iterator[Sample]:
+    if product_create_coalescer is None:
+        return
+    stats = product_create_coalescer.stats()
+    labels = {"operation": "product.create"}
+    yield (
+        "store_coalescer_batches_total",
+        "counter",
+        "Lotes gravados pelo group commit",
+        labels,
+        stats["batches"],
+    )
+    yield (
+        "store_coalescer_items_total",
+        "counter",
+        "Escritas gravadas em lote",
+        labels,
+        stats["items"],
+    )
+    yield (
+        "store_coalescer_pending",
+        "gauge",
+        "Escritas esperando a janela do lote",
+        labels,
+        stats["pending"],
+    )
+
+
+CHANGE_PUBLISHER_METRICS = (
+    ("store_changes_flushes_total", "counter", "Envios de avisos (NOTIFY)", "flushes"),
+    (
+        "store_changes_notices_total",
+        "counter",
+        "Avisos de alteração enviados",
+        "notices",
+    ),
+    ("store_changes_failures_total", "counter", "Envios que falharam", "failures"),
+    ("store_changes_pending", "gauge", "Alterações esperando a janela", "pending"),
+)
+
+
+@metrics.collector
+def _change_publisher_samples() -> Iterator[Sample]:
+    if product_change_publisher is None:
+        return
+    stats = product_change_publisher.stats()
+    for metric, kind, help, key in CHANGE_PUBLISHER_METRICS:
+        yield metric, kind, help, {}, stats[key]
+
+
+ADMISSION_METRICS = (
+    ("store_admission_limit", "gauge", "Requisições simultâneas permitidas", "limit"),
+    ("store_admission_active", "gauge", "Requisições em atendimento", "active"),
+    ("store_admission_queued", "gauge", "Requisições na fila", "queued"),
+    ("store_admission_admitted_total", "counter", "Requisições admitidas", "admitted"),
+)
+
+
+@metrics.collector
+def _admission_samples() -> Iterator[Sample]:
+    if admission_limiters is None:
+        return
+    for metric, kind, help, key in ADMISSION_METRICS:
+        for name, limiter in admission_limiters.items():
+            yield metric, kind, help, {"class": name}, limiter.stats()[key]
+    for name, limiter in admission_limiters.items():
+        for reason, count in limiter.rejected.items():
+            yield (
+                "store_admission_rejected_total",
+                "counter",
+                "Requisições rejeitadas com 503",
+                {"class": name, "reason": reason},
+                count,
+            )
+
+
+# Métricas deste worker no formato texto do Prometheus
+@router.get(path="/metrics", include_in_schema=False)
+async def metricas() -> Response:
+    return Response(content=metrics.render(), media_type=CONTENT_TYPE)
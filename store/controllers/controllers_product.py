@@ -1,27 +1,105 @@
-from typing import List
-from fastapi import APIRouter, Body, Depends, HTTPException, Path, status
+from typing import Any, AsyncIterator, List, Literal, Set
+from fastapi import (
+    APIRouter,
+    Body,
+    Depends,
+    Header,
+    HTTPException,
+    Path,
+    Query,
+    Request,
+    Response,
+    status,
+)
+from fastapi.responses import StreamingResponse
 from pydantic import UUID4
-from store.core.core_exceptions import NotFoundException
+from store.core.core_config import settings
+from store.core.core_exceptions import (
+    InsertionException,
+    InsufficientStockException,
+    InvalidCursorException,
+    InvalidRowException,
+    NotFoundException,
+)
 
 from store.schemas.schemas_product import (
+    ProductBatchGet,
+    ProductBatchGetOut,
+    ProductBatchReserve,
+    ProductBatchUpdate,
+    ProductBatchUpdateOut,
+    ProductBulkOut,
+    ProductFields,
+    ProductFilter,
     ProductIn,
     ProductOut,
+    ProductPage,
+    ProductReserve,
+    ProductSearch,
+    ProductStats,
     ProductUpdate,
     ProductUpdateOut,
 )
+from store.core.core_http import (
+    has_conditional_headers,
+    is_not_modified,
+    make_etag,
+    validator_headers,
+)
+from store.core.core_changes import (
+    PRODUCT_CHANGES_CHANNEL,
+    ChangePublisher,
+    change_queue,
+    sse_events,
+)
+from store.core.core_export import EXPORT_ENCODERS, EXPORT_MEDIA_TYPES
+from store.core.core_json import FastJSONResponse
 from store.usecases.usecases_product import ProductUsecase
-from store.dependencies import get_db_pool
+from store.core.core_cache import LRUCache
+from store.core.core_coalescer import WriteCoalescer
+from store.core.core_singleflight import SingleFlight
+from store.db.db_postgres import PostgresClient
+from store.dependencies import (
+    get_db_client,
+    get_db_extensions,
+    get_db_pool,
+    get_db_read_pool,
+    get_product_cache,
+    get_product_change_publisher,
+    get_product_create_coalescer,
+    get_product_flights,
+)
 from psycopg_pool import AsyncConnectionPool
 
-router = APIRouter(tags=["products"])
+router = APIRouter(tags=["products"], default_response_class=FastJSONResponse)
 
 
 # Nova função de dependência para criar o ProductUsecase
 # Ela recebe o pool e cria o usecase.
+# Leituras vão para réplicas; o header X-Read-Primary força o primário
+# (ex.: ler logo depois de escrever, sem sofrer com o atraso da réplica).
 def get_product_usecase(
     pool: AsyncConnectionPool = Depends(get_db_pool),
+    read_pool: AsyncConnectionPool = Depends(get_db_read_pool),
+    cache: LRUCache | None = Depends(get_product_cache),
+    flights: SingleFlight | None = Depends(get_product_flights),
+    coalescer: WriteCoalescer | None = Depends(get_product_create_coalescer),
+    publisher: ChangePublisher | None = Depends(get_product_change_publisher),
+    read_primary: bool = Header(False, alias="X-Read-Primary"),
+    extensions: Set[str] = Depends(get_db_extensions),
 ) -> ProductUsecase:
-    return ProductUsecase(pool=pool)
+    return ProductUsecase(
+        pool=pool,
+        read_pool=read_pool,
+        pin_primary=read_primary,
+        cache=cache,
+        flights=flights,
+        coalescer=coalescer,
+        publisher=publisher,
+        prepare=settings.DB_PREPARED_STATEMENTS,
+        pipeline=settings.DB_PIPELINE,
+        fuzzy_search="pg_trgm" in extensions,
+    )
 
 
 # insere novo produto no Banco
@@ -32,22 +110,217 @@ async def inserir_novo_produto(
     return await usecase.create(body=body)
 
 
+# Exporta o catálogo completo em streaming (NDJSON ou CSV)
+# Precisa ser registrada antes de /{id} para não ser capturada por ela.
+@router.get(path="/export", status_code=status.HTTP_200_OK)
+async def exportar_produtos(
+    format: Literal["ndjson", "csv"] = Query("ndjson"),
+    usecase: ProductUsecase = Depends(get_product_usecase),
+) -> StreamingResponse:
+    batches = usecase.export(batch_size=settings.EXPORT_BATCH_SIZE)
+    return StreamingResponse(
+        EXPORT_ENCODERS[format](batches),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="products.{format}"'},
+    )
+
+
+# Busca textual ranqueada em nome e descrição, paginada por cursor
+# Também registrada antes de /{id}.
+@router.get(path="/search", status_code=status.HTTP_200_OK)
+async def buscar_produtos(
+    params: ProductSearch = Query(),
+    usecase: ProductUsecase = Depends(get_product_usecase),
+) -> ProductPage:
+    try:
+        return FastJSONResponse(await usecase.search(params=params))
+    except InvalidCursorException as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=exc.message)
+
+
+# Totais do estoque para dashboards (product_stats, mantida por triggers)
+# Também registrada antes de /{id}.
+@router.get(path="/stats", status_code=status.HTTP_200_OK)
+async def estatisticas_estoque(
+    usecase: ProductUsecase = Depends(get_product_usecase),
+) -> ProductStats:
+    return await usecase.stats()
+
+
+# Alterações de produtos em tempo real (Server-Sent Events), a partir do
+# LISTEN product_changes. Também registrada antes de /{id}.
+@router.get(path="/changes/stream", status_code=status.HTTP_200_OK)
+async def transmitir_alteracoes(
+    client: PostgresClient = Depends(get_db_client),
+) -> StreamingResponse:
+    queue, enqueue = change_queue(settings.CHANGES_STREAM_QUEUE_SIZE)
+    unsubscribe = client.subscribe(PRODUCT_CHANGES_CHANNEL, enqueue)
+
+    async def events() -> AsyncIterator[bytes]:
+        try:
+            async for event in sse_events(queue, settings.CHANGES_STREAM_HEARTBEAT):
+                yield event
+        finally:
+            unsubscribe()
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _ndjson_lines(request: Request) -> AsyncIterator[bytes]:
+    buffer = b""
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            if line.strip():
+                yield line
+    if buffer.strip():
+        yield buffer
+
+
+async def _json_items(items: list[Any]) -> AsyncIterator[Any]:
+    for item in items:
+        yield item
+
+
+# Insere produtos em lote (array JSON ou NDJSON) com COPY
+@router.post(path="/bulk", status_code=status.HTTP_201_CREATED)
+async def inserir_produtos_em_lote(
+    request: Request, usecase: ProductUsecase = Depends(get_product_usecase)
+) -> ProductBulkOut:
+    if request.headers.get("content-type", "").startswith("application/x-ndjson"):
+        items = _ndjson_lines(request)
+    else:
+        try:
+            payload = await request.json()
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Invalid JSON body",
+            )
+        if not isinstance(payload, list):
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Expected a JSON array of products",
+            )
+        items = _json_items(payload)
+
+    try:
+        return await usecase.bulk_create(
+            items=items, batch_size=settings.BULK_BATCH_SIZE
+        )
+    except InvalidRowException as exc:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail={"message": exc.message, "index": exc.index},
+        )
+    except InsertionException as exc:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=exc.message
+        )
+
+
+# Busca vários produtos por ID numa única consulta (carrinho, pedidos).
+# POST por causa do tamanho da lista; conta como leitura no controle de
+# admissão (core_admission.READ_PATHS).
+@router.post(path="/batch-get", status_code=status.HTTP_200_OK)
+async def pesquisar_em_lote(
+    body: ProductBatchGet = Body(...),
+    fields: ProductFields = Query(
+        None, description="Campos retornados (ex.: id,name,price); padrão: todos"
+    ),
+    usecase: ProductUsecase = Depends(get_product_usecase),
+) -> ProductBatchGetOut:
+    return FastJSONResponse(await usecase.get_many(ids=body.ids, fields=fields))
+
+
 # Pesquisa produto no Banco por ID
+# Suporta requisições condicionais (If-None-Match / If-Modified-Since):
+# a validação consulta apenas (id, updated_at) e responde 304 sem corpo.
+# Com ?fields=id,name,price lê e devolve só esses campos (ETag próprio).
 @router.get(path="/{id}", status_code=status.HTTP_200_OK)
 async def pesquisar_por_ID(
-    id: UUID4 = Path(alias="id"), usecase: ProductUsecase = Depends(get_product_usecase)
+    request: Request,
+    response: Response,
+    id: UUID4 = Path(alias="id"),
+    fields: ProductFields = Query(
+        None, description="Campos retornados (ex.: id,name,price); padrão: todos"
+    ),
+    usecase: ProductUsecase = Depends(get_product_usecase),
 ) -> ProductOut:
+    variant = (fields,) if fields else ()
     try:
-        return await usecase.get(id=id)
+        if has_conditional_headers(request.headers):
+            product_id, updated_at = await usecase.get_version(id=id)
+            etag = make_etag([(product_id, updated_at)], *variant)
+            if is_not_modified(request.headers, etag, updated_at):
+                return Response(
+                    status_code=status.HTTP_304_NOT_MODIFIED,
+                    headers=validator_headers(etag, updated_at),
+                )
+
+        product = await usecase.get(id=id, fields=fields)
     except NotFoundException as exc:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=exc.message)
 
+    headers = validator_headers(
+        make_etag([(product.id, product.updated_at)], *variant), product.updated_at
+    )
+    if fields:
+        # Schema enxuto: não passa pelo response_model (ProductOut)
+        return FastJSONResponse(product, headers=headers)
+    response.headers.update(headers)
+    return product
+
 
+# Lista produtos com filtros e paginação por cursor
+# O ETag da lista é derivado de (id, updated_at) dos itens da página.
+# A página é codificada direto dos schemas (FastJSONResponse), sem a
+# revalidação e a conversão para dict do response_model.
+# Com ?fields=id,name,price os itens trazem só esses campos.
 @router.get(path="/", status_code=status.HTTP_200_OK)
 async def pesquisar_produto(
+    request: Request,
+    filters: ProductFilter = Query(),
+    usecase: ProductUsecase = Depends(get_product_usecase),
+) -> ProductPage:
+    variant = (filters.fields,) if filters.fields else ()
+    try:
+        if has_conditional_headers(request.headers):
+            versions, has_more = await usecase.query_versions(filters=filters)
+            etag = make_etag(versions, has_more, *variant)
+            last_modified = max((v[1] for v in versions), default=None)
+            if is_not_modified(request.headers, etag, last_modified):
+                return Response(
+                    status_code=status.HTTP_304_NOT_MODIFIED,
+                    headers=validator_headers(etag, last_modified),
+                )
+
+        page = await usecase.query(filters=filters)
+    except InvalidCursorException as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=exc.message)
+
+    versions = [(product.id, product.updated_at) for product in page.items]
+    return FastJSONResponse(
+        page,
+        headers=validator_headers(
+            make_etag(versions, page.next_cursor is not None, *variant),
+            max((v[1] for v in versions), default=None),
+        ),
+    )
+
+
+# Edita vários produtos de uma vez
+@router.patch(path="/batch", status_code=status.HTTP_200_OK)
+async def editar_em_lote(
+    body: List[ProductBatchUpdate] = Body(...),
     usecase: ProductUsecase = Depends(get_product_usecase),
-) -> List[ProductOut]:
-    return await usecase.query()
+) -> ProductBatchUpdateOut:
+    return await usecase.batch_update(items=body)
 
 
 # Edita produto no Banco por ID
@@ -60,6 +333,47 @@ async def editar_por_ID(
     return await usecase.update(id=id, body=body)
 
 
+def _stock_conflict(exc: InsufficientStockException) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail={
+            "message": exc.message,
+            "shortages": [
+                shortage.model_dump(mode="json") for shortage in exc.shortages
+            ],
+        },
+    )
+
+
+# Reserva estoque de um produto (decremento atômico; 409 sem estoque)
+@router.post(path="/{id}/reserve", status_code=status.HTTP_200_OK)
+async def reservar_estoque(
+    id: UUID4 = Path(alias="id"),
+    body: ProductReserve = Body(...),
+    usecase: ProductUsecase = Depends(get_product_usecase),
+) -> ProductUpdateOut:
+    try:
+        return await usecase.reserve(id=id, body=body)
+    except NotFoundException as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=exc.message)
+    except InsufficientStockException as exc:
+        raise _stock_conflict(exc)
+
+
+# Reserva os itens de um carrinho: todos ou nenhum
+@router.post(path="/reserve", status_code=status.HTTP_200_OK)
+async def reservar_estoque_em_lote(
+    body: List[ProductBatchReserve] = Body(..., min_length=1),
+    usecase: ProductUsecase = Depends(get_product_usecase),
+) -> List[ProductUpdateOut]:
+    try:
+        return await usecase.reserve_batch(items=body)
+    except NotFoundException as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=exc.message)
+    except InsufficientStockException as exc:
+        raise _stock_conflict(exc)
+
+
 # Deleta produto no Banco
 @router.delete(path="/{id}", status_code=status.HTTP_204_NO_CONTENT)
 async def deletar_por_ID(
@@ -0,0 +1,161 @@
+"""
+Controle de admissão na frente do pool de conexões.
+
+Cada classe de rota (leituras e escritas) tem um limite de requisições
+em atendimento e uma fila limitada para as que chegam acima dele. Quem
+não cabe na fila, ou espera mais que o prazo, recebe 503 com Retry-After
+na hora, em vez de se acumular esperando conexão e atrasar todo mundo.
+"""
+import asyncio
+from collections import deque
+from time import perf_counter
+from typing import Any, Deque, Dict, Sequence
+
+from fastapi.responses import JSONResponse
+
+from store.core.core_config import settings
+from store.core.core_timing import record
+
+READ_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+# Leituras feitas por POST (o corpo carrega a lista de IDs)
+READ_PATHS = frozenset({"/products/batch-get"})
+
+# Rotas fora do controle: sondas e métricas precisam responder justamente
+# sob carga, e o stream de alterações fica aberto indefinidamente
+EXEMPT_PATHS = ("/health/", "/metrics", "/monitoring/", "/products/changes/stream")
+
+
+class AdmissionRejected(Exception):
+    def __init__(self, reason: str) -> None:
+        super().__init__(reason)
+        self.reason = reason
+
+
+class AdmissionLimiter:
+    """
+    Semáforo com fila FIFO limitada e prazo de espera. A vaga liberada é
+    passada direto ao primeiro da fila, então quem chega não fura a fila.
+    Por worker e sem locks, como o LRUCache.
+    """
+
+    def __init__(self, limit: int, queue_size: int, timeout: float) -> None:
+        self.limit = limit
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.active = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self.admitted = 0
+        self.rejected: Dict[str, int] = {"queue_full": 0, "timeout": 0}
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self) -> None:
+        if self.active < self.limit and not self._waiters:
+            self.active += 1
+            self.admitted += 1
+            return
+        if len(self._waiters) >= self.queue_size:
+            self.rejected["queue_full"] += 1
+            raise AdmissionRejected("queue_full")
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, self.timeout)
+        except BaseException as exc:
+            if waiter.done() and not waiter.cancelled():
+                # Recebeu a vaga no mesmo instante em que desistiu
+                self.release()
+            else:
+                waiter.cancel()
+                self._waiters.remove(waiter)
+            if isinstance(exc, asyncio.TimeoutError):
+                self.rejected["timeout"] += 1
+                raise AdmissionRejected("timeout") from None
+            raise
+        self.admitted += 1
+
+    def release(self) -> None:
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "limit": self.limit,
+            "active": self.active,
+            "queued": self.queued,
+            "admitted": self.admitted,
+            **{f"rejected_{reason}": count for reason, count in self.rejected.items()},
+        }
+
+
+def overloaded_response(retry_after: int) -> JSONResponse:
+    return JSONResponse(
+        {"detail": "Service overloaded, retry later"},
+        status_code=503,
+        headers={"Retry-After": str(retry_after)},
+    )
+
+
+class AdmissionMiddleware:
+    """
+    Middleware ASGI que passa cada requisição pelo limitador da sua classe
+    ("read" para GET/HEAD/OPTIONS e READ_PATHS, "write" para o resto). O
+    tempo na fila entra no Server-Timing como fase `queue`.
+    """
+
+    def __init__(
+        self,
+        app: Any,
+        limiters: Dict[str, AdmissionLimiter],
+        retry_after: int = 1,
+        exempt: Sequence[str] = EXEMPT_PATHS,
+    ) -> None:
+        self.app = app
+        self.limiters = limiters
+        self.retry_after = retry_after
+        self.exempt = tuple(exempt)
+
+    async def __call__(self, scope: Any, receive: Any, send: Any) -> None:
+        if scope["type"] != "http" or scope["path"].startswith(self.exempt):
+            await self.app(scope, receive, send)
+            return
+
+        read = scope["method"] in READ_METHODS or scope["path"] in READ_PATHS
+        limiter = self.limiters["read" if read else "write"]
+        start = perf_counter()
+        try:
+            await limiter.acquire()
+        except AdmissionRejected:
+            await overloaded_response(self.retry_after)(scope, receive, send)
+            return
+        record("queue", perf_counter() - start)
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release()
+
+
+admission_limiters: Dict[str, AdmissionLimiter] | None = (
+    {
+        "read": AdmissionLimiter(
+            limit=settings.ADMISSION_READ_LIMIT,
+            queue_size=settings.ADMISSION_QUEUE_SIZE,
+            timeout=settings.ADMISSION_QUEUE_TIMEOUT,
+        ),
+        "write": AdmissionLimiter(
+            limit=settings.ADMISSION_WRITE_LIMIT,
+            queue_size=settings.ADMISSION_QUEUE_SIZE,
+            timeout=settings.ADMISSION_QUEUE_TIMEOUT,
+        ),
+    }
+    if settings.ADMISSION_ENABLED
+    else None
+)
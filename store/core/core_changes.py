@@ -0,0 +1,178 @@
+"""
+Alterações de produtos recebidas por LISTEN product_changes (ver
+migrations/0005_products_notify.sql e PostgresClient.subscribe) e
+publicadas pelos workers depois do commit (ChangePublisher, ver
+migrations/0006_products_notify_coalesced.sql).
+"""
+import asyncio
+import contextvars
+import json
+from typing import AsyncIterator, Callable, Dict, List, Sequence, Set
+from uuid import UUID
+
+from psycopg import Error as PsycopgError
+from psycopg_pool import AsyncConnectionPool
+
+from store.core.core_cache import LRUCache
+from store.core.core_config import settings
+from store.core.core_singleflight import SingleFlight
+from store.schemas.schemas_product import ProductChange
+
+PRODUCT_CHANGES_CHANNEL = "product_changes"
+
+
+def invalidate_on_change(
+    cache: LRUCache | None, flights: SingleFlight | None
+) -> Callable[[str | None], None]:
+    """
+    Assinante que mantém o estado do worker em dia com as escritas feitas
+    por outros workers: remove o produto alterado do cache, ou limpa tudo
+    quando o aviso não traz id (lote, TRUNCATE, avisos perdidos).
+    """
+
+    def on_change(payload: str | None) -> None:
+        change = ProductChange.model_validate_json(payload) if payload else None
+        if cache is not None:
+            if change is None or change.id is None:
+                cache.clear()
+            else:
+                cache.invalidate(change.id)
+        if flights is not None:
+            flights.forget_if(
+                lambda key: change is None
+                or change.id is None
+                or key[0] == "query"
+                or key[1] == change.id
+            )
+
+    return on_change
+
+
+def change_queue(maxsize: int) -> tuple[asyncio.Queue, Callable[[str | None], None]]:
+    """
+    Fila de um cliente do stream e o assinante que a alimenta. Se o
+    cliente não acompanhar, a fila é esvaziada e recebe um aviso de reset.
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+
+    def enqueue(payload: str | None) -> None:
+        if queue.full():
+            while not queue.empty():
+                queue.get_nowait()
+            payload = None
+        queue.put_nowait(payload)
+
+    return queue, enqueue
+
+
+async def sse_events(queue: asyncio.Queue, heartbeat: float) -> AsyncIterator[bytes]:
+    """
+    Eventos Server-Sent Events: `change` com o JSON do aviso, `reset` quando
+    avisos podem ter sido perdidos e um comentário a cada `heartbeat`
+    segundos sem alterações, para manter a conexão aberta em proxies.
+    """
+    yield b"retry: 3000\n\n"
+    while True:
+        try:
+            payload = await asyncio.wait_for(queue.get(), timeout=heartbeat)
+        except asyncio.TimeoutError:
+            yield b": heartbeat\n\n"
+            continue
+        if payload is None:
+            yield b"event: reset\ndata: {}\n\n"
+        else:
+            yield f"event: change\ndata: {payload}\n\n".encode()
+
+
+class ChangePublisher:
+    """
+    Publica as alterações feitas por este worker depois do commit delas.
+    Os avisos que chegam dentro de `window` segundos saem juntos, num único
+    SELECT pg_notify(...) numa transação curta e própria: o lock global do
+    NOTIFY fica fora das transações de escrita e é pego uma vez por janela.
+    Mais de `max_ids` ids da mesma operação viram um aviso sem id, como na
+    trigger. Por worker e sem locks, como o WriteCoalescer.
+    """
+
+    def __init__(self, window: float, max_ids: int = 100) -> None:
+        self.window = window
+        self.max_ids = max_ids
+        self._pending: Dict[str, List[UUID]] = {}
+        self._pool: AsyncConnectionPool | None = None
+        self._timer: asyncio.TimerHandle | None = None
+        self._sending: Set[asyncio.Task] = set()
+        self.flushes = 0
+        self.notices = 0
+        self.failures = 0
+
+    def publish(self, pool: AsyncConnectionPool, op: str, ids: Sequence[UUID]) -> None:
+        if not ids:
+            return
+        self._pool = pool
+        self._pending.setdefault(op, []).extend(ids)
+        if self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(
+                self.window, self._flush
+            )
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        pending, self._pending = self._pending, {}
+        if not pending:
+            return
+        # Contexto vazio: o envio não entra no Server-Timing de quem
+        # publicou por último
+        task = asyncio.get_running_loop().create_task(
+            self._send(self._pool, self._payloads(pending)),
+            context=contextvars.Context(),
+        )
+        self._sending.add(task)
+        task.add_done_callback(self._sending.discard)
+
+    def _payloads(self, pending: Dict[str, List[UUID]]) -> List[str]:
+        payloads = []
+        for op, ids in pending.items():
+            ids = list(dict.fromkeys(ids))
+            if len(ids) > self.max_ids:
+                payloads.append(json.dumps({"op": op, "id": None, "count": len(ids)}))
+            else:
+                payloads.extend(json.dumps({"op": op, "id": str(id)}) for id in ids)
+        return payloads
+
+    async def _send(self, pool: AsyncConnectionPool, payloads: List[str]) -> None:
+        self.flushes += 1
+        try:
+            async with pool.connection() as conn:
+                await conn.execute(
+                    "SELECT pg_notify(%s, payload) FROM unnest(%s::text[]) AS payload;",
+                    (PRODUCT_CHANGES_CHANNEL, payloads),
+                )
+        except PsycopgError as exc:
+            # Os outros workers ficam com o cache antigo até o TTL
+            self.failures += 1
+            print(f"ChangePublisher: avisos não enviados ({exc}).")
+            return
+        self.notices += len(payloads)
+
+    async def drain(self) -> None:
+        """Envia os avisos pendentes e espera os envios em andamento."""
+        self._flush()
+        if self._sending:
+            await asyncio.gather(*list(self._sending), return_exceptions=True)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "flushes": self.flushes,
+            "notices": self.notices,
+            "failures": self.failures,
+            "pending": sum(len(ids) for ids in self._pending.values()),
+        }
+
+
+product_change_publisher: ChangePublisher | None = (
+    ChangePublisher(window=settings.PRODUCT_CHANGES_PUBLISH_WINDOW)
+    if settings.PRODUCT_CHANGES_PUBLISH_ENABLED
+    else None
+)
@@ -0,0 +1,109 @@
+import asyncio
+import contextvars
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Hashable,
+    List,
+    Sequence,
+    Set,
+    Tuple,
+    TypeVar,
+)
+
+from store.core.core_config import settings
+
+T = TypeVar("T")
+
+# Recebe os itens do lote e devolve, na mesma ordem, o resultado de cada um
+# ou a exceção que deve chegar só ao seu chamador
+Flush = Callable[[List[T]], Awaitable[Sequence[Any]]]
+
+
+class WriteCoalescer:
+    """
+    Group commit: escritas concorrentes com a mesma chave que chegam dentro
+    de `window` segundos (ou até `max_batch` itens) são gravadas juntas por
+    uma única chamada a `flush`, e cada chamador recebe o próprio resultado.
+    Por worker e sem locks, como o SingleFlight.
+    """
+
+    def __init__(self, window: float, max_batch: int) -> None:
+        self.window = window
+        self.max_batch = max_batch
+        self._pending: Dict[Hashable, List[Tuple[Any, asyncio.Future]]] = {}
+        # Por lote aberto: o timer da janela e o flush que vai gravá-lo
+        self._timers: Dict[Hashable, Tuple[asyncio.TimerHandle, Flush]] = {}
+        self._flushing: Set[asyncio.Task] = set()
+        self.batches = 0
+        self.items = 0
+
+    async def submit(self, key: Hashable, item: T, flush: Flush) -> Any:
+        """
+        Entra no lote aberto de `key` (ou abre um). O `flush` do primeiro
+        item do lote é o que grava todos.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        batch = self._pending.setdefault(key, [])
+        batch.append((item, future))
+        if len(batch) == 1:
+            timer = loop.call_later(self.window, self._flush, key)
+            self._timers[key] = (timer, flush)
+        if len(batch) >= self.max_batch:
+            self._flush(key)
+        # Cancelado (cliente desconectou), o item ainda é gravado com o lote
+        return await future
+
+    def _flush(self, key: Hashable) -> None:
+        batch = self._pending.pop(key)
+        timer, flush = self._timers.pop(key)
+        timer.cancel()
+        # Contexto vazio: o tempo de banco do lote não é atribuído ao
+        # Server-Timing de quem por acaso abriu o lote
+        task = asyncio.get_running_loop().create_task(
+            self._run(batch, flush), context=contextvars.Context()
+        )
+        self._flushing.add(task)
+        task.add_done_callback(self._flushing.discard)
+
+    async def _run(self, batch: List[Tuple[Any, asyncio.Future]], flush: Flush) -> None:
+        self.batches += 1
+        self.items += len(batch)
+        try:
+            results = await flush([item for item, _ in batch])
+        except Exception as exc:
+            results = [exc] * len(batch)
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    async def drain(self) -> None:
+        """Grava os lotes abertos e espera os que estão em andamento."""
+        for key in list(self._pending):
+            self._flush(key)
+        if self._flushing:
+            await asyncio.gather(*list(self._flushing), return_exceptions=True)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "pending": sum(len(batch) for batch in self._pending.values()),
+        }
+
+
+product_create_coalescer: WriteCoalescer | None = (
+    WriteCoalescer(
+        window=settings.PRODUCT_CREATE_COALESCE_WINDOW,
+        max_batch=settings.PRODUCT_CREATE_COALESCE_MAX_BATCH,
+    )
+    if settings.PRODUCT_CREATE_COALESCE_ENABLED
+    else None
+)
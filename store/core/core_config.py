@@ -1,3 +1,5 @@
+from typing import List, Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -6,6 +8,80 @@ class Settings(BaseSettings):
     ROOT_PATH: str = "/"
 
     DATABASE_URL: str
+    # Aplica as migrations pendentes (store/db/migrations) no startup
+    DB_AUTO_MIGRATE: bool = False
+    # Réplicas de leitura (JSON: ["postgresql://...", ...]); vazio = só primário
+    DATABASE_REPLICA_URLS: List[str] = []
+    DB_REPLICA_SELECTION: Literal["round_robin", "least_busy"] = "round_robin"
+
+    # Pool de conexões (um por worker)
+    DB_POOL_MIN_SIZE: int = 1
+    DB_POOL_MAX_SIZE: int = 10
+    DB_POOL_MAX_IDLE: float = 600.0
+    DB_POOL_MAX_LIFETIME: float = 3600.0
+    # Tempo máximo (s) esperando uma conexão livre do pool
+    DB_POOL_TIMEOUT: float = 30.0
+    # Tempo máximo (ms) de cada statement nas conexões do pool; 0 desliga.
+    # O COPY do POST /bulk não tem limite (depende do tamanho do upload).
+    DB_STATEMENT_TIMEOUT: int = 5000
+    # Conexões abertas já no startup (acima de DB_POOL_MIN_SIZE)
+    DB_POOL_WARMUP_SIZE: int = 4
+    # Executa as leituras fixas do CRUD em cada conexão nova (db_warmup)
+    DB_WARMUP_STATEMENTS: bool = True
+
+    # Quantidade de linhas lidas por FETCH no cursor de exportação
+    EXPORT_BATCH_SIZE: int = 1000
+    # Quantidade de itens validados e enviados ao COPY por vez no POST /bulk
+    BULK_BATCH_SIZE: int = 1000
+
+    # Prepara os statements fixos do CRUD em cada conexão (db_statements)
+    DB_PREPARED_STATEMENTS: bool = True
+    # Usa o pipeline mode do psycopg em operações com vários statements
+    DB_PIPELINE: bool = True
+
+    # Cache de leitura para GET /products/{id}
+    PRODUCT_CACHE_ENABLED: bool = False
+    PRODUCT_CACHE_MAX_SIZE: int = 10_000
+    PRODUCT_CACHE_TTL: float = 60.0
+    # Produtos alterados mais recentemente carregados no cache no startup
+    PRODUCT_CACHE_PRELOAD_SIZE: int = 1000
+
+    # Requisições concorrentes iguais (GET por ID, listagens) compartilham
+    # uma única consulta em andamento
+    PRODUCT_SINGLEFLIGHT_ENABLED: bool = True
+
+    # GET /products/changes/stream: comentário de keep-alive a cada N
+    # segundos sem alterações e avisos pendentes por cliente antes de reset
+    CHANGES_STREAM_HEARTBEAT: float = 15.0
+    CHANGES_STREAM_QUEUE_SIZE: int = 1000
+    # Avisos de alteração publicados pelo worker depois do commit, agrupados
+    # por janela (s), em vez do NOTIFY da trigger dentro de cada escrita
+    PRODUCT_CHANGES_PUBLISH_ENABLED: bool = True
+    PRODUCT_CHANGES_PUBLISH_WINDOW: float = 0.005
+
+    # Controle de admissão (por worker): requisições em atendimento por
+    # classe de rota, fila acima disso e quanto tempo esperar nela. Sem
+    # vaga na fila ou após o prazo: 503 com Retry-After (segundos)
+    ADMISSION_ENABLED: bool = True
+    ADMISSION_READ_LIMIT: int = 20
+    ADMISSION_WRITE_LIMIT: int = 10
+    ADMISSION_QUEUE_SIZE: int = 100
+    ADMISSION_QUEUE_TIMEOUT: float = 2.0
+    ADMISSION_RETRY_AFTER: int = 1
+
+    # Group commit do POST /products/: criações concorrentes que chegam
+    # dentro da janela (s), até o tamanho máximo, viram um único INSERT
+    PRODUCT_CREATE_COALESCE_ENABLED: bool = False
+    PRODUCT_CREATE_COALESCE_WINDOW: float = 0.002
+    PRODUCT_CREATE_COALESCE_MAX_BATCH: int = 256
+
+    # Header Server-Timing com o tempo de cada fase da requisição
+    SERVER_TIMING_ENABLED: bool = True
+    # Também registra as fases numa linha JSON (logger "store.timing")
+    SERVER_TIMING_LOG: bool = False
+
+    # Métricas por worker em GET /metrics (formato Prometheus)
+    METRICS_ENABLED: bool = True
 
     model_config = SettingsConfigDict(env_file=".env")
 
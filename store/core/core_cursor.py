@@ -0,0 +1,31 @@
+import base64
+import binascii
+import json
+from typing import Any
+
+from store.core.core_exceptions import InvalidCursorException
+
+
+def encode_cursor(payload: dict[str, Any]) -> str:
+    """
+    Codifica o estado de paginação em um token opaco (base64 url-safe).
+    """
+    raw = json.dumps(payload, separators=(",", ":"), default=str).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> dict[str, Any]:
+    """
+    Decodifica um token gerado por `encode_cursor`.
+    Levanta InvalidCursorException se o token estiver corrompido.
+    """
+    try:
+        padding = "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(cursor + padding))
+    except (binascii.Error, ValueError) as exc:
+        raise InvalidCursorException() from exc
+
+    if not isinstance(payload, dict):
+        raise InvalidCursorException()
+
+    return payload
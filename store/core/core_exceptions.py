@@ -13,3 +13,29 @@ class NotFoundException(BaseException):
 
 class InsertionException(BaseException):
     message = "Error inserting data"
+
+
+class InvalidRowException(BaseException):
+    message = "Invalid row"
+
+    def __init__(self, message: str | None = None, index: int | None = None):
+        super().__init__(message)
+        # Posição do item rejeitado na carga enviada (POST /bulk)
+        self.index = index
+
+
+class InvalidCursorException(BaseException):
+    message = "Invalid cursor"
+
+
+class InsufficientStockException(BaseException):
+    message = "Insufficient stock"
+
+    def __init__(self, message: str | None = None, shortages: list | None = None):
+        super().__init__(message)
+        # Itens sem estoque suficiente (ProductStockShortage)
+        self.shortages = shortages or []
+
+
+class MigrationException(BaseException):
+    message = "Error applying migrations"
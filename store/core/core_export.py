@@ -0,0 +1,51 @@
+import csv
+import io
+from typing import AsyncIterator, List
+
+from store.schemas.schemas_product import ProductOut
+
+EXPORT_COLUMNS = [
+    "id",
+    "name",
+    "description",
+    "price",
+    "quantity",
+    "status",
+    "created_at",
+    "updated_at",
+]
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+async def encode_ndjson(
+    batches: AsyncIterator[List[ProductOut]],
+) -> AsyncIterator[bytes]:
+    """Codifica cada lote como um bloco de linhas JSON (uma por produto)."""
+    async for batch in batches:
+        yield "".join(f"{product.model_dump_json()}\n" for product in batch).encode()
+
+
+async def encode_csv(batches: AsyncIterator[List[ProductOut]]) -> AsyncIterator[bytes]:
+    """Codifica os lotes em CSV; o cabeçalho é enviado antes da primeira leitura."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    yield buffer.getvalue().encode()
+
+    async for batch in batches:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(
+            [getattr(product, column) for column in EXPORT_COLUMNS] for product in batch
+        )
+        yield buffer.getvalue().encode()
+
+
+EXPORT_ENCODERS = {
+    "ndjson": encode_ndjson,
+    "csv": encode_csv,
+}
@@ -0,0 +1,65 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, Iterable, Mapping, Optional, Tuple
+from uuid import UUID
+
+Version = Tuple[UUID, datetime]
+
+
+def make_etag(versions: Iterable[Version], *extra: object) -> str:
+    """
+    Gera um ETag forte a partir dos pares (id, updated_at) que compõem a
+    resposta. `extra` diferencia respostas com as mesmas linhas (ex.: se
+    existe próxima página).
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for product_id, updated_at in versions:
+        digest.update(f"{product_id}:{updated_at.isoformat()};".encode())
+    for value in extra:
+        digest.update(f"|{value}".encode())
+    return f'"{digest.hexdigest()}"'
+
+
+def http_date(value: datetime) -> str:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def validator_headers(etag: str, last_modified: Optional[datetime]) -> Dict[str, str]:
+    headers = {"ETag": etag}
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified)
+    return headers
+
+
+def has_conditional_headers(headers: Mapping[str, str]) -> bool:
+    return "if-none-match" in headers or "if-modified-since" in headers
+
+
+def is_not_modified(
+    headers: Mapping[str, str], etag: str, last_modified: Optional[datetime]
+) -> bool:
+    """
+    Avalia If-None-Match / If-Modified-Since (RFC 9110). If-None-Match tem
+    precedência quando presente.
+    """
+    if_none_match = headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in tags or etag in tags
+
+    if_modified_since = headers.get("if-modified-since")
+    if if_modified_since is None or last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    if last_modified.tzinfo is None:
+        last_modified = last_modified.replace(tzinfo=timezone.utc)
+    # Datas HTTP têm precisão de segundos
+    return last_modified.replace(microsecond=0) <= since
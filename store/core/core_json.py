@@ -0,0 +1,61 @@
+"""
+Codificação JSON rápida das respostas.
+
+Modelos pydantic são serializados direto pelo serializador do
+pydantic-core (Rust), sem passar por model_dump/jsonable_encoder; é só
+esse caminho que ganha velocidade. O resto (dicts já convertidos pelo
+FastAPI, erros) vai pelo json da biblioteca padrão, como no JSONResponse.
+
+Política para Decimal: sempre string ("8500.00"), igual ao que o pydantic
+gera para os schemas, para não perder precisão nem mudar o contrato.
+"""
+import json
+from datetime import date, time
+from decimal import Decimal
+from time import perf_counter
+from typing import Any
+from uuid import UUID
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from store.core.core_timing import record
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, (date, time)):
+        return value.isoformat()
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    if isinstance(content, BaseModel):
+        return content.__pydantic_serializer__.to_json(content)
+    return json.dumps(
+        content,
+        default=_default,
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse que codifica com `dumps` e registra o tempo na fase
+    `encode` do Server-Timing. Aceita um modelo pydantic como conteúdo:
+    retornar FastJSONResponse(modelo) numa rota pula também a validação
+    e a conversão para dict do response_model.
+    """
+
+    def render(self, content: Any) -> bytes:
+        start = perf_counter()
+        body = dumps(content)
+        record("encode", perf_counter() - start)
+        return body
@@ -0,0 +1,332 @@
+"""
+Registro de métricas em processo, exposto no formato texto do Prometheus
+(GET /metrics).
+
+Os valores são por worker e sem locks: cada worker roda um único event
+loop, então `value += 1` não concorre com nada. As séries de cada métrica
+ficam em dicts aninhados por valor de label, e quem está no caminho
+quente (middleware, usecases) guarda a série já resolvida, sem montar
+tuplas de labels a cada requisição.
+"""
+import functools
+import inspect
+from bisect import bisect_left
+from time import perf_counter
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Sequence, Tuple
+
+# Buckets (segundos) para latências de requisições e consultas
+LATENCY_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Rota usada quando a requisição não casa com nenhuma (evita uma série por URL)
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class CounterValue:
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+
+class HistogramValue:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Sequence[float]) -> None:
+        self.buckets = buckets
+        # Um contador por bucket, mais o +Inf no final
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class Metric:
+    """Uma métrica com labels; cada combinação de valores é uma série."""
+
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._series: Dict[Any, Any] = {}
+
+    def _new_value(self) -> Any:
+        raise NotImplementedError
+
+    def labels(self, *values: str) -> Any:
+        """Retorna (criando na primeira vez) a série desses valores de label."""
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}")
+        if not values:
+            values = ("",)
+        node = self._series
+        for value in values[:-1]:
+            node = node.setdefault(value, {})
+        series = node.get(values[-1])
+        if series is None:
+            series = node[values[-1]] = self._new_value()
+        return series
+
+    def series(self) -> Iterator[Tuple[Tuple[str, ...], Any]]:
+        depth = max(len(self.labelnames), 1)
+
+        def walk(node: Dict[Any, Any], prefix: Tuple[str, ...]) -> Iterator:
+            for key, child in node.items():
+                if len(prefix) + 1 == depth:
+                    yield prefix + (key,), child
+                else:
+                    yield from walk(child, prefix + (key,))
+
+        for values, value in walk(self._series, ()):
+            yield (values if self.labelnames else ()), value
+
+    def render(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} {self.kind}"
+        for values, value in self.series():
+            yield from self._render_series(_labels(self.labelnames, values), value)
+
+    def _render_series(self, labels: str, value: Any) -> Iterator[str]:
+        raise NotImplementedError
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def _new_value(self) -> CounterValue:
+        return CounterValue()
+
+    def _render_series(self, labels: str, value: CounterValue) -> Iterator[str]:
+        yield f"{self.name}{_braces(labels)} {_number(value.value)}"
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> None:
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_value(self) -> HistogramValue:
+        return HistogramValue(self.buckets)
+
+    def _render_series(self, labels: str, value: HistogramValue) -> Iterator[str]:
+        prefix = f"{labels}," if labels else ""
+        cumulative = 0
+        for bound, count in zip(self.buckets, value.counts):
+            cumulative += count
+            yield f'{self.name}_bucket{{{prefix}le="{_number(bound)}"}} {cumulative}'
+        yield f'{self.name}_bucket{{{prefix}le="+Inf"}} {value.count}'
+        yield f"{self.name}_sum{_braces(labels)} {_number(value.sum)}"
+        yield f"{self.name}_count{_braces(labels)} {value.count}"
+
+
+# Amostra calculada na hora da coleta: (nome, tipo, ajuda, labels, valor)
+Sample = Tuple[str, str, str, Dict[str, str], float]
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self.metrics: List[Metric] = []
+        # Funções chamadas a cada coleta (estado do pool, do cache...)
+        self.collectors: List[Callable[[], Iterable[Sample]]] = []
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, help, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, help, labelnames, buckets))
+
+    def collector(
+        self, function: Callable[[], Iterable[Sample]]
+    ) -> Callable[[], Iterable[Sample]]:
+        """Registra uma função de coleta (pode ser usado como decorator)."""
+        self.collectors.append(function)
+        return function
+
+    def _register(self, metric: Any) -> Any:
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+
+        described = set()
+        for collect in self.collectors:
+            for name, kind, help, labels, value in collect():
+                if name not in described:
+                    described.add(name)
+                    lines.append(f"# HELP {name} {help}")
+                    lines.append(f"# TYPE {name} {kind}")
+                rendered = _labels(labels.keys(), labels.values())
+                lines.append(f"{name}{_braces(rendered)} {_number(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names: Iterable[str], values: Iterable[Any]) -> str:
+    return ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+
+
+def _braces(labels: str) -> str:
+    return f"{{{labels}}}" if labels else ""
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+metrics = MetricsRegistry()
+
+http_requests = metrics.counter(
+    "store_http_requests_total",
+    "Requisições HTTP atendidas",
+    ("method", "route", "status"),
+)
+http_request_duration = metrics.histogram(
+    "store_http_request_duration_seconds",
+    "Latência das requisições HTTP (até o fim do corpo da resposta)",
+    ("method", "route", "status"),
+)
+usecase_duration = metrics.histogram(
+    "store_usecase_duration_seconds",
+    "Latência dos métodos dos usecases (consultas ao banco)",
+    ("method", "outcome"),
+)
+
+
+def track_usecase(name: str) -> Callable:
+    """
+    Decorator que mede a duração de um método de usecase em
+    store_usecase_duration_seconds{method=name, outcome=ok|error}.
+    Geradores assíncronos são medidos até serem esgotados ou fechados.
+    """
+    ok = usecase_duration.labels(name, "ok")
+    error = usecase_duration.labels(name, "error")
+
+    def decorator(function: Callable) -> Callable:
+        if inspect.isasyncgenfunction(function):
+
+            @functools.wraps(function)
+            async def generator_wrapper(*args: Any, **kwargs: Any) -> Any:
+                start = perf_counter()
+                series = error
+                try:
+                    async for item in function(*args, **kwargs):
+                        yield item
+                    series = ok
+                finally:
+                    series.observe(perf_counter() - start)
+
+            return generator_wrapper
+
+        @functools.wraps(function)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            start = perf_counter()
+            series = error
+            try:
+                result = await function(*args, **kwargs)
+                series = ok
+                return result
+            finally:
+                series.observe(perf_counter() - start)
+
+        return wrapper
+
+    return decorator
+
+
+class MetricsMiddleware:
+    """
+    Middleware ASGI que conta e mede as requisições por método, rota
+    (o template, ex.: /products/{id}) e status.
+    """
+
+    def __init__(self, app: Any) -> None:
+        self.app = app
+        # method -> rota -> status -> (contador, histograma)
+        self._series: Dict[str, Dict[str, Dict[int, Tuple[Any, Any]]]] = {}
+
+    async def __call__(self, scope: Any, receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = perf_counter()
+        status_code = 500
+
+        async def send_with_status(message: Dict[str, Any]) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            counter, histogram = self._series_for(
+                scope["method"],
+                route.path if route is not None else UNMATCHED_ROUTE,
+                status_code,
+            )
+            counter.inc()
+            histogram.observe(perf_counter() - start)
+
+    def _series_for(self, method: str, route: str, status_code: int) -> Tuple:
+        by_route = self._series.get(method)
+        if by_route is None:
+            by_route = self._series[method] = {}
+        by_status = by_route.get(route)
+        if by_status is None:
+            by_status = by_route[route] = {}
+        series = by_status.get(status_code)
+        if series is None:
+            status_label = str(status_code)
+            series = by_status[status_code] = (
+                http_requests.labels(method, route, status_label),
+                http_request_duration.labels(method, route, status_label),
+            )
+        return series
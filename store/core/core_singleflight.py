@@ -0,0 +1,66 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, TypeVar
+
+from store.core.core_config import settings
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Agrupa chamadas concorrentes com a mesma chave numa única execução:
+    a primeira dispara a consulta e as que chegam enquanto ela está em
+    andamento aguardam o mesmo resultado (ou a mesma exceção). Por worker
+    e sem locks, como o LRUCache.
+    """
+
+    def __init__(self) -> None:
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: Hashable, function: Callable[[], Awaitable[T]]) -> T:
+        task = self._calls.get(key)
+        if task is None:
+            self.calls += 1
+            task = asyncio.ensure_future(function())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+        else:
+            self.coalesced += 1
+        # shield: se quem disparou for cancelado (cliente desconectou), a
+        # consulta continua para os demais que aguardam
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # Marca a exceção como lida mesmo se todos desistiram de aguardar
+        if not task.cancelled():
+            task.exception()
+
+    def forget(self, key: Hashable) -> None:
+        """
+        Chamadas seguintes com `key` não reaproveitam a que está em
+        andamento (ex.: depois de uma escrita, que a tornaria obsoleta).
+        """
+        self._calls.pop(key, None)
+
+    def forget_if(self, predicate: Callable[[Any], bool]) -> None:
+        for key in [key for key in self._calls if predicate(key)]:
+            del self._calls[key]
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "in_flight": len(self._calls),
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+        }
+
+
+product_flights: SingleFlight | None = (
+    SingleFlight() if settings.PRODUCT_SINGLEFLIGHT_ENABLED else None
+)
@@ -0,0 +1,171 @@
+"""
+Medição por requisição das fases de atendimento, enviada no header
+Server-Timing (e, opcionalmente, numa linha de log estruturada).
+
+Fases:
+    queue       espera na fila do controle de admissão (core_admission)
+    db-acquire  espera por uma conexão do pool
+    db-exec     cursor.execute() (envio do SQL e execução)
+    db-fetch    leitura das linhas e montagem dos schemas (row factory)
+    encode      serialização JSON da resposta
+    app         o restante (validação da entrada, rotas, dependências)
+    total       do início da requisição até o envio dos headers
+"""
+import json
+import logging
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Any, AsyncIterator, Dict, Optional
+
+from psycopg import AsyncConnection, AsyncCursor, AsyncServerCursor
+from psycopg_pool import AsyncConnectionPool
+
+logger = logging.getLogger("store.timing")
+
+PHASES = ("queue", "db-acquire", "db-exec", "db-fetch", "encode")
+
+
+class RequestTimings:
+    """Tempo acumulado (segundos) por fase dentro de uma requisição."""
+
+    __slots__ = ("phases", "start")
+
+    def __init__(self) -> None:
+        self.phases: Dict[str, float] = {}
+        self.start = perf_counter()
+
+    def add(self, phase: str, seconds: float) -> None:
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    def summary(self) -> Dict[str, float]:
+        """Fases em milissegundos, incluindo `app` e `total`."""
+        total = perf_counter() - self.start
+        measured = {
+            phase: self.phases[phase] for phase in PHASES if phase in self.phases
+        }
+        result = {phase: seconds * 1000 for phase, seconds in measured.items()}
+        result["app"] = max(total - sum(measured.values()), 0.0) * 1000
+        result["total"] = total * 1000
+        return result
+
+    def header(self) -> str:
+        return ", ".join(
+            f"{phase};dur={duration:.3f}" for phase, duration in self.summary().items()
+        )
+
+
+_current: ContextVar[Optional[RequestTimings]] = ContextVar(
+    "request_timings", default=None
+)
+
+
+def record(phase: str, seconds: float) -> None:
+    """Soma `seconds` à fase na requisição atual (sem efeito fora de uma)."""
+    timings = _current.get()
+    if timings is not None:
+        timings.add(phase, seconds)
+
+
+class _TimedCursorMixin:
+    async def execute(self, *args: Any, **kwargs: Any) -> Any:
+        start = perf_counter()
+        try:
+            return await super().execute(*args, **kwargs)
+        finally:
+            record("db-exec", perf_counter() - start)
+
+    async def fetchone(self) -> Any:
+        start = perf_counter()
+        try:
+            return await super().fetchone()
+        finally:
+            record("db-fetch", perf_counter() - start)
+
+    async def fetchmany(self, size: int = 0) -> Any:
+        start = perf_counter()
+        try:
+            return await super().fetchmany(size)
+        finally:
+            record("db-fetch", perf_counter() - start)
+
+    async def fetchall(self) -> Any:
+        start = perf_counter()
+        try:
+            return await super().fetchall()
+        finally:
+            record("db-fetch", perf_counter() - start)
+
+
+class TimedCursor(_TimedCursorMixin, AsyncCursor):
+    pass
+
+
+class TimedServerCursor(_TimedCursorMixin, AsyncServerCursor):
+    pass
+
+
+@asynccontextmanager
+async def timed_connection(
+    pool: AsyncConnectionPool,
+) -> AsyncIterator[AsyncConnection]:
+    """
+    pool.connection() medindo a espera pela conexão; os cursores abertos
+    nela medem execute() e fetch*().
+    """
+    start = perf_counter()
+    async with pool.connection() as conn:
+        record("db-acquire", perf_counter() - start)
+        conn.cursor_factory = TimedCursor
+        conn.server_cursor_factory = TimedServerCursor
+        yield conn
+
+
+class ServerTimingMiddleware:
+    """
+    Middleware ASGI que abre um RequestTimings por requisição, adiciona o
+    header Server-Timing na resposta e, com `log=True`, registra uma linha
+    JSON no logger "store.timing" ao fim da requisição.
+    """
+
+    def __init__(self, app: Any, log: bool = False) -> None:
+        self.app = app
+        self.log = log
+
+    async def __call__(self, scope: Any, receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        token = _current.set(timings)
+        status_code = 500
+
+        async def send_with_timing(message: Dict[str, Any]) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (b"server-timing", timings.header().encode("latin-1")),
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            if self.log:
+                logger.info(
+                    json.dumps(
+                        {
+                            "method": scope["method"],
+                            "path": scope["path"],
+                            "status": status_code,
+                            "timings_ms": {
+                                phase: round(duration, 3)
+                                for phase, duration in timings.summary().items()
+                            },
+                        }
+                    )
+                )
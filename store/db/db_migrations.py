@@ -0,0 +1,130 @@
+"""
+Migrations versionadas do schema.
+
+Cada arquivo store/db/migrations/NNNN_descricao.sql é uma versão, aplicada
+em ordem, uma vez, dentro da própria transação. As versões aplicadas ficam
+em schema_migrations com o checksum do arquivo; alterar um arquivo já
+aplicado é um erro (crie uma nova migration).
+
+Um advisory lock serializa execuções concorrentes (vários workers com
+DB_AUTO_MIGRATE ou deploys simultâneos).
+"""
+import hashlib
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List
+
+from psycopg import AsyncConnection
+
+from store.core.core_exceptions import MigrationException
+
+MIGRATIONS_DIR = Path(__file__).parent / "migrations"
+
+# Chave arbitrária e fixa do pg_advisory_lock das migrations
+ADVISORY_LOCK_ID = 7_041_921_001
+
+_FILENAME = re.compile(r"^(\d+)_(\w+)\.sql$")
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    name: str
+    sql: str
+
+    @property
+    def checksum(self) -> str:
+        return hashlib.sha256(self.sql.encode()).hexdigest()
+
+
+def load_migrations(directory: Path = MIGRATIONS_DIR) -> List[Migration]:
+    migrations: Dict[int, Migration] = {}
+    for path in sorted(directory.glob("*.sql")):
+        match = _FILENAME.match(path.name)
+        if not match:
+            raise MigrationException(message=f"Invalid migration name: {path.name}")
+        version = int(match.group(1))
+        if version in migrations:
+            raise MigrationException(message=f"Duplicated migration version {version}")
+        migrations[version] = Migration(
+            version=version, name=match.group(2), sql=path.read_text()
+        )
+    return [migrations[version] for version in sorted(migrations)]
+
+
+async def applied_migrations(conn: AsyncConnection) -> Dict[int, str]:
+    """Versões já aplicadas e seus checksums."""
+    await conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            checksum TEXT NOT NULL,
+            applied_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now()
+        );
+        """
+    )
+    cursor = await conn.execute("SELECT version, checksum FROM schema_migrations;")
+    return {version: checksum for version, checksum in await cursor.fetchall()}
+
+
+def pending_migrations(
+    migrations: List[Migration], applied: Dict[int, str]
+) -> List[Migration]:
+    for migration in migrations:
+        checksum = applied.get(migration.version)
+        if checksum is not None and checksum != migration.checksum:
+            raise MigrationException(
+                message=(
+                    f"Migration {migration.version}_{migration.name} changed "
+                    "after being applied"
+                )
+            )
+    return [migration for migration in migrations if migration.version not in applied]
+
+
+async def migrate(
+    dsn: str, target: int | None = None, directory: Path = MIGRATIONS_DIR
+) -> List[Migration]:
+    """
+    Aplica as migrations pendentes (até `target`, se informado) e retorna
+    as que foram aplicadas agora.
+    """
+    migrations = [
+        migration
+        for migration in load_migrations(directory)
+        if target is None or migration.version <= target
+    ]
+    applied_now: List[Migration] = []
+
+    async with await AsyncConnection.connect(dsn, autocommit=True) as conn:
+        await conn.execute("SELECT pg_advisory_lock(%s);", (ADVISORY_LOCK_ID,))
+        try:
+            # Lido depois do lock: outra execução pode ter acabado de aplicar
+            pending = pending_migrations(migrations, await applied_migrations(conn))
+            for migration in pending:
+                async with conn.transaction():
+                    await conn.execute(migration.sql)
+                    await conn.execute(
+                        "INSERT INTO schema_migrations (version, name, checksum) "
+                        "VALUES (%s, %s, %s);",
+                        (migration.version, migration.name, migration.checksum),
+                    )
+                applied_now.append(migration)
+        finally:
+            await conn.execute("SELECT pg_advisory_unlock(%s);", (ADVISORY_LOCK_ID,))
+
+    return applied_now
+
+
+async def migration_status(
+    dsn: str, directory: Path = MIGRATIONS_DIR
+) -> List[tuple[Migration, bool]]:
+    """Todas as migrations conhecidas e se cada uma já foi aplicada."""
+    async with await AsyncConnection.connect(dsn, autocommit=True) as conn:
+        applied = await applied_migrations(conn)
+    return [
+        (migration, migration.version in applied)
+        for migration in load_migrations(directory)
+    ]
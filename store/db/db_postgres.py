@@ -1,22 +1,228 @@
+import asyncio
+from contextlib import AsyncExitStack
+from itertools import cycle
+from typing import Any, Awaitable, Callable, Dict, List, Literal, Sequence, Set
+
+from psycopg import AsyncConnection, Error as PsycopgError, sql
 from psycopg_pool import AsyncConnectionPool
 
+ReplicaSelection = Literal["round_robin", "least_busy"]
+
+# Recebe o payload de cada NOTIFY, ou None quando avisos podem ter sido
+# perdidos (reconexão do LISTEN): o assinante deve descartar o que deriva
+# dos dados.
+Subscriber = Callable[[str | None], Any]
+
+# Executado em cada conexão nova do pool, antes de ela ser emprestada
+ConnectionConfigure = Callable[[AsyncConnection], Awaitable[None]]
+
+# Intervalo (s) em que o LISTEN para de esperar avisos para assinar canais
+# novos, e espera antes de reconectar após uma falha
+LISTEN_POLL_INTERVAL = 1.0
+LISTEN_RETRY_DELAY = 2.0
+
 
 class PostgresClient:
     def __init__(self):
         self.pool: AsyncConnectionPool | None = None
+        self.replica_pools: List[AsyncConnectionPool] = []
+        self.replica_selection: ReplicaSelection = "round_robin"
         self._dsn: str | None = None
+        self._replica_dsns: List[str] = []
+        self._replica_cycle = cycle(())
+        # Extensões instaladas no banco (ex.: pg_trgm habilita a busca fuzzy)
+        self.extensions: Set[str] = set()
+        # Assinantes de LISTEN/NOTIFY, por canal; uma conexão dedicada por
+        # worker recebe os avisos e os repassa
+        self.subscribers: Dict[str, List[Subscriber]] = {}
+        self._listener: asyncio.Task | None = None
+        # Canais com LISTEN ativo na conexão dedicada
+        self.listening: Set[str] = set()
 
-    async def connect(self, dsn: str):
-        if self.pool is None or self._dsn != dsn:
-            if self.pool is not None and not self.pool.closed:
-                await self.pool.close()
+    async def connect(
+        self,
+        dsn: str,
+        min_size: int = 1,
+        max_size: int = 10,
+        max_idle: float = 600.0,
+        max_lifetime: float = 3600.0,
+        timeout: float = 30.0,
+        warmup_size: int = 0,
+        replica_dsns: Sequence[str] = (),
+        replica_selection: ReplicaSelection = "round_robin",
+        configure: ConnectionConfigure | None = None,
+        statement_timeout: int = 0,
+        notify_changes: bool = True,
+    ):
+        replica_dsns = list(replica_dsns)
+        if self.pool is None or self._dsn != dsn or self._replica_dsns != replica_dsns:
+            await self.disconnect()
+            options = dict(
+                min_size=min_size,
+                max_size=max_size,
+                max_idle=max_idle,
+                max_lifetime=max_lifetime,
+                timeout=timeout,
+                configure=configure,
+                kwargs=self._session_options(statement_timeout, notify_changes),
+            )
             self._dsn = dsn
-            self.pool = AsyncConnectionPool(dsn, min_size=1, max_size=10, open=False)
-            await self.pool.open()
+            self._replica_dsns = replica_dsns
+            self.replica_selection = replica_selection
+            self.pool = await self._open_pool(dsn, options)
+            self.replica_pools = [
+                await self._open_pool(replica_dsn, options)
+                for replica_dsn in replica_dsns
+            ]
+            self._replica_cycle = cycle(self.replica_pools)
+            for pool in [self.pool, *self.replica_pools]:
+                await self.warm_up(warmup_size, pool)
+            self.extensions = await self._installed_extensions(self.pool)
+
+            if self.subscribers:
+                self._start_listener()
 
             print("PostgresClient: Pool de conexão aberto.")
+            if self.replica_pools:
+                print(
+                    f"PostgresClient: {len(self.replica_pools)} réplica(s) de "
+                    "leitura conectada(s)."
+                )
+
+    @staticmethod
+    def _session_options(
+        statement_timeout: int, notify_changes: bool
+    ) -> Dict[str, Any]:
+        options = []
+        # statement_timeout (ms) como padrão de cada conexão do pool: uma
+        # consulta lenta não segura a conexão indefinidamente
+        if statement_timeout:
+            options.append(f"-c statement_timeout={statement_timeout}")
+        # Sem NOTIFY da trigger nas escritas: o worker publica depois do
+        # commit (ver migrations/0006_products_notify_coalesced.sql)
+        if not notify_changes:
+            options.append("-c store.notify_changes=off")
+        return {"options": " ".join(options)} if options else {}
+
+    @staticmethod
+    async def _open_pool(dsn: str, options: Dict[str, Any]) -> AsyncConnectionPool:
+        pool = AsyncConnectionPool(dsn, open=False, **options)
+        # Espera as min_size conexões iniciais antes de liberar o startup
+        await pool.open(wait=True, timeout=options["timeout"])
+        return pool
+
+    @staticmethod
+    async def _installed_extensions(pool: AsyncConnectionPool) -> Set[str]:
+        async with pool.connection() as conn:
+            cursor = await conn.execute("SELECT extname FROM pg_extension;")
+            return {name for (name,) in await cursor.fetchall()}
+
+    async def warm_up(self, size: int, pool: AsyncConnectionPool | None = None):
+        """
+        Abre até `size` conexões de uma vez, fazendo o pool crescer antes do
+        primeiro pico de tráfego. Elas voltam ao pool e só são fechadas
+        depois de max_idle.
+        """
+        pool = pool or self.pool
+        if pool is None or size <= pool.min_size:
+            return
+        async with AsyncExitStack() as stack:
+            for _ in range(min(size, pool.max_size)):
+                await stack.enter_async_context(pool.connection())
+
+    def read_pool(self) -> AsyncConnectionPool:
+        """
+        Pool para consultas somente leitura: uma réplica escolhida por
+        round robin ou pela menor ocupação, ou o primário se não houver
+        réplicas configuradas.
+        """
+        if not self.replica_pools:
+            return self.pool
+        if self.replica_selection == "least_busy":
+            return min(self.replica_pools, key=self._busyness)
+        return next(self._replica_cycle)
+
+    @staticmethod
+    def _busyness(pool: AsyncConnectionPool) -> tuple[int, int]:
+        stats = pool.get_stats()
+        return (
+            stats["requests_waiting"],
+            stats["pool_size"] - stats["pool_available"],
+        )
+
+    def subscribe(self, channel: str, callback: Subscriber) -> Callable[[], None]:
+        """
+        Repassa a `callback` os avisos de NOTIFY `channel`. Retorna a
+        função que cancela a assinatura. Os callbacks rodam na task do
+        LISTEN e não devem bloquear.
+        """
+        self.subscribers.setdefault(channel, []).append(callback)
+        if self._dsn is not None:
+            self._start_listener()
+
+        def unsubscribe() -> None:
+            callbacks = self.subscribers.get(channel, [])
+            if callback in callbacks:
+                callbacks.remove(callback)
+
+        return unsubscribe
+
+    def _start_listener(self) -> None:
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.ensure_future(self._listen())
+
+    async def _listen(self) -> None:
+        connected_before = False
+        while True:
+            try:
+                async with await AsyncConnection.connect(
+                    self._dsn, autocommit=True
+                ) as conn:
+                    self.listening = set()
+                    if connected_before:
+                        self._dispatch_all(None)
+                    connected_before = True
+                    while True:
+                        for channel in set(self.subscribers) - self.listening:
+                            await conn.execute(
+                                sql.SQL("LISTEN {};").format(sql.Identifier(channel))
+                            )
+                            self.listening.add(channel)
+                        async for notify in conn.notifies(timeout=LISTEN_POLL_INTERVAL):
+                            self._dispatch(notify.channel, notify.payload)
+            except PsycopgError as exc:
+                print(f"PostgresClient: LISTEN interrompido ({exc}); reconectando.")
+                await asyncio.sleep(LISTEN_RETRY_DELAY)
+
+    def _dispatch(self, channel: str, payload: str | None) -> None:
+        for callback in list(self.subscribers.get(channel, ())):
+            try:
+                callback(payload)
+            except Exception as exc:  # um assinante com erro não derruba os demais
+                print(f"PostgresClient: erro no assinante de {channel}: {exc}")
+
+    def _dispatch_all(self, payload: str | None) -> None:
+        for channel in list(self.subscribers):
+            self._dispatch(channel, payload)
 
     async def disconnect(self):
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+            self.listening = set()
+
+        for replica in self.replica_pools:
+            if not replica.closed:
+                await replica.close()
+        self.replica_pools = []
+        self._replica_dsns = []
+        self.extensions = set()
+        self._replica_cycle = cycle(())
+
         if self.pool and not self.pool.closed:
             await self.pool.close()
             self.pool = None
@@ -28,5 +234,18 @@ class PostgresClient:
             raise ConnectionError("Database pool is not connected or is closed.")
         return await self.pool.connection()
 
+    def stats(self, pool: AsyncConnectionPool | None = None) -> Dict[str, int]:
+        """
+        Estatísticas do pool (pool.get_stats()) mais as conexões em uso.
+        Sem argumento, usa o pool primário. Contadores que ainda não
+        ocorreram não aparecem no get_stats.
+        """
+        pool = pool or self.pool
+        if pool is None or pool.closed:
+            raise ConnectionError("Database pool is not connected or is closed.")
+        stats = pool.get_stats()
+        stats["connections_in_use"] = stats["pool_size"] - stats["pool_available"]
+        return stats
+
 
 db_client = PostgresClient()
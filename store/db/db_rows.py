@@ -0,0 +1,62 @@
+from operator import itemgetter
+from typing import Any, Callable, Dict, Sequence, Type, TypeVar
+
+from psycopg.rows import RowMaker
+from pydantic import BaseModel
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+def model_row(model: Type[ModelT]) -> Callable[[Any], RowMaker[ModelT]]:
+    """
+    Row factory do psycopg que monta `model` direto de cada linha, sem
+    revalidar os campos.
+
+    Faz o mesmo que `model.model_construct`, mas sem o laço de defaults
+    em Python (que o deixa mais lento que a própria validação). Use apenas
+    com dados vindos do banco: os tipos das colunas já correspondem aos do
+    schema (UUID, Decimal, datetime...) e os nomes das colunas aos campos.
+    As colunas são reordenadas na ordem dos campos do schema, para que o
+    JSON gerado seja idêntico ao de um modelo validado; colunas que não são
+    campos (ex.: a chave do cursor num schema enxuto) ficam como atributos,
+    fora do JSON.
+    """
+    field_order = {name: position for position, name in enumerate(model.model_fields)}
+    new = object.__new__
+    set_attribute = object.__setattr__
+
+    def factory(cursor) -> RowMaker[ModelT]:
+        columns = [column.name for column in cursor.description or ()]
+        positions = sorted(
+            range(len(columns)),
+            key=lambda i: field_order.get(columns[i], len(field_order)),
+        )
+        names = [columns[i] for i in positions]
+        fields_set = set(names)
+        reorder = itemgetter(*positions) if len(positions) > 1 else tuple
+
+        def make_row(values: Sequence[Any]) -> ModelT:
+            instance = new(model)
+            set_attribute(instance, "__dict__", dict(zip(names, reorder(values))))
+            set_attribute(instance, "__pydantic_fields_set__", fields_set.copy())
+            set_attribute(instance, "__pydantic_extra__", None)
+            set_attribute(instance, "__pydantic_private__", None)
+            return instance
+
+        return make_row
+
+    return factory
+
+
+def construct(model: Type[ModelT], values: Dict[str, Any]) -> ModelT:
+    """
+    Instância de `model` com `values`, sem validação, como as linhas de
+    `model_row`. Chaves que não são campos do schema continuam acessíveis
+    como atributos, mas ficam fora do JSON.
+    """
+    instance = object.__new__(model)
+    object.__setattr__(instance, "__dict__", values)
+    object.__setattr__(instance, "__pydantic_fields_set__", set(values))
+    object.__setattr__(instance, "__pydantic_extra__", None)
+    object.__setattr__(instance, "__pydantic_private__", None)
+    return instance
@@ -0,0 +1,94 @@
+"""
+Registro dos statements fixos do CRUD de produtos.
+
+Cada statement tem texto constante, então o psycopg pode prepará-lo uma
+vez por conexão (execute(..., prepare=True)) e reutilizar o plano nas
+execuções seguintes. Consultas montadas dinamicamente (filtros, lotes)
+ficam fora do registro e usam o limiar automático do psycopg.
+"""
+
+PRODUCT_COLUMNS = (
+    "id, name, description, price, quantity, status, created_at, updated_at"
+)
+
+INSERT_PRODUCT = (
+    f"INSERT INTO products ({PRODUCT_COLUMNS}) "
+    "VALUES (%s, %s, %s, %s, %s, %s, %s, %s) "
+    f"RETURNING {PRODUCT_COLUMNS};"
+)
+
+# Várias linhas num único INSERT (group commit do create), uma coluna por
+# array, na mesma ordem de INSERT_PRODUCT
+INSERT_PRODUCTS = (
+    f"INSERT INTO products ({PRODUCT_COLUMNS}) "
+    "SELECT * FROM unnest(%s::uuid[], %s::varchar[], %s::varchar[], "
+    "%s::numeric[], %s::integer[], %s::boolean[], %s::timestamptz[], "
+    "%s::timestamptz[]) "
+    f"RETURNING {PRODUCT_COLUMNS};"
+)
+
+SELECT_PRODUCT = f"SELECT {PRODUCT_COLUMNS} FROM products WHERE id = %s;"
+
+# Vários produtos por id numa consulta (POST /products/batch-get)
+SELECT_PRODUCTS_BY_IDS = f"SELECT {PRODUCT_COLUMNS} FROM products WHERE id = ANY(%s);"
+
+# Produtos alterados mais recentemente, pré-carregados no cache no startup
+SELECT_RECENT_PRODUCTS = (
+    f"SELECT {PRODUCT_COLUMNS} FROM products ORDER BY updated_at DESC LIMIT %s;"
+)
+
+SELECT_PRODUCT_VERSION = "SELECT id, updated_at FROM products WHERE id = %s;"
+
+# Forma canônica do PATCH: um único texto para qualquer combinação de
+# campos. Campos ausentes chegam como NULL e mantêm o valor atual (as
+# colunas são NOT NULL, então NULL nunca é um valor válido de destino).
+UPDATE_PRODUCT = (
+    "UPDATE products SET "
+    "quantity = COALESCE(%(quantity)s::integer, quantity), "
+    "price = COALESCE(%(price)s::numeric, price), "
+    "status = COALESCE(%(status)s::boolean, status), "
+    "updated_at = %(updated_at)s "
+    f"WHERE id = %(id)s RETURNING {PRODUCT_COLUMNS};"
+)
+
+# Reserva atômica: decrementa só se houver estoque, sem ler antes. Sob
+# concorrência cada UPDATE espera o lock da linha e reavalia a condição
+# com o valor já decrementado, então nenhuma reserva se perde.
+RESERVE_PRODUCT = (
+    "UPDATE products SET quantity = quantity - %(quantity)s, "
+    "updated_at = %(updated_at)s "
+    "WHERE id = %(id)s AND quantity >= %(quantity)s "
+    f"RETURNING {PRODUCT_COLUMNS};"
+)
+
+SELECT_PRODUCT_QUANTITY = "SELECT quantity FROM products WHERE id = %s;"
+
+# Reserva em lote (carrinho): trava as linhas em ordem de ID antes do
+# UPDATE, para que carrinhos concorrentes com itens em comum não entrem
+# em deadlock.
+LOCK_PRODUCTS = (
+    "SELECT id, quantity FROM products WHERE id = ANY(%s) ORDER BY id FOR UPDATE;"
+)
+
+RESERVE_PRODUCTS = (
+    "UPDATE products AS p SET quantity = p.quantity - v.quantity, "
+    "updated_at = %s "
+    "FROM unnest(%s::uuid[], %s::integer[]) AS v(id, quantity) "
+    "WHERE p.id = v.id AND p.quantity >= v.quantity "
+    "RETURNING p.id, p.name, p.description, p.price, p.quantity, p.status, "
+    "p.created_at, p.updated_at;"
+)
+
+# Totais do estoque: soma dos shards de product_stats (migration 0004)
+SELECT_PRODUCT_STATS = (
+    "SELECT sum(product_count)::bigint AS product_count, "
+    "sum(active_count)::bigint AS active_count, "
+    "sum(stock_units)::bigint AS stock_units, "
+    "sum(inventory_value) AS inventory_value, "
+    "sum(out_of_stock_count)::bigint AS out_of_stock_count "
+    "FROM product_stats;"
+)
+
+REBUILD_PRODUCT_STATS = "SELECT product_stats_rebuild();"
+
+DELETE_PRODUCT = "DELETE FROM products WHERE id = %s;"
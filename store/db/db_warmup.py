@@ -0,0 +1,38 @@
+"""
+Aquecimento de cada conexão nova do pool (callback `configure`).
+
+Executa uma vez as leituras fixas do CRUD, preparando-as (com
+DB_PREPARED_STATEMENTS) e carregando o catálogo do backend antes da
+primeira requisição. Os parâmetros têm os mesmos tipos usados pelo
+ProductUsecase (id como str), para o psycopg reaproveitar o statement
+preparado. As escritas ficam de fora: executá-las exigiria um ROLLBACK,
+e o psycopg descarta os statements preparados da conexão ao ver um.
+"""
+from typing import Any, Awaitable, Callable, Sequence, Tuple
+
+from psycopg import AsyncConnection
+
+from store.db import db_statements
+
+# Nenhum produto tem este id: as consultas não retornam linhas
+_NO_PRODUCT = ("00000000-0000-0000-0000-000000000000",)
+
+WARMUP_STATEMENTS: Sequence[Tuple[str, Tuple[Any, ...]]] = (
+    (db_statements.SELECT_PRODUCT, _NO_PRODUCT),
+    (db_statements.SELECT_PRODUCT_VERSION, _NO_PRODUCT),
+    (db_statements.SELECT_PRODUCT_QUANTITY, _NO_PRODUCT),
+    (db_statements.SELECT_PRODUCT_STATS, ()),
+)
+
+
+def warm_connection(
+    prepare: bool = True,
+) -> Callable[[AsyncConnection], Awaitable[None]]:
+    async def configure(conn: AsyncConnection) -> None:
+        async with conn.cursor() as cur:
+            for statement, params in WARMUP_STATEMENTS:
+                await cur.execute(statement, params, prepare=prepare)
+        # O pool exige a conexão ociosa (fora de transação)
+        await conn.commit()
+
+    return configure
@@ -0,0 +1,12 @@
+-- Tabela de produtos. IF NOT EXISTS permite adotar bancos criados antes
+-- das migrations (ex.: pelo conftest antigo).
+CREATE TABLE IF NOT EXISTS products (
+    id UUID PRIMARY KEY,
+    name VARCHAR(255) NOT NULL,
+    description VARCHAR(1000),
+    quantity INTEGER NOT NULL,
+    price NUMERIC(10, 2) NOT NULL,
+    status BOOLEAN NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
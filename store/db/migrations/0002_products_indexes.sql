@@ -0,0 +1,25 @@
+-- Índices para os caminhos de acesso de GET /products (ver
+-- ProductUsecase._page_sql): ORDER BY <sort>, id com keyset
+-- (<sort>, id) > (...), opcionalmente filtrando por status e preço.
+
+-- Paginação sem filtros, por data de criação (padrão) ou nome
+CREATE INDEX IF NOT EXISTS products_created_at_id_idx
+    ON products (created_at, id);
+CREATE INDEX IF NOT EXISTS products_name_id_idx
+    ON products (name, id);
+
+-- status=true|false mais a chave de ordenação
+CREATE INDEX IF NOT EXISTS products_status_created_at_id_idx
+    ON products (status, created_at, id);
+CREATE INDEX IF NOT EXISTS products_status_name_id_idx
+    ON products (status, name, id);
+
+-- Faixas de preço (min_price / max_price)
+CREATE INDEX IF NOT EXISTS products_price_idx
+    ON products (price);
+
+-- Itens ativos com estoque baixo (status=true&max_quantity<=10): índice
+-- parcial pequeno, já na ordem da paginação padrão
+CREATE INDEX IF NOT EXISTS products_low_stock_idx
+    ON products (created_at, id)
+    WHERE status AND quantity <= 10;
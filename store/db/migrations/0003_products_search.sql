@@ -0,0 +1,26 @@
+-- Busca textual (GET /products/search): tsvector gerado a partir de nome
+-- (peso A) e descrição (peso B), mantido pelo próprio Postgres, com
+-- índice GIN. A configuração 'simple' não remove stop words nem aplica
+-- stemming, o que preserva marcas e modelos ("Iphone 14 Pro").
+ALTER TABLE products
+    ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(name, '')), 'A')
+        || setweight(to_tsvector('simple', coalesce(description, '')), 'B')
+    ) STORED;
+
+CREATE INDEX IF NOT EXISTS products_search_idx
+    ON products USING GIN (search_vector);
+
+-- Tolerância a erros de digitação no nome com pg_trgm, quando a extensão
+-- estiver disponível no servidor. Sem ela a busca usa só o tsvector
+-- (ver PostgresClient.extensions).
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm') THEN
+        CREATE EXTENSION IF NOT EXISTS pg_trgm;
+        CREATE INDEX IF NOT EXISTS products_name_trgm_idx
+            ON products USING GIN (name gin_trgm_ops);
+    END IF;
+END
+$$;
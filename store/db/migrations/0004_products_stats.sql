@@ -0,0 +1,158 @@
+-- Totais do estoque para GET /products/stats, mantidos por triggers a cada
+-- INSERT/UPDATE/DELETE/COPY/TRUNCATE em products. A leitura soma poucas
+-- linhas em vez de agregar a tabela inteira.
+--
+-- Os totais ficam divididos em 16 linhas (shards): cada conexão atualiza
+-- a linha pg_backend_pid() % 16, então escritas concorrentes não disputam
+-- o lock de uma única linha de resumo. Os valores reais são a soma dos
+-- shards.
+CREATE TABLE IF NOT EXISTS product_stats (
+    shard SMALLINT PRIMARY KEY,
+    product_count BIGINT NOT NULL DEFAULT 0,
+    active_count BIGINT NOT NULL DEFAULT 0,
+    stock_units BIGINT NOT NULL DEFAULT 0,
+    inventory_value NUMERIC NOT NULL DEFAULT 0,
+    out_of_stock_count BIGINT NOT NULL DEFAULT 0
+);
+
+INSERT INTO product_stats (shard)
+SELECT generate_series(0, 15)
+ON CONFLICT (shard) DO NOTHING;
+
+CREATE OR REPLACE FUNCTION product_stats_add(
+    d_count BIGINT,
+    d_active BIGINT,
+    d_units BIGINT,
+    d_value NUMERIC,
+    d_out_of_stock BIGINT
+) RETURNS void LANGUAGE plpgsql AS $$
+BEGIN
+    IF d_count = 0 AND d_active = 0 AND d_units = 0 AND d_value = 0
+            AND d_out_of_stock = 0 THEN
+        RETURN;
+    END IF;
+    UPDATE product_stats SET
+        product_count = product_count + d_count,
+        active_count = active_count + d_active,
+        stock_units = stock_units + d_units,
+        inventory_value = inventory_value + d_value,
+        out_of_stock_count = out_of_stock_count + d_out_of_stock
+    WHERE shard = pg_backend_pid() % 16;
+END
+$$;
+
+-- Triggers por statement com tabelas de transição: um UPDATE no resumo
+-- por comando, mesmo num COPY de milhares de linhas.
+CREATE OR REPLACE FUNCTION product_stats_on_insert() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    PERFORM product_stats_add(
+        count(*),
+        count(*) FILTER (WHERE status),
+        coalesce(sum(quantity), 0),
+        coalesce(sum(price * quantity), 0),
+        count(*) FILTER (WHERE quantity <= 0)
+    ) FROM new_rows;
+    RETURN NULL;
+END
+$$;
+
+CREATE OR REPLACE FUNCTION product_stats_on_delete() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    PERFORM product_stats_add(
+        -count(*),
+        -count(*) FILTER (WHERE status),
+        -coalesce(sum(quantity), 0),
+        -coalesce(sum(price * quantity), 0),
+        -count(*) FILTER (WHERE quantity <= 0)
+    ) FROM old_rows;
+    RETURN NULL;
+END
+$$;
+
+CREATE OR REPLACE FUNCTION product_stats_on_update() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    PERFORM product_stats_add(
+        n.product_count - o.product_count,
+        n.active_count - o.active_count,
+        n.stock_units - o.stock_units,
+        n.inventory_value - o.inventory_value,
+        n.out_of_stock_count - o.out_of_stock_count
+    )
+    FROM (
+        SELECT count(*) AS product_count,
+               count(*) FILTER (WHERE status) AS active_count,
+               coalesce(sum(quantity), 0) AS stock_units,
+               coalesce(sum(price * quantity), 0) AS inventory_value,
+               count(*) FILTER (WHERE quantity <= 0) AS out_of_stock_count
+        FROM new_rows
+    ) AS n, (
+        SELECT count(*) AS product_count,
+               count(*) FILTER (WHERE status) AS active_count,
+               coalesce(sum(quantity), 0) AS stock_units,
+               coalesce(sum(price * quantity), 0) AS inventory_value,
+               count(*) FILTER (WHERE quantity <= 0) AS out_of_stock_count
+        FROM old_rows
+    ) AS o;
+    RETURN NULL;
+END
+$$;
+
+CREATE OR REPLACE FUNCTION product_stats_on_truncate() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    UPDATE product_stats SET product_count = 0, active_count = 0,
+        stock_units = 0, inventory_value = 0, out_of_stock_count = 0;
+    RETURN NULL;
+END
+$$;
+
+-- Recalcula tudo a partir de products (reparo: python -m store.cli
+-- rebuild-stats). Bloqueia escritas em products enquanto agrega.
+CREATE OR REPLACE FUNCTION product_stats_rebuild() RETURNS void
+LANGUAGE plpgsql AS $$
+BEGIN
+    LOCK TABLE products IN SHARE MODE;
+    UPDATE product_stats SET product_count = 0, active_count = 0,
+        stock_units = 0, inventory_value = 0, out_of_stock_count = 0;
+    UPDATE product_stats SET
+        product_count = a.product_count,
+        active_count = a.active_count,
+        stock_units = a.stock_units,
+        inventory_value = a.inventory_value,
+        out_of_stock_count = a.out_of_stock_count
+    FROM (
+        SELECT count(*) AS product_count,
+               count(*) FILTER (WHERE status) AS active_count,
+               coalesce(sum(quantity), 0) AS stock_units,
+               coalesce(sum(price * quantity), 0) AS inventory_value,
+               count(*) FILTER (WHERE quantity <= 0) AS out_of_stock_count
+        FROM products
+    ) AS a
+    WHERE shard = 0;
+END
+$$;
+
+DROP TRIGGER IF EXISTS product_stats_insert ON products;
+CREATE TRIGGER product_stats_insert AFTER INSERT ON products
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION product_stats_on_insert();
+
+DROP TRIGGER IF EXISTS product_stats_update ON products;
+CREATE TRIGGER product_stats_update AFTER UPDATE ON products
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION product_stats_on_update();
+
+DROP TRIGGER IF EXISTS product_stats_delete ON products;
+CREATE TRIGGER product_stats_delete AFTER DELETE ON products
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION product_stats_on_delete();
+
+DROP TRIGGER IF EXISTS product_stats_truncate ON products;
+CREATE TRIGGER product_stats_truncate AFTER TRUNCATE ON products
+    FOR EACH STATEMENT EXECUTE FUNCTION product_stats_on_truncate();
+
+-- Popula a partir dos produtos já existentes
+SELECT product_stats_rebuild();
@@ -0,0 +1,63 @@
+-- Avisa os workers (LISTEN product_changes) de cada alteração em products,
+-- qualquer que seja a origem (API, COPY, SQL manual). Payload JSON:
+--   {"op": "insert|update|delete", "id": "<uuid>"}
+-- Statements que alteram muitas linhas (ex.: COPY do POST /bulk) enviam um
+-- único aviso sem id, com a contagem, e TRUNCATE envia {"op": "truncate"}:
+-- quem recebe id nulo deve descartar todo o estado derivado.
+CREATE OR REPLACE FUNCTION product_changes_notify() RETURNS trigger
+LANGUAGE plpgsql AS $$
+DECLARE
+    op TEXT := lower(TG_OP);
+    changed BIGINT;
+BEGIN
+    IF TG_OP = 'TRUNCATE' THEN
+        PERFORM pg_notify(
+            'product_changes', json_build_object('op', op, 'id', NULL)::text
+        );
+        RETURN NULL;
+    END IF;
+
+    IF TG_OP = 'DELETE' THEN
+        SELECT count(*) INTO changed FROM old_rows;
+    ELSE
+        SELECT count(*) INTO changed FROM new_rows;
+    END IF;
+
+    IF changed = 0 THEN
+        RETURN NULL;
+    ELSIF changed > 100 THEN
+        PERFORM pg_notify(
+            'product_changes',
+            json_build_object('op', op, 'id', NULL, 'count', changed)::text
+        );
+    ELSIF TG_OP = 'DELETE' THEN
+        PERFORM pg_notify(
+            'product_changes', json_build_object('op', op, 'id', id)::text
+        ) FROM old_rows;
+    ELSE
+        PERFORM pg_notify(
+            'product_changes', json_build_object('op', op, 'id', id)::text
+        ) FROM new_rows;
+    END IF;
+    RETURN NULL;
+END
+$$;
+
+DROP TRIGGER IF EXISTS product_changes_insert ON products;
+CREATE TRIGGER product_changes_insert AFTER INSERT ON products
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION product_changes_notify();
+
+DROP TRIGGER IF EXISTS product_changes_update ON products;
+CREATE TRIGGER product_changes_update AFTER UPDATE ON products
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION product_changes_notify();
+
+DROP TRIGGER IF EXISTS product_changes_delete ON products;
+CREATE TRIGGER product_changes_delete AFTER DELETE ON products
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION product_changes_notify();
+
+DROP TRIGGER IF EXISTS product_changes_truncate ON products;
+CREATE TRIGGER product_changes_truncate AFTER TRUNCATE ON products
+    FOR EACH STATEMENT EXECUTE FUNCTION product_changes_notify();
@@ -0,0 +1,56 @@
+-- Avisos de alteração sem serializar as escritas da API.
+--
+-- Todo NOTIFY pega, no commit, um lock global do banco que só é solto
+-- depois do commit: as transações que notificam entram uma a uma, ainda com
+-- as travas de linha presas. Disparado pela trigger de 0005, esse lock
+-- entrava em toda escrita da API e anulava a reserva de SKU quente
+-- (UPDATE condicional) e o group commit do POST /products/.
+--
+-- Por isso as conexões da API (options -c store.notify_changes=off, ver
+-- PostgresClient.connect) não notificam pela trigger: cada worker publica
+-- as próprias alterações depois do commit, agrupadas numa transação curta
+-- e separada por janela (ChangePublisher em store/core/core_changes.py).
+--
+-- As demais origens (SQL manual, scripts) continuam avisando pela trigger,
+-- agora com um único NOTIFY por statement: com id quando o statement altera
+-- uma linha, sem id (com a contagem) quando altera várias. Avisos iguais na
+-- mesma transação o Postgres já entrega uma vez só.
+CREATE OR REPLACE FUNCTION product_changes_notify() RETURNS trigger
+LANGUAGE plpgsql AS $$
+DECLARE
+    op TEXT := lower(TG_OP);
+    changed BIGINT;
+    changed_id UUID;
+BEGIN
+    IF current_setting('store.notify_changes', true) = 'off' THEN
+        RETURN NULL;
+    END IF;
+
+    IF TG_OP = 'TRUNCATE' THEN
+        PERFORM pg_notify(
+            'product_changes', json_build_object('op', op, 'id', NULL)::text
+        );
+        RETURN NULL;
+    END IF;
+
+    IF TG_OP = 'DELETE' THEN
+        SELECT count(*), min(id::text)::uuid INTO changed, changed_id
+        FROM old_rows;
+    ELSE
+        SELECT count(*), min(id::text)::uuid INTO changed, changed_id
+        FROM new_rows;
+    END IF;
+
+    IF changed = 1 THEN
+        PERFORM pg_notify(
+            'product_changes', json_build_object('op', op, 'id', changed_id)::text
+        );
+    ELSIF changed > 1 THEN
+        PERFORM pg_notify(
+            'product_changes',
+            json_build_object('op', op, 'id', NULL, 'count', changed)::text
+        );
+    END IF;
+    RETURN NULL;
+END
+$$;
@@ -1,5 +1,11 @@
+from typing import Set
+
 from psycopg_pool import AsyncConnectionPool
-from store.db.db_postgres import db_client
+from store.core.core_cache import LRUCache, product_cache
+from store.core.core_changes import ChangePublisher, product_change_publisher
+from store.core.core_coalescer import WriteCoalescer, product_create_coalescer
+from store.core.core_singleflight import SingleFlight, product_flights
+from store.db.db_postgres import PostgresClient, db_client
 
 
 async def get_db_pool() -> AsyncConnectionPool:
@@ -7,3 +13,43 @@ async def get_db_pool() -> AsyncConnectionPool:
     if db_client.pool is None or db_client.pool.closed:
         raise RuntimeError("Database pool is not initialized or is closed.")
     return db_client.pool
+
+
+async def get_db_read_pool() -> AsyncConnectionPool:
+    """
+    Fornece o pool para leituras: uma réplica, se configurada, ou o
+    próprio primário.
+    """
+    if db_client.pool is None or db_client.pool.closed:
+        raise RuntimeError("Database pool is not initialized or is closed.")
+    return db_client.read_pool()
+
+
+def get_product_cache() -> LRUCache | None:
+    """Fornece o cache de produtos do worker (None se desabilitado)."""
+    return product_cache
+
+
+def get_product_flights() -> SingleFlight | None:
+    """Fornece o agrupador de leituras concorrentes (None se desabilitado)."""
+    return product_flights
+
+
+def get_product_create_coalescer() -> WriteCoalescer | None:
+    """Fornece o group commit do POST /products/ (None se desabilitado)."""
+    return product_create_coalescer
+
+
+def get_product_change_publisher() -> ChangePublisher | None:
+    """Fornece o publicador de alterações do worker (None se desabilitado)."""
+    return product_change_publisher
+
+
+def get_db_extensions() -> Set[str]:
+    """Fornece as extensões instaladas no banco (ex.: pg_trgm)."""
+    return db_client.extensions
+
+
+def get_db_client() -> PostgresClient:
+    """Fornece o cliente do banco (ex.: para assinar LISTEN/NOTIFY)."""
+    return db_client
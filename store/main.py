@@ -1,7 +1,27 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from psycopg.errors import QueryCanceled
+from psycopg_pool import PoolTimeout
+from store.core.core_admission import (
+    AdmissionMiddleware,
+    admission_limiters,
+    overloaded_response,
+)
+from store.core.core_cache import product_cache
+from store.core.core_coalescer import product_create_coalescer
+from store.core.core_changes import (
+    PRODUCT_CHANGES_CHANNEL,
+    invalidate_on_change,
+    product_change_publisher,
+)
 from store.core.core_config import settings
+from store.core.core_metrics import MetricsMiddleware
+from store.core.core_singleflight import product_flights
+from store.core.core_timing import ServerTimingMiddleware
 from store.routers import api_router
+from store.db.db_migrations import migrate
 from store.db.db_postgres import db_client
+from store.db.db_warmup import warm_connection
+from store.usecases.usecases_product import ProductUsecase
 
 
 class App(FastAPI):
@@ -11,18 +31,86 @@ class App(FastAPI):
             **kwargs,
             version="0.0.1",
             title=settings.PROJECT_NAME,
-            root_path=settings.ROOT_PATH
+            root_path=settings.ROOT_PATH,
         )
+        # Mais interno que o Server-Timing e as métricas, que assim medem
+        # a espera na fila e contam os 503 da rejeição
+        if admission_limiters is not None:
+            self.add_middleware(
+                AdmissionMiddleware,
+                limiters=admission_limiters,
+                retry_after=settings.ADMISSION_RETRY_AFTER,
+            )
+        if settings.SERVER_TIMING_ENABLED:
+            self.add_middleware(ServerTimingMiddleware, log=settings.SERVER_TIMING_LOG)
+        if settings.METRICS_ENABLED:
+            self.add_middleware(MetricsMiddleware)
+        # Consulta cancelada pelo statement_timeout ou pool sem conexão livre
+        # dentro de DB_POOL_TIMEOUT: sobrecarga, não erro do cliente
+        self.add_exception_handler(QueryCanceled, self.on_overload)
+        self.add_exception_handler(PoolTimeout, self.on_overload)
+        self._unsubscribe_changes = None
+        # GET /health/ready só responde 200 depois do startup completo
+        self.state.ready = False
         self.add_event_handler("startup", self.on_startup)
         self.add_event_handler("shutdown", self.on_shutdown)
 
     async def on_startup(self) -> None:
         print("Iniciando a aplicação...")
-        await db_client.connect(settings.DATABASE_URL)
+        if settings.DB_AUTO_MIGRATE:
+            applied = await migrate(settings.DATABASE_URL)
+            print(f"Migrations aplicadas: {len(applied)}.")
+        await db_client.connect(
+            settings.DATABASE_URL,
+            min_size=settings.DB_POOL_MIN_SIZE,
+            max_size=settings.DB_POOL_MAX_SIZE,
+            max_idle=settings.DB_POOL_MAX_IDLE,
+            max_lifetime=settings.DB_POOL_MAX_LIFETIME,
+            timeout=settings.DB_POOL_TIMEOUT,
+            statement_timeout=settings.DB_STATEMENT_TIMEOUT,
+            warmup_size=settings.DB_POOL_WARMUP_SIZE,
+            replica_dsns=settings.DATABASE_REPLICA_URLS,
+            replica_selection=settings.DB_REPLICA_SELECTION,
+            # Com o publicador, as escritas da API não notificam pela trigger
+            notify_changes=product_change_publisher is None,
+            configure=(
+                warm_connection(prepare=settings.DB_PREPARED_STATEMENTS)
+                if settings.DB_WARMUP_STATEMENTS
+                else None
+            ),
+        )
         print("Conexão com o banco de dados estabelecida.")
+        # Escritas feitas por outros workers invalidam o cache deste
+        if product_cache is not None or product_flights is not None:
+            self._unsubscribe_changes = db_client.subscribe(
+                PRODUCT_CHANGES_CHANNEL,
+                invalidate_on_change(product_cache, product_flights),
+            )
+        # Aquece o cache depois de assinar, para não perder alterações
+        if product_cache is not None:
+            loaded = await ProductUsecase(
+                pool=db_client.pool,
+                read_pool=db_client.read_pool(),
+                cache=product_cache,
+            ).preload_cache(settings.PRODUCT_CACHE_PRELOAD_SIZE)
+            print(f"Produtos pré-carregados no cache: {loaded}.")
+        self.state.ready = True
+
+    async def on_overload(self, request: Request, exc: Exception):
+        return overloaded_response(settings.ADMISSION_RETRY_AFTER)
 
     async def on_shutdown(self) -> None:
         print("Desligando a aplicação...")
+        self.state.ready = False
+        if self._unsubscribe_changes is not None:
+            self._unsubscribe_changes()
+            self._unsubscribe_changes = None
+        # Grava as criações ainda na janela do group commit
+        if product_create_coalescer is not None:
+            await product_create_coalescer.drain()
+        # Depois do group commit, que ainda publica as criações gravadas
+        if product_change_publisher is not None:
+            await product_change_publisher.drain()
         await db_client.disconnect()
         print("Conexão com o banco de dados fechada.")
 
@@ -1,21 +1,9 @@
 from datetime import datetime
-from decimal import Decimal
-from typing import Any
 import uuid
-from pydantic import UUID4, BaseModel, Field, model_serializer
+from pydantic import UUID4, BaseModel, Field
 
 
 class CreateBaseModel(BaseModel):
     id: UUID4 = Field(default_factory=uuid.uuid4)
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
-
-    @model_serializer
-    def set_model(self) -> dict[str, Any]:
-        self_dict = dict(self)
-
-        for key, value in self_dict.items():
-            if isinstance(value, Decimal):
-                self_dict[key] = Decimal(str(value))
-
-        return self_dict
@@ -1,5 +1,7 @@
 from fastapi import APIRouter
+from store.controllers.controllers_monitoring import router as monitoring_router
 from store.controllers.controllers_product import router as product_router
 
 api_router = APIRouter()
 api_router.include_router(product_router, prefix="/products")
+api_router.include_router(monitoring_router)
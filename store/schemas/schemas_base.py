@@ -1,6 +1,5 @@
 from datetime import datetime
-from decimal import Decimal
-from pydantic import UUID4, BaseModel, ConfigDict, Field, model_validator
+from pydantic import UUID4, BaseModel, ConfigDict, Field
 
 
 class BaseSchemaMixin(BaseModel):
@@ -11,11 +10,3 @@ class OutSchema(BaseModel):
     id: UUID4 = Field()
     created_at: datetime = Field()
     updated_at: datetime = Field()
-
-    @model_validator(mode="before")
-    def set_schema(cls, data):
-        for key, value in data.items():
-            if isinstance(value, Decimal):
-                data[key] = Decimal(str(value))
-
-        return data
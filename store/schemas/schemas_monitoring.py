@@ -0,0 +1,32 @@
+from typing import Dict, Literal
+
+from pydantic import Field
+from store.schemas.schemas_base import BaseSchemaMixin
+
+
+class PoolStatsOut(BaseSchemaMixin):
+    pool_min: int = Field(..., description="Tamanho mínimo do pool")
+    pool_max: int = Field(..., description="Tamanho máximo do pool")
+    pool_size: int = Field(..., description="Conexões abertas (livres + em uso)")
+    pool_available: int = Field(..., description="Conexões livres no pool")
+    connections_in_use: int = Field(..., description="Conexões emprestadas agora")
+    requests_waiting: int = Field(..., description="Requisições esperando conexão")
+    requests_num: int = Field(0, description="Total de pedidos de conexão")
+    requests_queued: int = Field(0, description="Pedidos que precisaram esperar")
+    requests_wait_ms: int = Field(0, description="Tempo total de espera (ms)")
+    requests_errors: int = Field(0, description="Pedidos com erro ou timeout")
+    usage_ms: int = Field(0, description="Tempo total de uso das conexões (ms)")
+    returns_bad: int = Field(0, description="Conexões devolvidas em estado ruim")
+    connections_num: int = Field(0, description="Conexões abertas com o servidor")
+    connections_ms: int = Field(0, description="Tempo total abrindo conexões (ms)")
+    connections_errors: int = Field(0, description="Falhas ao abrir conexões")
+    connections_lost: int = Field(0, description="Conexões perdidas detectadas")
+
+
+class HealthOut(BaseSchemaMixin):
+    status: Literal["alive", "ready", "starting", "unavailable"] = Field(
+        ..., description="Estado do worker"
+    )
+    pools: Dict[str, PoolStatsOut] = Field(
+        {}, description="Pools de conexão: primary e replica-N"
+    )
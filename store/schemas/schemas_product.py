@@ -1,8 +1,9 @@
 from datetime import datetime
 from decimal import Decimal
-from typing import Annotated, Optional
+from functools import lru_cache
+from typing import Annotated, Any, Dict, List, Literal, Optional, Type
 from uuid import UUID
-from pydantic import AfterValidator, Field
+from pydantic import AfterValidator, Field, create_model
 from store.schemas.schemas_base import BaseSchemaMixin, OutSchema
 
 
@@ -13,13 +14,24 @@ class ProductBase(BaseSchemaMixin):
     status: bool = Field(..., description="Product status")
 
 
+# Limites das colunas de products (db/migrations/0001_create_products.sql):
+# validados antes de gravar, para que o valor fora da faixa vire 422 no item
+# em vez de DataError (500) que desfaz o COPY ou o lote inteiro
+MAX_PRICE = Decimal("99999999.99")  # NUMERIC(10, 2)
+MAX_INTEGER = 2**31 - 1  # INTEGER
+
+
 class ProductIn(ProductBase, BaseSchemaMixin):
-    name: str = Field(..., description="Nome do produto")
-    quantity: int = Field(..., description="Quantidade em estoque")
-    price: Decimal = Field(..., description="Preço do produto")
+    name: str = Field(..., max_length=255, description="Nome do produto")
+    quantity: int = Field(
+        ..., ge=-MAX_INTEGER - 1, le=MAX_INTEGER, description="Quantidade em estoque"
+    )
+    price: Decimal = Field(
+        ..., ge=-MAX_PRICE, le=MAX_PRICE, description="Preço do produto"
+    )
     status: bool = Field(..., description="Status do produto (ativo/inativo)")
     description: Optional[str] = Field(
-        None, description="Descrição detalhada do produto"
+        None, max_length=1000, description="Descrição detalhada do produto"
     )
 
 
@@ -29,18 +41,174 @@ class ProductOut(ProductIn, OutSchema):
     updated_at: datetime = Field(..., description="Data da última atualização")
 
 
-def convert_decimal(v):
-    return Decimal(str(v))
+PRODUCT_FIELDS = tuple(ProductOut.model_fields)
 
 
-Decimal_ = Annotated[Decimal, AfterValidator(convert_decimal)]
+def _normalize_fields(value: Optional[str]) -> Optional[str]:
+    """
+    "price, id" -> "id,price": só campos de ProductOut, sem repetição e na
+    ordem do schema, para que a mesma seleção tenha sempre a mesma chave.
+    """
+    if value is None:
+        return None
+    requested = {name.strip() for name in value.split(",") if name.strip()}
+    if not requested:
+        raise ValueError("fields must list at least one field")
+    unknown = requested.difference(PRODUCT_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    return ",".join(name for name in PRODUCT_FIELDS if name in requested)
+
+
+# Sparse fieldset: ?fields=id,name,price
+ProductFields = Annotated[Optional[str], AfterValidator(_normalize_fields)]
+
+
+# Schemas enxutos criados sob demanda, um por seleção normalizada (no
+# máximo 2^8 - 1 combinações dos campos de ProductOut)
+@lru_cache(maxsize=None)
+def product_fields_schema(fields: str) -> Type[BaseSchemaMixin]:
+    return create_model(
+        f"ProductOut[{fields}]",
+        __base__=BaseSchemaMixin,
+        **{
+            name: (
+                ProductOut.model_fields[name].annotation,
+                ProductOut.model_fields[name],
+            )
+            for name in fields.split(",")
+        },
+    )
 
 
 class ProductUpdate(BaseSchemaMixin):
-    quantity: Optional[int] = Field(None, description="Product quantity")
-    price: Optional[Decimal_] = Field(None, description="Product price")
+    quantity: Optional[int] = Field(
+        None, ge=-MAX_INTEGER - 1, le=MAX_INTEGER, description="Product quantity"
+    )
+    price: Optional[Decimal] = Field(
+        None, ge=-MAX_PRICE, le=MAX_PRICE, description="Product price"
+    )
     status: Optional[bool] = Field(None, description="Product status")
 
 
 class ProductUpdateOut(ProductOut):
     ...
+
+
+class ProductBatchUpdate(ProductUpdate):
+    id: UUID = Field(..., description="ID do produto")
+
+
+class ProductBatchUpdateOut(BaseSchemaMixin):
+    updated: List[ProductUpdateOut] = Field(..., description="Produtos atualizados")
+    not_found: List[UUID] = Field(..., description="IDs não encontrados")
+
+
+class ProductReserve(BaseSchemaMixin):
+    quantity: int = Field(..., gt=0, le=MAX_INTEGER, description="Unidades a reservar")
+
+
+class ProductBatchReserve(ProductReserve):
+    id: UUID = Field(..., description="ID do produto")
+
+
+class ProductStockShortage(BaseSchemaMixin):
+    id: UUID = Field(..., description="ID do produto")
+    requested: int = Field(..., description="Unidades pedidas")
+    available: int = Field(..., description="Unidades em estoque")
+
+
+class ProductStats(BaseSchemaMixin):
+    product_count: int = Field(..., description="Produtos cadastrados")
+    active_count: int = Field(..., description="Produtos com status ativo")
+    stock_units: int = Field(..., description="Unidades em estoque")
+    inventory_value: Decimal = Field(
+        ..., description="Valor do estoque (soma de price * quantity)"
+    )
+    out_of_stock_count: int = Field(..., description="Produtos sem estoque")
+
+
+class ProductChange(BaseSchemaMixin):
+    op: Literal["insert", "update", "delete", "truncate"] = Field(
+        ..., description="Operação"
+    )
+    id: Optional[UUID] = Field(
+        None, description="Produto alterado (nulo: várias linhas alteradas)"
+    )
+    count: Optional[int] = Field(None, description="Linhas alteradas, se várias")
+
+
+class ProductFilter(BaseSchemaMixin):
+    limit: int = Field(50, ge=1, le=500, description="Itens por página")
+    cursor: Optional[str] = Field(
+        None, description="Cursor opaco retornado em next_cursor"
+    )
+    sort: Literal["created_at", "name"] = Field(
+        "created_at", description="Campo de ordenação"
+    )
+    order: Literal["asc", "desc"] = Field("asc", description="Direção da ordenação")
+    status: Optional[bool] = Field(None, description="Filtra pelo status")
+    min_price: Optional[Decimal] = Field(None, description="Preço mínimo")
+    max_price: Optional[Decimal] = Field(None, description="Preço máximo")
+    min_quantity: Optional[int] = Field(None, description="Quantidade mínima")
+    max_quantity: Optional[int] = Field(None, description="Quantidade máxima")
+    fields: ProductFields = Field(
+        None, description="Campos retornados (ex.: id,name,price); padrão: todos"
+    )
+
+
+class ProductSearch(BaseSchemaMixin):
+    q: str = Field(
+        ...,
+        min_length=1,
+        max_length=200,
+        description="Termos buscados no nome e na descrição",
+    )
+    limit: int = Field(20, ge=1, le=100, description="Itens por página")
+    cursor: Optional[str] = Field(
+        None, description="Cursor opaco retornado em next_cursor"
+    )
+
+
+class ProductPage(BaseSchemaMixin):
+    items: List[ProductOut] = Field(..., description="Produtos da página")
+    next_cursor: Optional[str] = Field(
+        None, description="Cursor da próxima página (nulo na última)"
+    )
+
+
+class ProductBatchGet(BaseSchemaMixin):
+    ids: List[UUID] = Field(
+        ..., min_length=1, max_length=500, description="IDs dos produtos"
+    )
+
+
+class ProductBatchGetOut(BaseSchemaMixin):
+    items: List[ProductOut] = Field(
+        ..., description="Produtos encontrados, na ordem dos IDs pedidos"
+    )
+    missing: List[UUID] = Field(..., description="IDs pedidos que não existem")
+
+
+@lru_cache(maxsize=None)
+def product_fields_container(
+    container: Type[BaseSchemaMixin], fields: str
+) -> Type[BaseSchemaMixin]:
+    """`container` (ProductPage, ProductBatchGetOut) com itens enxutos."""
+    return create_model(
+        f"{container.__name__}[{fields}]",
+        __base__=container,
+        items=(List[product_fields_schema(fields)], container.model_fields["items"]),
+    )
+
+
+class ProductBulkError(BaseSchemaMixin):
+    index: int = Field(..., description="Posição do item na carga enviada")
+    errors: List[Dict[str, Any]] = Field(..., description="Erros de validação")
+
+
+class ProductBulkOut(BaseSchemaMixin):
+    ids: List[UUID] = Field(..., description="IDs dos produtos criados")
+    errors: List[ProductBulkError] = Field(
+        ..., description="Itens rejeitados na validação"
+    )
@@ -1,22 +1,114 @@
-from typing import List
+import re
+from contextlib import nullcontext
+from functools import lru_cache
+from typing import (
+    Any,
+    AsyncContextManager,
+    AsyncIterable,
+    AsyncIterator,
+    Dict,
+    List,
+)
 from uuid import UUID, uuid4
 from datetime import datetime
 
 from store.models.models_product import ProductModel
+from store.core.core_cache import LRUCache
+from store.core.core_changes import ChangePublisher
+from store.core.core_coalescer import WriteCoalescer
+from store.core.core_singleflight import SingleFlight
+from store.db import db_statements
+from store.db.db_rows import construct, model_row
+from store.core.core_http import Version
+from store.core.core_cursor import decode_cursor, encode_cursor
+from store.core.core_metrics import track_usecase
+from store.core.core_timing import timed_connection
 from store.schemas.schemas_product import (
+    ProductBatchGetOut,
+    ProductBatchReserve,
+    ProductBatchUpdate,
+    ProductBatchUpdateOut,
+    ProductBulkError,
+    ProductBulkOut,
+    ProductFilter,
     ProductIn,
     ProductOut,
+    ProductPage,
+    ProductReserve,
+    ProductSearch,
+    ProductStats,
+    ProductStockShortage,
     ProductUpdate,
     ProductUpdateOut,
+    product_fields_container,
+    product_fields_schema,
+)
+from pydantic import ValidationError
+from psycopg import AsyncConnection, Error as PsycopgError
+from psycopg.errors import DataError
+
+from store.core.core_exceptions import (
+    InsertionException,
+    InsufficientStockException,
+    InvalidCursorException,
+    InvalidRowException,
+    NotFoundException,
 )
-from store.core.core_exceptions import NotFoundException
 from psycopg_pool import AsyncConnectionPool
 
 
+# Tipos usados no unnest() do update em lote, por coluna atualizável
+UPDATE_COLUMN_TYPES = {"quantity": "integer", "price": "numeric", "status": "boolean"}
+
+# Configuração de texto do tsvector (ver migrations/0003_products_search.sql)
+SEARCH_CONFIG = "simple"
+
+# Linhas lidas do banco viram schemas sem revalidação (ver db_rows.model_row)
+product_out_row = model_row(ProductOut)
+product_update_out_row = model_row(ProductUpdateOut)
+product_stats_row = model_row(ProductStats)
+
+
+@lru_cache(maxsize=None)
+def product_fields_row(fields: str):
+    return model_row(product_fields_schema(fields))
+
+
 class ProductUsecase:
-    def __init__(self, pool: AsyncConnectionPool):
+    def __init__(
+        self,
+        pool: AsyncConnectionPool,
+        cache: LRUCache | None = None,
+        prepare: bool = True,
+        pipeline: bool = True,
+        read_pool: AsyncConnectionPool | None = None,
+        pin_primary: bool = False,
+        fuzzy_search: bool = False,
+        flights: SingleFlight | None = None,
+        coalescer: WriteCoalescer | None = None,
+        publisher: ChangePublisher | None = None,
+    ):
         self.pool = pool
+        # Leituras podem ir para uma réplica; escritas sempre no primário
+        self.read_pool = read_pool or pool
+        self.pin_primary = pin_primary
+        self.cache = cache
+        # Leituras concorrentes iguais compartilham a mesma consulta
+        self.flights = flights
+        # Criações concorrentes agrupadas num único INSERT (group commit)
+        self.coalescer = coalescer
+        # Avisa os outros workers das escritas, depois do commit
+        self.publisher = publisher
+        self.pipeline = pipeline
+        # Busca tolerante a erros de digitação (requer pg_trgm)
+        self.fuzzy_search = fuzzy_search
+        # Statements fixos são preparados na primeira execução da conexão;
+        # os dinâmicos ficam com o limiar automático do psycopg (None).
+        # Desligado, nada é preparado.
+        self._prepare_fixed: bool | None = True if prepare else False
+        self._prepare_dynamic: bool | None = None if prepare else False
 
+    @track_usecase("product.create")
     async def create(self, body: ProductIn) -> ProductOut:
         product_id = uuid4()  # Gerar UUID para o ID do produto
         created_at = datetime.now()  # Timestamp de criação
@@ -30,19 +122,33 @@ class ProductUsecase:
             **body.model_dump(),  # inclui nome, preco, quantidade, status, etc.
         )
 
-        async with self.pool.connection() as conn:  # Obtém uma conexão do pool
-            async with conn.cursor() as cur:  # Obtém um cursor para executar SQL
-                # Comando SQL para inserção
-                sql = """
-                INSERT INTO products (id, name, description, price, quantity,
-                status, created_at, updated_at)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-                RETURNING id, name, description, price, quantity, status,
-                created_at, updated_at;
-                """
-                # Executa o comando SQL.
+        if self.coalescer is not None:
+            result = await self.coalescer.submit(
+                "product.create",
+                (
+                    product_model.id,
+                    product_model.name,
+                    product_model.description,
+                    product_model.price,
+                    product_model.quantity,
+                    product_model.status,
+                    product_model.created_at,
+                    product_model.updated_at,
+                ),
+                self._insert_many,
+            )
+            self.pin_primary = True
+            self._forget_queries()
+            self._announce("insert", [result.id])
+            return result
+
+        # Obtém uma conexão do pool
+        async with timed_connection(self._primary()) as conn:
+            # Obtém um cursor para executar SQL
+            async with conn.cursor(row_factory=product_out_row) as cur:
+                # Executa o comando SQL de inserção
                 await cur.execute(
-                    sql,
+                    db_statements.INSERT_PRODUCT,
                     (
                         str(product_model.id),
                         product_model.name,
@@ -53,126 +159,776 @@ class ProductUsecase:
                         product_model.created_at,
                         product_model.updated_at,
                     ),
+                    prepare=self._prepare_fixed,
                 )
 
                 result = await cur.fetchone()
 
-                if result:
-                    return ProductOut(
-                        id=result[0],
-                        name=result[1],
-                        description=result[2],
-                        price=result[3],
-                        quantity=result[4],
-                        status=result[5],
-                        created_at=result[6],
-                        updated_at=result[7],
-                    )
+        if not result:
+            raise Exception("Failed to create product.")
+
+        self._forget_queries()
+        self._announce("insert", [result.id])
+        return result
+
+    async def _insert_many(self, rows: List[tuple]) -> List[Any]:
+        """
+        Grava as linhas de vários create() num único INSERT ... SELECT
+        unnest(), numa transação. Retorna o ProductOut de cada linha, na
+        ordem recebida.
+        """
+        async with timed_connection(self.pool) as conn:
+            try:
+                async with conn.transaction():
+                    async with conn.cursor(row_factory=product_out_row) as cur:
+                        await cur.execute(
+                            db_statements.INSERT_PRODUCTS,
+                            [list(column) for column in zip(*rows)],
+                            prepare=self._prepare_fixed,
+                        )
+                        inserted = {
+                            product.id: product for product in await cur.fetchall()
+                        }
+                return [inserted[row[0]] for row in rows]
+            except PsycopgError:
+                # Uma linha inválida derruba o lote inteiro: refaz uma a uma
+                return await self._insert_each(conn, rows)
+
+    async def _insert_each(self, conn: AsyncConnection, rows: List[tuple]) -> List[Any]:
+        """
+        Grava cada linha no seu savepoint, numa transação: as válidas são
+        gravadas e cada inválida devolve o próprio erro ao seu chamador.
+        """
+        results: List[Any] = []
+        async with conn.transaction():
+            async with conn.cursor(row_factory=product_out_row) as cur:
+                for row in rows:
+                    try:
+                        async with conn.transaction():
+                            await cur.execute(db_statements.INSERT_PRODUCT, row)
+                            results.append(await cur.fetchone())
+                    except PsycopgError as exc:
+                        results.append(exc)
+        return results
+
+    @track_usecase("product.bulk_create")
+    async def bulk_create(
+        self, items: AsyncIterable[Any], batch_size: int = 1000
+    ) -> ProductBulkOut:
+        """
+        Valida os itens em lotes e grava os válidos com um único
+        COPY products FROM STDIN, dentro de uma única transação.
+        Itens podem ser dicts ou linhas JSON (str/bytes).
+        """
+        ids: List[UUID] = []
+        # Posição na carga de cada linha enviada ao COPY (a linha N do COPY
+        # é o item positions[N - 1])
+        positions: List[int] = []
+        errors: List[ProductBulkError] = []
+        batch: List[Any] = []
+        index = 0
+
+        try:
+            async with timed_connection(self._primary()) as conn:
+                async with conn.transaction():
+                    # O COPY dura o upload inteiro: sem o statement_timeout
+                    # das conexões do pool (DB_STATEMENT_TIMEOUT)
+                    await conn.execute("SET LOCAL statement_timeout = 0;")
+                    async with conn.cursor() as cur:
+                        async with cur.copy(
+                            "COPY products (id, name, description, price, quantity, "
+                            "status, created_at, updated_at) FROM STDIN"
+                        ) as copy:
+                            async for item in items:
+                                batch.append(item)
+                                if len(batch) >= batch_size:
+                                    await self._copy_batch(
+                                        copy, batch, index, ids, positions, errors
+                                    )
+                                    index += len(batch)
+                                    batch = []
+                            if batch:
+                                await self._copy_batch(
+                                    copy, batch, index, ids, positions, errors
+                                )
+        except DataError as exc:
+            # Valor aceito pelo schema mas não pelo banco: o COPY inteiro é
+            # desfeito; aponta o item pela linha do COPY no contexto do erro
+            line = re.search(r"line (\d+)", exc.diag.context or "")
+            position = None
+            if line and int(line.group(1)) <= len(positions):
+                position = positions[int(line.group(1)) - 1]
+            raise InvalidRowException(
+                message=f"Item {position} rejected: {exc.diag.message_primary}",
+                index=position,
+            )
+        except PsycopgError as exc:
+            raise InsertionException(message=f"Error inserting products: {exc}")
+
+        self._forget_queries()
+        self._announce("insert", ids)
+        return ProductBulkOut(ids=ids, errors=errors)
+
+    @staticmethod
+    async def _copy_batch(
+        copy,
+        batch: List[Any],
+        offset: int,
+        ids: List[UUID],
+        positions: List[int],
+        errors: List[ProductBulkError],
+    ) -> None:
+        now = datetime.now()
+        for position, item in enumerate(batch, start=offset):
+            try:
+                if isinstance(item, (str, bytes)):
+                    product = ProductIn.model_validate_json(item)
                 else:
-                    raise Exception("Failed to create product.")
+                    product = ProductIn.model_validate(item)
+            except ValidationError as exc:
+                errors.append(
+                    ProductBulkError(
+                        index=position,
+                        errors=exc.errors(include_url=False, include_context=False),
+                    )
+                )
+                continue
 
-    async def get(self, id: UUID) -> ProductOut:
-        async with self.pool.connection() as conn:
-            async with conn.cursor() as cur:
+            product_id = uuid4()
+            positions.append(position)
+            await copy.write_row(
+                (
+                    product_id,
+                    product.name,
+                    product.description,
+                    product.price,
+                    product.quantity,
+                    product.status,
+                    now,
+                    now,
+                )
+            )
+            ids.append(product_id)
+
+    @track_usecase("product.get")
+    async def get(self, id: UUID, fields: str | None = None) -> ProductOut:
+        """
+        Com `fields` (normalizado por ProductFields), lê só essas colunas e
+        retorna o schema enxuto correspondente; id e updated_at continuam
+        acessíveis como atributos para o ETag.
+        """
+        if self.cache is not None:
+            cached = self.cache.get(id)
+            if cached is not None:
+                if fields:
+                    return construct(
+                        product_fields_schema(fields), dict(cached.__dict__)
+                    )
+                return cached
+
+        if self.flights is None:
+            return await self._fetch(id, fields)
+        return await self.flights.do(
+            ("get", id, self.pin_primary, fields), lambda: self._fetch(id, fields)
+        )
+
+    async def _fetch(self, id: UUID, fields: str | None = None) -> ProductOut:
+        if fields:
+            return await self._fetch_fields(id, fields)
+        if self.cache is not None:
+            generation = self.cache.generation()
+
+        async with timed_connection(self._miss_reader()) as conn:
+            async with conn.cursor(row_factory=product_out_row) as cur:
+                await cur.execute(
+                    db_statements.SELECT_PRODUCT,
+                    (str(id),),
+                    prepare=self._prepare_fixed,
+                )
+                product = await cur.fetchone()
+
+        if not product:
+            raise NotFoundException(message=f"Product not found with filter: {id}")
+
+        if self.cache is not None:
+            self.cache.set(id, product, generation=generation)
+        return product
+
+    async def preload_cache(self, limit: int) -> int:
+        """
+        Carrega no cache os `limit` produtos alterados mais recentemente
+        (startup do worker). Retorna quantos foram carregados.
+        """
+        if self.cache is None or limit <= 0:
+            return 0
+        generation = self.cache.generation()
+
+        # Do primário: o cache só guarda linhas lidas dele (ver _miss_reader)
+        async with timed_connection(self.pool) as conn:
+            async with conn.cursor(row_factory=product_out_row) as cur:
+                await cur.execute(db_statements.SELECT_RECENT_PRODUCTS, (limit,))
+                products = await cur.fetchall()
+
+        for product in products:
+            self.cache.set(product.id, product, generation=generation)
+        return len(products)
+
+    @track_usecase("product.get_many")
+    async def get_many(
+        self, ids: List[UUID], fields: str | None = None
+    ) -> ProductBatchGetOut:
+        """
+        Busca vários produtos com uma única consulta (id = ANY). IDs já no
+        cache não vão ao banco. Itens e ausentes seguem a ordem dos IDs
+        pedidos, sem repetição.
+        """
+        ids = list(dict.fromkeys(ids))
+        found: Dict[UUID, Any] = {}
+        if self.cache is not None:
+            generation = self.cache.generation()
+            for id in ids:
+                cached = self.cache.get(id)
+                if cached is not None:
+                    found[id] = (
+                        construct(product_fields_schema(fields), dict(cached.__dict__))
+                        if fields
+                        else cached
+                    )
+
+        pending = [id for id in ids if id not in found]
+        if pending:
+            if fields:
                 sql = (
-                    "SELECT id, name, description, price, quantity, status, "
-                    "created_at, updated_at FROM products WHERE id = %s;"
+                    f"SELECT {self._sparse_columns(fields, 'id')} "
+                    "FROM products WHERE id = ANY(%s);"
+                )
+                row_factory, prepare = product_fields_row(fields), self._prepare_dynamic
+            else:
+                sql = db_statements.SELECT_PRODUCTS_BY_IDS
+                row_factory, prepare = product_out_row, self._prepare_fixed
+
+            # O ProductOut completo entra no cache; colunas avulsas não
+            cacheable = self.cache is not None and not fields
+            pool = self._miss_reader() if cacheable else self._reader()
+            async with timed_connection(pool) as conn:
+                async with conn.cursor(row_factory=row_factory) as cur:
+                    await cur.execute(sql, (pending,), prepare=prepare)
+                    products = await cur.fetchall()
+
+            for product in products:
+                found[product.id] = product
+                if cacheable:
+                    self.cache.set(product.id, product, generation=generation)
+
+        schema = (
+            product_fields_container(ProductBatchGetOut, fields)
+            if fields
+            else ProductBatchGetOut
+        )
+        return schema(
+            items=[found[id] for id in ids if id in found],
+            missing=[id for id in ids if id not in found],
+        )
+
+    async def _fetch_fields(self, id: UUID, fields: str) -> Any:
+        # Não entra no cache, que guarda só o ProductOut completo
+        columns = self._sparse_columns(fields, "id", "updated_at")
+        async with timed_connection(self._reader()) as conn:
+            async with conn.cursor(row_factory=product_fields_row(fields)) as cur:
+                await cur.execute(
+                    f"SELECT {columns} FROM products WHERE id = %s;",
+                    (str(id),),
+                    prepare=self._prepare_dynamic,
+                )
+                product = await cur.fetchone()
+
+        if not product:
+            raise NotFoundException(message=f"Product not found with filter: {id}")
+        return product
+
+    @staticmethod
+    def _sparse_columns(fields: str, *required: str) -> str:
+        # Colunas pedidas mais as usadas internamente (ETag, cursor), que
+        # ficam no objeto mas fora do JSON do schema enxuto. Os nomes já
+        # foram validados contra ProductOut (ProductFields).
+        names = fields.split(",")
+        return ", ".join(names + [name for name in required if name not in names])
+
+    @track_usecase("product.get_version")
+    async def get_version(self, id: UUID) -> Version:
+        """
+        Retorna apenas (id, updated_at), usado para validar requisições
+        condicionais sem montar o ProductOut.
+        """
+        if self.cache is not None:
+            cached = self.cache.get(id)
+            if cached is not None:
+                return cached.id, cached.updated_at
+
+        async with timed_connection(self._reader()) as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(
+                    db_statements.SELECT_PRODUCT_VERSION,
+                    (str(id),),
+                    prepare=self._prepare_fixed,
                 )
-                await cur.execute(sql, (str(id),))
                 result = await cur.fetchone()
 
         if not result:
             raise NotFoundException(message=f"Product not found with filter: {id}")
 
-        # Mapeie os resultados da tupla para ProductOut
-        return ProductOut(
-            id=result[0],
-            name=result[1],
-            description=result[2],
-            price=result[3],
-            quantity=result[4],
-            status=result[5],
-            created_at=result[6],
-            updated_at=result[7],
-        )
+        return result[0], result[1]
+
+    @track_usecase("product.query")
+    async def query(self, filters: ProductFilter | None = None) -> ProductPage:
+        filters = filters or ProductFilter()
+        if self.flights is None:
+            return await self._query(filters)
+        key = ("query", self.pin_primary, tuple(filters.model_dump().values()))
+        return await self.flights.do(key, lambda: self._query(filters))
+
+    async def _query(self, filters: ProductFilter) -> ProductPage:
+        page_schema, row_factory = ProductPage, product_out_row
+        columns = db_statements.PRODUCT_COLUMNS
+        if filters.fields:
+            page_schema = product_fields_container(ProductPage, filters.fields)
+            row_factory = product_fields_row(filters.fields)
+            columns = self._sparse_columns(
+                filters.fields, "id", "updated_at", filters.sort
+            )
+        sql, values = self._page_sql(filters, columns)
+
+        async with timed_connection(self._reader()) as conn:
+            async with conn.cursor(row_factory=row_factory) as cur:
+                await cur.execute(sql, values, prepare=self._prepare_dynamic)
+                products_list = await cur.fetchall()
+
+        next_cursor = None
+        if len(products_list) > filters.limit:
+            products_list = products_list[: filters.limit]
+            last = products_list[-1]
+            next_cursor = encode_cursor(
+                {
+                    "sort": filters.sort,
+                    "order": filters.order,
+                    "key": [getattr(last, filters.sort), last.id],
+                }
+            )
+
+        return page_schema(items=products_list, next_cursor=next_cursor)
+
+    @track_usecase("product.query_versions")
+    async def query_versions(
+        self, filters: ProductFilter | None = None
+    ) -> tuple[List[Version], bool]:
+        """
+        Executa a mesma consulta paginada de `query`, mas lendo só
+        (id, updated_at). Retorna as versões da página e se há próxima.
+        """
+        filters = filters or ProductFilter()
+        sql, values = self._page_sql(filters, "id, updated_at")
 
-    async def query(self) -> List[ProductOut]:
-        products_list: List[ProductOut] = []
-        async with self.pool.connection() as conn:
+        async with timed_connection(self._reader()) as conn:
             async with conn.cursor() as cur:
-                sql = (
-                    "SELECT id, name, description, price, quantity, status, "
-                    "created_at, updated_at FROM products;"
+                await cur.execute(sql, values, prepare=self._prepare_dynamic)
+                rows = await cur.fetchall()
+
+        has_more = len(rows) > filters.limit
+        return [(row[0], row[1]) for row in rows[: filters.limit]], has_more
+
+    @track_usecase("product.search")
+    async def search(self, params: ProductSearch) -> ProductPage:
+        """
+        Busca textual ranqueada em nome e descrição (tsvector + GIN). Com
+        fuzzy_search, nomes parecidos com o termo também entram (pg_trgm),
+        ranqueados pela similaridade.
+        """
+        offset = self._decode_search_offset(params)
+        rank = "ts_rank_cd(search_vector, query)"
+        match = "search_vector @@ query"
+        if self.fuzzy_search:
+            rank = f"greatest({rank}, word_similarity(%(q)s, name))"
+            match = f"({match} OR %(q)s <%% name)"
+        sql = (
+            f"SELECT {db_statements.PRODUCT_COLUMNS} FROM products, "
+            f"websearch_to_tsquery('{SEARCH_CONFIG}', %(q)s) AS query "
+            f"WHERE {match} ORDER BY {rank} DESC, id "
+            "LIMIT %(limit)s OFFSET %(offset)s;"
+        )
+        values = {"q": params.q, "limit": params.limit + 1, "offset": offset}
+
+        async with timed_connection(self._reader()) as conn:
+            async with conn.cursor(row_factory=product_out_row) as cur:
+                await cur.execute(sql, values, prepare=self._prepare_dynamic)
+                products_list = await cur.fetchall()
+
+        next_cursor = None
+        if len(products_list) > params.limit:
+            products_list = products_list[: params.limit]
+            next_cursor = encode_cursor(
+                {"q": params.q, "offset": offset + params.limit}
+            )
+
+        return ProductPage(items=products_list, next_cursor=next_cursor)
+
+    @staticmethod
+    def _decode_search_offset(params: ProductSearch) -> int:
+        # O ranking já ordena tudo o que casou; a página seguinte só pula os
+        # itens entregues. O cursor vale apenas para o mesmo termo.
+        if not params.cursor:
+            return 0
+        payload = decode_cursor(params.cursor)
+        offset = payload.get("offset")
+        if payload.get("q") != params.q:
+            raise InvalidCursorException(
+                message="Cursor does not match the search terms"
+            )
+        if not isinstance(offset, int) or offset < 0:
+            raise InvalidCursorException()
+        return offset
+
+    @track_usecase("product.stats")
+    async def stats(self) -> ProductStats:
+        """
+        Totais do estoque, mantidos incrementalmente por triggers em
+        product_stats: custo constante, independente do tamanho da tabela.
+        """
+        async with timed_connection(self._reader()) as conn:
+            async with conn.cursor(row_factory=product_stats_row) as cur:
+                await cur.execute(
+                    db_statements.SELECT_PRODUCT_STATS, prepare=self._prepare_fixed
                 )
-                await cur.execute(sql)
-                async for row in cur:
-                    products_list.append(
-                        ProductOut(
-                            id=row[0],
-                            name=row[1],
-                            description=row[2],
-                            price=row[3],
-                            quantity=row[4],
-                            status=row[5],
-                            created_at=row[6],
-                            updated_at=row[7],
-                        )
-                    )
-        return products_list
+                return await cur.fetchone()
 
-    async def update(self, id: UUID, body: ProductUpdate) -> ProductUpdateOut:
-        # Construi a query de update dinamicamente com base nos campos presentes no body
-        update_fields = []
-        update_values = []
-        counter = 1
-        for field, value in body.model_dump(exclude_unset=True).items():
-            if field == "id":  # Não atualiza o ID
-                continue
-            update_fields.append(f"{field} = %s")
-            update_values.append(value)
-            counter += 1
+    async def rebuild_stats(self) -> ProductStats:
+        """Recalcula product_stats a partir da tabela products (reparo)."""
+        async with timed_connection(self._primary()) as conn:
+            await conn.execute(db_statements.REBUILD_PRODUCT_STATS)
+        return await self.stats()
 
-        # Adiciona updated_at automaticamente
-        update_fields.append("updated_at = %s")
-        update_values.append(datetime.utcnow())
+    @track_usecase("product.export")
+    async def export(self, batch_size: int = 1000) -> AsyncIterator[List[ProductOut]]:
+        """
+        Percorre toda a tabela com um cursor nomeado (server-side),
+        entregando lotes de no máximo `batch_size` produtos.
+        """
+        async with timed_connection(self._reader()) as conn:
+            async with conn.cursor(
+                name="products_export", row_factory=product_out_row
+            ) as cur:
+                await cur.execute(
+                    f"SELECT {db_statements.PRODUCT_COLUMNS} FROM products "
+                    "ORDER BY created_at, id;"
+                )
+                while batch := await cur.fetchmany(batch_size):
+                    yield batch
 
-        if not update_fields:
-            return await self.get(id)
+    def _page_sql(self, filters: ProductFilter, columns: str) -> tuple[str, tuple]:
+        conditions, values = self._filter_conditions(filters)
 
+        # Paginação por keyset: continua a partir de (sort, id) do último item
+        if filters.cursor:
+            sort_value, last_id = self._decode_keyset(filters)
+            operator = ">" if filters.order == "asc" else "<"
+            conditions.append(f"({filters.sort}, id) {operator} (%s, %s)")
+            values.extend([sort_value, last_id])
+
+        where = f"WHERE {' AND '.join(conditions)} " if conditions else ""
         sql = (
-            f"UPDATE products SET {', '.join(update_fields)} WHERE id = %s "
-            "RETURNING id, name, description, price, quantity, status, "
-            "created_at, updated_at;"
+            f"SELECT {columns} FROM products {where}"
+            f"ORDER BY {filters.sort} {filters.order}, id {filters.order} "
+            "LIMIT %s;"
         )
-        update_values.append(str(id))  # Adicionar o ID para a cláusula WHERE
+        # Busca um item a mais para saber se existe próxima página
+        values.append(filters.limit + 1)
+        return sql, tuple(values)
 
-        async with self.pool.connection() as conn:
-            async with conn.cursor() as cur:
-                await cur.execute(sql, tuple(update_values))
+    @staticmethod
+    def _filter_conditions(filters: ProductFilter) -> tuple[list[str], list]:
+        conditions: list[str] = []
+        values: list = []
+        for column, operator, value in (
+            ("status", "=", filters.status),
+            ("price", ">=", filters.min_price),
+            ("price", "<=", filters.max_price),
+            ("quantity", ">=", filters.min_quantity),
+            ("quantity", "<=", filters.max_quantity),
+        ):
+            if value is not None:
+                conditions.append(f"{column} {operator} %s")
+                values.append(value)
+        return conditions, values
+
+    @staticmethod
+    def _decode_keyset(filters: ProductFilter) -> tuple[Any, UUID]:
+        payload = decode_cursor(filters.cursor)
+        # O cursor só é válido para a mesma ordenação que o gerou
+        if payload.get("sort") != filters.sort or payload.get("order") != filters.order:
+            raise InvalidCursorException(
+                message="Cursor does not match the requested ordering"
+            )
+        try:
+            sort_value, last_id = payload["key"]
+            if filters.sort == "created_at":
+                sort_value = datetime.fromisoformat(sort_value)
+            elif not isinstance(sort_value, str):
+                raise TypeError("name cursor must be a string")
+            # UUID() com um não-str levanta AttributeError, não TypeError
+            if not isinstance(last_id, str):
+                raise TypeError("cursor id must be a string")
+            return sort_value, UUID(last_id)
+        except (KeyError, TypeError, ValueError) as exc:
+            raise InvalidCursorException() from exc
+
+    @track_usecase("product.update")
+    async def update(self, id: UUID, body: ProductUpdate) -> ProductUpdateOut:
+        # Forma canônica: campos ausentes vão como NULL e mantêm o valor atual
+        values = dict.fromkeys(UPDATE_COLUMN_TYPES)
+        values.update(body.model_dump(exclude_unset=True))
+        # Adiciona updated_at automaticamente
+        values["updated_at"] = datetime.utcnow()
+        values["id"] = str(id)  # Adicionar o ID para a cláusula WHERE
+
+        async with timed_connection(self._primary()) as conn:
+            async with conn.cursor(row_factory=product_update_out_row) as cur:
+                await cur.execute(
+                    db_statements.UPDATE_PRODUCT, values, prepare=self._prepare_fixed
+                )
                 result = await cur.fetchone()
 
+        self._invalidate(id)
         if not result:
             raise NotFoundException(message=f"Product not found with filter: {id}")
 
-        return ProductUpdateOut(
-            id=result[0],
-            name=result[1],
-            description=result[2],
-            price=result[3],
-            quantity=result[4],
-            status=result[5],
-            created_at=result[6],
-            updated_at=result[7],
+        self._announce("update", [id])
+        return result
+
+    @track_usecase("product.batch_update")
+    async def batch_update(
+        self, items: List[ProductBatchUpdate]
+    ) -> ProductBatchUpdateOut:
+        """
+        Aplica várias atualizações com um UPDATE ... FROM unnest(...) por
+        combinação de campos alterados, numa única transação.
+        """
+        # Entradas repetidas para o mesmo ID são mescladas (a última vence)
+        changes: dict[UUID, dict[str, Any]] = {}
+        for item in items:
+            fields = item.model_dump(
+                exclude={"id"}, exclude_unset=True, exclude_none=True
+            )
+            changes.setdefault(item.id, {}).update(fields)
+
+        shapes: dict[tuple[str, ...], List[UUID]] = {}
+        for product_id, fields in changes.items():
+            shapes.setdefault(tuple(sorted(fields)), []).append(product_id)
+
+        updated_at = datetime.utcnow()
+        updated: dict[UUID, ProductUpdateOut] = {}
+        async with timed_connection(self._primary()) as conn:
+            async with conn.transaction():
+                # Em pipeline mode todos os UPDATEs são enviados antes de ler
+                # qualquer resultado: um round trip para todos os formatos.
+                async with self._pipeline(conn):
+                    cursors = []
+                    for columns, ids in shapes.items():
+                        sql, values = self._batch_update_sql(
+                            columns, ids, changes, updated_at
+                        )
+                        cur = conn.cursor(row_factory=product_update_out_row)
+                        await cur.execute(sql, values, prepare=self._prepare_dynamic)
+                        cursors.append(cur)
+
+                    for cur in cursors:
+                        for product in await cur.fetchall():
+                            updated[product.id] = product
+                        await cur.close()
+
+        for product_id in changes:
+            self._invalidate(product_id)
+        self._announce("update", list(updated))
+
+        return ProductBatchUpdateOut(
+            updated=[updated[id] for id in changes if id in updated],
+            not_found=[id for id in changes if id not in updated],
+        )
+
+    @staticmethod
+    def _batch_update_sql(
+        columns: tuple[str, ...],
+        ids: List[UUID],
+        changes: dict[UUID, dict[str, Any]],
+        updated_at: datetime,
+    ) -> tuple[str, tuple]:
+        assignments = [f"{column} = v.{column}" for column in columns]
+        assignments.append("updated_at = %s")
+        arrays = ", ".join(
+            ["%s::uuid[]"] + [f"%s::{UPDATE_COLUMN_TYPES[c]}[]" for c in columns]
         )
+        sql = (
+            f"UPDATE products AS p SET {', '.join(assignments)} "
+            f"FROM unnest({arrays}) AS v(id{''.join(f', {c}' for c in columns)}) "
+            "WHERE p.id = v.id "
+            "RETURNING p.id, p.name, p.description, p.price, p.quantity, p.status, "
+            "p.created_at, p.updated_at;"
+        )
+        values = [updated_at, ids] + [
+            [changes[id][column] for id in ids] for column in columns
+        ]
+        return sql, tuple(values)
+
+    @track_usecase("product.reserve")
+    async def reserve(self, id: UUID, body: ProductReserve) -> ProductUpdateOut:
+        """
+        Baixa `body.quantity` unidades do estoque com um único UPDATE
+        condicional, seguro sob concorrência.
+        """
+        values = {
+            "id": str(id),
+            "quantity": body.quantity,
+            "updated_at": datetime.utcnow(),
+        }
+        async with timed_connection(self._primary()) as conn:
+            async with conn.cursor(row_factory=product_update_out_row) as cur:
+                await cur.execute(
+                    db_statements.RESERVE_PRODUCT, values, prepare=self._prepare_fixed
+                )
+                product = await cur.fetchone()
+
+            if product is None:
+                # Só no caminho de falha: distingue produto inexistente de
+                # estoque insuficiente
+                cur = await conn.execute(
+                    db_statements.SELECT_PRODUCT_QUANTITY,
+                    (str(id),),
+                    prepare=self._prepare_fixed,
+                )
+                row = await cur.fetchone()
+                if row is None:
+                    raise NotFoundException(
+                        message=f"Product not found with filter: {id}"
+                    )
+                raise InsufficientStockException(
+                    shortages=[
+                        ProductStockShortage(
+                            id=id, requested=body.quantity, available=row[0]
+                        )
+                    ]
+                )
+
+        self._invalidate(id)
+        self._announce("update", [id])
+        return product
+
+    @track_usecase("product.reserve_batch")
+    async def reserve_batch(
+        self, items: List[ProductBatchReserve]
+    ) -> List[ProductUpdateOut]:
+        """
+        Reserva todos os itens de um carrinho ou nenhum. Itens repetidos
+        têm as quantidades somadas.
+        """
+        requested: dict[UUID, int] = {}
+        for item in items:
+            requested[item.id] = requested.get(item.id, 0) + item.quantity
+        ids = sorted(requested)
 
+        async with timed_connection(self._primary()) as conn:
+            async with conn.transaction():
+                # Trava as linhas em ordem de ID e reserva, num round trip
+                async with self._pipeline(conn):
+                    lock = conn.cursor()
+                    await lock.execute(
+                        db_statements.LOCK_PRODUCTS,
+                        (ids,),
+                        prepare=self._prepare_fixed,
+                    )
+                    cur = conn.cursor(row_factory=product_update_out_row)
+                    await cur.execute(
+                        db_statements.RESERVE_PRODUCTS,
+                        (datetime.utcnow(), ids, [requested[id] for id in ids]),
+                        prepare=self._prepare_fixed,
+                    )
+                    stock = {id: quantity for id, quantity in await lock.fetchall()}
+                    reserved = {product.id: product for product in await cur.fetchall()}
+                    await lock.close()
+                    await cur.close()
+
+                # Sair da transação com exceção desfaz as reservas já feitas
+                missing = [id for id in requested if id not in stock]
+                if missing:
+                    raise NotFoundException(
+                        message=f"Products not found: {', '.join(map(str, missing))}"
+                    )
+                if len(reserved) < len(requested):
+                    raise InsufficientStockException(
+                        shortages=[
+                            ProductStockShortage(
+                                id=id, requested=requested[id], available=stock[id]
+                            )
+                            for id in requested
+                            if id not in reserved
+                        ]
+                    )
+
+        for id in requested:
+            self._invalidate(id)
+        self._announce("update", list(requested))
+        return [reserved[id] for id in requested]
+
+    @track_usecase("product.delete")
     async def delete(self, id: UUID) -> bool:
-        async with self.pool.connection() as conn:
+        async with timed_connection(self._primary()) as conn:
             async with conn.cursor() as cur:
-                sql = "DELETE FROM products WHERE id = %s;"
-                await cur.execute(sql, (str(id),))
+                await cur.execute(
+                    db_statements.DELETE_PRODUCT,
+                    (str(id),),
+                    prepare=self._prepare_fixed,
+                )
                 deleted_count = cur.rowcount
 
+        self._invalidate(id)
         if deleted_count == 0:
             raise NotFoundException(message=f"Product not found with filter: {id}")
 
+        self._announce("delete", [id])
         return True
+
+    def _reader(self) -> AsyncConnectionPool:
+        return self.pool if self.pin_primary else self.read_pool
+
+    def _miss_reader(self) -> AsyncConnectionPool:
+        # Com cache, a falta é lida do primário e preenche o cache: linha de
+        # réplica atrasada devolveria a versão anterior a uma escrita já
+        # invalidada, e ela ficaria no cache pelo TTL inteiro. As leituras
+        # seguintes saem do cache, sem ir a banco nenhum; sem cache, a
+        # réplica atende como antes
+        return self.pool if self.cache is not None else self._reader()
+
+    def _primary(self) -> AsyncConnectionPool:
+        # Depois de uma escrita, as leituras desta instância (requisição)
+        # também vão ao primário, para enxergar o que acabou de ser gravado
+        self.pin_primary = True
+        return self.pool
+
+    def _pipeline(self, conn: AsyncConnection) -> AsyncContextManager[Any]:
+        return conn.pipeline() if self.pipeline else nullcontext()
+
+    def _invalidate(self, id: UUID) -> None:
+        if self.cache is not None:
+            self.cache.invalidate(id)
+        if self.flights is not None:
+            # Leituras iniciadas antes da escrita não servem a quem chega depois
+            self.flights.forget_if(
+                lambda key: key[0] == "query" or (key[0] == "get" and key[1] == id)
+            )
+
+    def _announce(self, op: str, ids: List[UUID]) -> None:
+        # Só depois do commit: o NOTIFY não entra na transação de escrita
+        if self.publisher is not None:
+            self.publisher.publish(self.pool, op, ids)
+
+    def _forget_queries(self) -> None:
+        # Um produto novo pode entrar em qualquer listagem em andamento
+        if self.flights is not None:
+            self.flights.forget_if(lambda key: key[0] == "query")
@@ -12,6 +12,7 @@ from store.main import get_application
 from store.schemas.schemas_product import ProductIn, ProductOut, ProductUpdate
 from store.usecases.usecases_product import ProductUsecase
 from store.db.db_postgres import db_client as global_db_client
+from store.db.db_migrations import migrate
 
 # Configuração para Windows, se necessário
 import platform
@@ -38,7 +39,7 @@ def event_loop():
 async def setup_database_connection_and_schema():
     """
     Fixture para conectar ao banco de dados usando o global_db_client,
-    criar a tabela 'products' (se não existir) e depois desconectar ao
+    aplicar as migrations e depois desconectar ao
     final da sessão de testes.
     Este fixture garante que o db_client.pool esteja conectado antes de
     qualquer uso.
@@ -49,33 +50,18 @@ async def setup_database_connection_and_schema():
             "DATABASE_URL environment variable not set. Please set it to run tests."
         )
 
+    # Cria/atualiza o schema pelas migrations (store/db/migrations) antes de
+    # conectar, como no startup da aplicação
+    print("\n[SETUP] Aplicando migrations...")
+    applied = await migrate(dsn)
+    print(f"[SETUP] {len(applied)} migration(s) aplicada(s).")
+
     # Conecta o pool de conexões do global_db_client
-    print("\n[SETUP] Conectando ao banco de dados e abrindo pool...")
+    print("[SETUP] Conectando ao banco de dados e abrindo pool...")
     await global_db_client.connect(dsn)
     print("[SETUP] Conectado ao banco de dados e pool aberto.")
 
     try:
-        # Cria a tabela 'products' se ela não existir
-        async with global_db_client.pool.connection() as conn:
-            async with conn.cursor() as cur:
-                print("[SETUP] Verificando/Criando tabela 'products'...")
-                await cur.execute(
-                    """
-                    CREATE TABLE IF NOT EXISTS products (
-                        id UUID PRIMARY KEY,
-                        name VARCHAR(255) NOT NULL,
-                        description VARCHAR(1000),
-                        quantity INTEGER NOT NULL,
-                        price NUMERIC(10, 2) NOT NULL,
-                        status BOOLEAN NOT NULL,
-                        created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
-                        updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
-                    );
-                """
-                )
-                await conn.commit()
-                print("[SETUP] Tabela 'products' verificada/criada com sucesso.")
-
         yield
 
     finally:
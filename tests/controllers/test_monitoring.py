@@ -0,0 +1,67 @@
+import pytest
+from fastapi import status
+from httpx import ASGITransport, AsyncClient
+
+from store.main import get_application
+
+
+@pytest.mark.asyncio
+async def test_controller_pool_stats_should_return_success(api_client):
+    response = await api_client.get("/monitoring/pool")
+    content = response.json()
+
+    assert response.status_code == status.HTTP_200_OK
+    assert content["pool_max"] >= content["pool_min"]
+    assert content["connections_in_use"] == (
+        content["pool_size"] - content["pool_available"]
+    )
+    assert content["requests_waiting"] == 0
+
+
+@pytest.mark.asyncio
+async def test_controller_replica_stats_without_replicas(api_client):
+    response = await api_client.get("/monitoring/pool/replicas")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == []
+
+
+@pytest.mark.asyncio
+async def test_controller_metrics_should_expose_requests_and_pool(
+    api_client, products_url
+):
+    await api_client.get(products_url)
+
+    response = await api_client.get("/metrics")
+    text = response.text
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("text/plain")
+    assert (
+        'store_http_requests_total{method="GET",route="/products/",status="200"}'
+        in text
+    )
+    assert (
+        'store_usecase_duration_seconds_count{method="product.query",outcome="ok"}'
+        in text
+    )
+    assert 'store_db_pool_size{pool="primary"}' in text
+
+
+@pytest.mark.asyncio
+async def test_controller_health_live_and_ready_after_startup():
+    app = get_application()
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+        live = await client.get("/health/live")
+        starting = await client.get("/health/ready")
+        app.state.ready = True
+        ready = await client.get("/health/ready")
+
+    assert live.status_code == status.HTTP_200_OK
+    assert live.json()["status"] == "alive"
+    assert starting.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert starting.json()["status"] == "starting"
+    assert ready.status_code == status.HTTP_200_OK
+    assert ready.json()["status"] == "ready"
+    assert ready.json()["pools"]["primary"]["pool_size"] >= 1
@@ -1,3 +1,6 @@
+import csv
+import io
+import json
 from decimal import Decimal
 
 import pytest
@@ -62,8 +65,36 @@ async def test_controller_query_should_return_success(
     response = await api_client.get(products_url)
 
     assert response.status_code == 200
-    assert isinstance(response.json(), list)
-    assert len(response.json()) == 3
+    assert isinstance(response.json()["items"], list)
+    assert len(response.json()["items"]) == 3
+
+
+@pytest.mark.asyncio
+async def test_controller_query_should_paginate(
+    api_client, products_url, products_inserted
+):
+    response = await api_client.get(products_url, params={"limit": 2})
+    content = response.json()
+
+    assert response.status_code == status.HTTP_200_OK
+    assert len(content["items"]) == 2
+
+    response = await api_client.get(
+        products_url, params={"limit": 2, "cursor": content["next_cursor"]}
+    )
+    content = response.json()
+
+    assert len(content["items"]) == 1
+    assert content["next_cursor"] is None
+
+
+@pytest.mark.asyncio
+async def test_controller_query_should_return_bad_request_on_invalid_cursor(
+    api_client, products_url
+):
+    response = await api_client.get(products_url, params={"cursor": "invalid"})
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
 
 
 @pytest.mark.asyncio
@@ -107,3 +138,332 @@ async def test_controller_delete_should_return_not_found(api_client, products_ur
     assert response.json() == {
         "detail": "Product not found with filter: 4fd7cd35-a3a0-4c1f-a78d-d24aa81e7dca"
     }
+
+
+@pytest.mark.asyncio
+async def test_controller_export_ndjson_should_stream_all_products(
+    api_client, products_url, products_inserted
+):
+    response = await api_client.get(f"{products_url}export")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"] == "application/x-ndjson"
+
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["id"] for line in lines] == [str(p.id) for p in products_inserted]
+
+
+@pytest.mark.asyncio
+async def test_controller_export_csv_should_stream_all_products(
+    api_client, products_url, products_inserted
+):
+    response = await api_client.get(f"{products_url}export", params={"format": "csv"})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("text/csv")
+
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert len(rows) == 3
+    assert rows[0]["name"] == products_inserted[0].name
+
+
+@pytest.mark.asyncio
+async def test_controller_bulk_json_should_return_created_ids(
+    api_client, products_url, product_data
+):
+    data = {**product_data, "price": str(product_data["price"])}
+
+    response = await api_client.post(
+        f"{products_url}bulk", json=[data, data, {"name": "Invalid"}]
+    )
+    content = response.json()
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert len(content["ids"]) == 2
+    assert content["errors"][0]["index"] == 2
+
+
+@pytest.mark.asyncio
+async def test_controller_bulk_ndjson_should_return_created_ids(
+    api_client, products_url, product_data
+):
+    data = {**product_data, "price": str(product_data["price"])}
+    body = "\n".join(json.dumps(data) for _ in range(3)) + "\n"
+
+    response = await api_client.post(
+        f"{products_url}bulk",
+        content=body,
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert len(response.json()["ids"]) == 3
+    assert response.json()["errors"] == []
+
+
+@pytest.mark.asyncio
+async def test_controller_bulk_should_return_422_naming_rejected_row(
+    api_client, products_url, product_data
+):
+    data = {**product_data, "price": str(product_data["price"])}
+
+    response = await api_client.post(
+        f"{products_url}bulk", json=[data, {**data, "name": "a\x00b"}]
+    )
+
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    assert response.json()["detail"]["index"] == 1
+
+
+@pytest.mark.asyncio
+async def test_controller_bulk_should_reject_non_array_body(api_client, products_url):
+    response = await api_client.post(f"{products_url}bulk", json={"name": "x"})
+
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+@pytest.mark.asyncio
+async def test_controller_batch_patch_should_return_success(
+    api_client, products_url, products_inserted
+):
+    missing_id = "4fd7cd35-a3a0-4c1f-a78d-d24aa81e7dca"
+    response = await api_client.patch(
+        f"{products_url}batch",
+        json=[
+            {"id": str(products_inserted[0].id), "price": "9.99"},
+            {"id": str(products_inserted[1].id), "price": "19.99"},
+            {"id": missing_id, "quantity": 1},
+        ],
+    )
+    content = response.json()
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [Decimal(p["price"]) for p in content["updated"]] == [
+        Decimal("9.99"),
+        Decimal("19.99"),
+    ]
+    assert content["not_found"] == [missing_id]
+
+
+@pytest.mark.asyncio
+async def test_controller_patch_should_reject_values_out_of_column_range(
+    api_client, products_url, product_inserted
+):
+    single = await api_client.patch(
+        f"{products_url}{product_inserted.id}", json={"price": "100000000.00"}
+    )
+    batch = await api_client.patch(
+        f"{products_url}batch",
+        json=[
+            {"id": str(product_inserted.id), "price": "9.99"},
+            {"id": str(product_inserted.id), "quantity": 2**31},
+        ],
+    )
+
+    assert single.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    assert batch.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    assert batch.json()["detail"][0]["loc"] == ["body", 1, "quantity"]
+
+
+@pytest.mark.asyncio
+async def test_controller_get_should_return_not_modified_for_matching_etag(
+    api_client, products_url, product_inserted
+):
+    url = f"{products_url}{product_inserted.id}"
+    response = await api_client.get(url)
+    etag = response.headers["etag"]
+
+    assert response.headers["last-modified"]
+
+    response = await api_client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.content == b""
+
+    await api_client.patch(url, json={"quantity": 1})
+    response = await api_client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["etag"] != etag
+
+
+@pytest.mark.asyncio
+async def test_controller_get_should_honour_if_modified_since(
+    api_client, products_url, product_inserted
+):
+    url = f"{products_url}{product_inserted.id}"
+    last_modified = (await api_client.get(url)).headers["last-modified"]
+
+    response = await api_client.get(url, headers={"If-Modified-Since": last_modified})
+
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+
+@pytest.mark.asyncio
+async def test_controller_query_should_return_not_modified_for_matching_etag(
+    api_client, products_url, products_inserted
+):
+    etag = (await api_client.get(products_url)).headers["etag"]
+
+    response = await api_client.get(products_url, headers={"If-None-Match": etag})
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    await api_client.delete(f"{products_url}{products_inserted[0].id}")
+    response = await api_client.get(products_url, headers={"If-None-Match": etag})
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.json()["items"]) == 2
+
+
+@pytest.mark.asyncio
+async def test_controller_get_should_send_server_timing(
+    api_client, products_url, product_inserted
+):
+    response = await api_client.get(f"{products_url}{product_inserted.id}")
+
+    phases = {
+        entry.split(";")[0].strip()
+        for entry in response.headers["server-timing"].split(",")
+    }
+    assert {"db-acquire", "db-exec", "db-fetch", "encode", "app", "total"} <= phases
+
+
+@pytest.mark.asyncio
+async def test_controller_search_should_return_ranked_page(
+    api_client, products_url, products_inserted
+):
+    response = await api_client.get(f"{products_url}search", params={"q": "product 2"})
+    content = response.json()
+
+    assert response.status_code == status.HTTP_200_OK
+    assert content["items"][0]["name"] == "Product 2"
+    assert content["next_cursor"] is None
+
+
+@pytest.mark.asyncio
+async def test_controller_search_should_validate_query(api_client, products_url):
+    response = await api_client.get(f"{products_url}search")
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    response = await api_client.get(
+        f"{products_url}search", params={"q": "x", "cursor": "invalid"}
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.asyncio
+async def test_controller_reserve_should_return_conflict_without_stock(
+    api_client, products_url, product_inserted
+):
+    url = f"{products_url}{product_inserted.id}/reserve"
+
+    response = await api_client.post(url, json={"quantity": 10})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["quantity"] == 0
+
+    response = await api_client.post(url, json={"quantity": 1})
+    assert response.status_code == status.HTTP_409_CONFLICT
+    assert response.json()["detail"]["shortages"] == [
+        {"id": str(product_inserted.id), "requested": 1, "available": 0}
+    ]
+
+    response = await api_client.post(url, json={"quantity": 0})
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+@pytest.mark.asyncio
+async def test_controller_reserve_batch(api_client, products_url, products_inserted):
+    items = [{"id": str(p.id), "quantity": 5} for p in products_inserted]
+
+    response = await api_client.post(f"{products_url}reserve", json=items)
+    assert response.status_code == status.HTTP_200_OK
+    assert [p["quantity"] for p in response.json()] == [5, 5, 5]
+
+    items[0]["quantity"] = 6
+    response = await api_client.post(f"{products_url}reserve", json=items)
+    assert response.status_code == status.HTTP_409_CONFLICT
+
+    response = await api_client.post(
+        f"{products_url}00000000-0000-4000-8000-000000000000/reserve",
+        json={"quantity": 1},
+    )
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.asyncio
+async def test_controller_stats_should_return_totals(
+    api_client, products_url, products_inserted
+):
+    response = await api_client.get(f"{products_url}stats")
+    content = response.json()
+
+    assert response.status_code == status.HTTP_200_OK
+    assert content == {
+        "product_count": 3,
+        "active_count": 3,
+        "stock_units": 30,
+        "inventory_value": "255000.00",
+        "out_of_stock_count": 0,
+    }
+
+
+@pytest.mark.asyncio
+async def test_controller_statement_timeout_returns_503():
+    from httpx import ASGITransport, AsyncClient
+    from psycopg.errors import QueryCanceled
+
+    from store.controllers.controllers_product import get_product_usecase
+    from store.main import get_application
+
+    class SlowUsecase:
+        async def stats(self):
+            raise QueryCanceled("canceling statement due to statement timeout")
+
+    app = get_application()
+    app.dependency_overrides[get_product_usecase] = SlowUsecase
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+        response = await client.get("/products/stats")
+
+    assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert response.headers["retry-after"] == "1"
+
+
+@pytest.mark.asyncio
+async def test_controller_sparse_fields(api_client, products_url, products_inserted):
+    product_id = products_inserted[0].id
+    listing = await api_client.get(products_url, params={"fields": "price,id,name"})
+    full = await api_client.get(f"{products_url}{product_id}")
+    slim = await api_client.get(
+        f"{products_url}{product_id}", params={"fields": "name"}
+    )
+    invalid = await api_client.get(products_url, params={"fields": "name,cost"})
+
+    assert listing.status_code == status.HTTP_200_OK
+    assert [list(item) for item in listing.json()["items"]] == [
+        ["id", "name", "price"]
+    ] * 3
+    assert slim.json() == {"name": "Product 1"}
+    assert slim.headers["etag"] != full.headers["etag"]
+    assert invalid.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    cached = await api_client.get(
+        f"{products_url}{product_id}",
+        params={"fields": "name"},
+        headers={"If-None-Match": slim.headers["etag"]},
+    )
+    assert cached.status_code == status.HTTP_304_NOT_MODIFIED
+
+
+@pytest.mark.asyncio
+async def test_controller_batch_get(api_client, products_url, products_inserted):
+    ids = [str(product.id) for product in reversed(products_inserted)]
+    missing = "f596b669-e77a-4c1c-9029-231a59052b61"
+
+    response = await api_client.post(
+        f"{products_url}batch-get", json={"ids": [ids[0], missing, ids[1]]}
+    )
+    empty = await api_client.post(f"{products_url}batch-get", json={"ids": []})
+
+    assert response.status_code == status.HTTP_200_OK
+    content = response.json()
+    assert [item["id"] for item in content["items"]] == ids[:2]
+    assert content["missing"] == [missing]
+    assert empty.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
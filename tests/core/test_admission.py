@@ -0,0 +1,111 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI, status
+from httpx import ASGITransport, AsyncClient
+
+from store.core.core_admission import (
+    AdmissionLimiter,
+    AdmissionMiddleware,
+    AdmissionRejected,
+)
+
+
+@pytest.mark.asyncio
+async def test_limiter_queues_in_order_and_hands_slot_over():
+    limiter = AdmissionLimiter(limit=1, queue_size=2, timeout=1)
+    order = []
+
+    async def request(name: str) -> None:
+        await limiter.acquire()
+        order.append(name)
+        await asyncio.sleep(0.01)
+        limiter.release()
+
+    await asyncio.gather(*(request(name) for name in "abc"))
+
+    assert order == ["a", "b", "c"]
+    assert limiter.stats() == {
+        "limit": 1,
+        "active": 0,
+        "queued": 0,
+        "admitted": 3,
+        "rejected_queue_full": 0,
+        "rejected_timeout": 0,
+    }
+
+
+@pytest.mark.asyncio
+async def test_limiter_rejects_when_queue_is_full_or_deadline_passes():
+    limiter = AdmissionLimiter(limit=1, queue_size=1, timeout=0.05)
+    await limiter.acquire()
+    waiting = asyncio.ensure_future(limiter.acquire())
+    await asyncio.sleep(0)
+
+    with pytest.raises(AdmissionRejected) as full:
+        await limiter.acquire()
+    with pytest.raises(AdmissionRejected) as late:
+        await waiting
+
+    assert (full.value.reason, late.value.reason) == ("queue_full", "timeout")
+    assert (limiter.active, limiter.queued) == (1, 0)
+    limiter.release()
+    assert limiter.active == 0
+
+
+@pytest.mark.asyncio
+async def test_limiter_cancelled_waiter_leaves_queue():
+    limiter = AdmissionLimiter(limit=1, queue_size=1, timeout=1)
+    await limiter.acquire()
+    waiting = asyncio.ensure_future(limiter.acquire())
+    await asyncio.sleep(0)
+
+    waiting.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiting
+
+    assert limiter.queued == 0
+    limiter.release()
+    assert limiter.active == 0
+
+
+@pytest.mark.asyncio
+async def test_middleware_sheds_load_per_route_class():
+    release = asyncio.Event()
+    app = FastAPI()
+
+    @app.get("/slow")
+    async def slow():
+        await release.wait()
+        return {}
+
+    @app.post("/write")
+    async def write_route():
+        return {}
+
+    @app.get("/health/live")
+    async def live_route():
+        return {}
+
+    limiters = {
+        "read": AdmissionLimiter(limit=1, queue_size=0, timeout=1),
+        "write": AdmissionLimiter(limit=1, queue_size=0, timeout=1),
+    }
+    app.add_middleware(AdmissionMiddleware, limiters=limiters, retry_after=3)
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+        busy = asyncio.ensure_future(client.get("/slow"))
+        while limiters["read"].active == 0:
+            await asyncio.sleep(0.001)
+
+        rejected = await client.get("/slow")
+        write = await client.post("/write")
+        live = await client.get("/health/live")
+        release.set()
+        await busy
+
+    assert rejected.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert rejected.headers["retry-after"] == "3"
+    assert write.status_code == live.status_code == status.HTTP_200_OK
+    assert limiters["read"].active == 0
@@ -0,0 +1,51 @@
+from store.core.core_cache import LRUCache
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_cache_hit_and_miss():
+    cache = LRUCache(max_size=2, ttl=10)
+
+    assert cache.get("a") is None
+    cache.set("a", 1)
+
+    assert cache.get("a") == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_cache_evicts_least_recently_used():
+    cache = LRUCache(max_size=2, ttl=10)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.evictions == 1
+
+
+def test_cache_expires_entries():
+    clock = FakeClock()
+    cache = LRUCache(max_size=2, ttl=5, clock=clock)
+    cache.set("a", 1)
+
+    clock.now = 5
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_cache_discards_value_read_before_invalidation():
+    cache = LRUCache(max_size=2, ttl=10)
+    generation = cache.generation()
+
+    cache.invalidate("a")
+    cache.set("a", "stale", generation=generation)
+
+    assert cache.get("a") is None
@@ -0,0 +1,89 @@
+import json
+from uuid import uuid4
+
+import pytest
+
+from store.core.core_cache import LRUCache
+from store.core.core_changes import (
+    ChangePublisher,
+    change_queue,
+    invalidate_on_change,
+    sse_events,
+)
+from store.core.core_singleflight import SingleFlight
+
+
+def _flights_with(*keys) -> SingleFlight:
+    flights = SingleFlight()
+    for key in keys:
+        flights._calls[key] = object()
+    return flights
+
+
+def test_invalidate_on_change_removes_changed_product():
+    changed, other = uuid4(), uuid4()
+    cache = LRUCache(max_size=10, ttl=60)
+    cache.set(changed, "changed")
+    cache.set(other, "other")
+    flights = _flights_with(
+        ("get", changed, False), ("get", other, False), ("query", False, ())
+    )
+
+    invalidate_on_change(cache, flights)(
+        json.dumps({"op": "update", "id": str(changed)})
+    )
+
+    assert cache.get(changed) is None
+    assert cache.get(other) == "other"
+    assert list(flights._calls) == [("get", other, False)]
+
+
+@pytest.mark.parametrize(
+    "payload", [None, json.dumps({"op": "update", "id": None, "count": 500})]
+)
+def test_invalidate_on_change_clears_everything_without_id(payload):
+    cache = LRUCache(max_size=10, ttl=60)
+    cache.set(uuid4(), "product")
+    flights = _flights_with(("get", uuid4(), False))
+
+    invalidate_on_change(cache, flights)(payload)
+
+    assert len(cache) == 0
+    assert len(flights) == 0
+
+
+@pytest.mark.asyncio
+async def test_sse_events_formats_changes_resets_and_heartbeats():
+    queue, enqueue = change_queue(maxsize=10)
+    events = sse_events(queue, heartbeat=0.01)
+
+    assert await anext(events) == b"retry: 3000\n\n"
+    enqueue('{"op":"insert","id":"1"}')
+    assert await anext(events) == b'event: change\ndata: {"op":"insert","id":"1"}\n\n'
+    enqueue(None)
+    assert await anext(events) == b"event: reset\ndata: {}\n\n"
+    assert await anext(events) == b": heartbeat\n\n"
+    await events.aclose()
+
+
+def test_change_queue_overflow_becomes_reset():
+    queue, enqueue = change_queue(maxsize=2)
+    for payload in ("a", "b", "c"):
+        enqueue(payload)
+
+    assert queue.qsize() == 1
+    assert queue.get_nowait() is None
+
+
+def test_change_publisher_payloads_dedupe_and_collapse_large_batches():
+    publisher = ChangePublisher(window=1, max_ids=2)
+    changed, other = uuid4(), uuid4()
+
+    payloads = publisher._payloads(
+        {"update": [changed, changed], "insert": [uuid4(), uuid4(), other]}
+    )
+
+    assert [json.loads(payload) for payload in payloads] == [
+        {"op": "update", "id": str(changed)},
+        {"op": "insert", "id": None, "count": 3},
+    ]
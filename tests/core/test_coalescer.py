@@ -0,0 +1,61 @@
+import asyncio
+
+import pytest
+
+from store.core.core_coalescer import WriteCoalescer
+
+
+@pytest.mark.asyncio
+async def test_concurrent_submits_share_one_flush():
+    coalescer = WriteCoalescer(window=0.01, max_batch=100)
+    flushed = []
+
+    async def flush(items):
+        flushed.append(list(items))
+        return [item * 10 if item != 3 else ValueError("bad item") for item in items]
+
+    results = await asyncio.gather(
+        *(coalescer.submit("key", item, flush) for item in range(5)),
+        return_exceptions=True,
+    )
+
+    assert flushed == [[0, 1, 2, 3, 4]]
+    assert results[:3] + results[4:] == [0, 10, 20, 40]
+    assert isinstance(results[3], ValueError)
+    assert coalescer.stats() == {"batches": 1, "items": 5, "pending": 0}
+
+
+@pytest.mark.asyncio
+async def test_full_batch_flushes_before_the_window():
+    coalescer = WriteCoalescer(window=60, max_batch=2)
+
+    async def flush(items):
+        return items
+
+    results = await asyncio.wait_for(
+        asyncio.gather(*(coalescer.submit("key", item, flush) for item in range(4))),
+        timeout=1,
+    )
+
+    assert results == [0, 1, 2, 3]
+    assert coalescer.batches == 2
+
+
+@pytest.mark.asyncio
+async def test_flush_error_reaches_every_caller_and_drain_flushes_open_batch():
+    coalescer = WriteCoalescer(window=60, max_batch=100)
+
+    async def flush(items):
+        raise ConnectionError("database down")
+
+    pending = [
+        asyncio.ensure_future(coalescer.submit("key", item, flush)) for item in range(2)
+    ]
+    await asyncio.sleep(0)
+    assert coalescer.stats()["pending"] == 2
+
+    await coalescer.drain()
+
+    for future in pending:
+        with pytest.raises(ConnectionError):
+            await future
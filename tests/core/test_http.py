@@ -0,0 +1,31 @@
+from datetime import datetime, timezone
+from uuid import uuid4
+
+from store.core.core_http import http_date, is_not_modified, make_etag
+
+UPDATED_AT = datetime(2024, 1, 1, 12, 0, 0, 500, tzinfo=timezone.utc)
+
+
+def test_make_etag_changes_with_versions():
+    product_id = uuid4()
+    etag = make_etag([(product_id, UPDATED_AT)])
+
+    assert etag == make_etag([(product_id, UPDATED_AT)])
+    assert etag != make_etag([(product_id, UPDATED_AT.replace(second=1))])
+    assert etag != make_etag([(product_id, UPDATED_AT)], True)
+
+
+def test_is_not_modified_with_if_none_match():
+    etag = make_etag([(uuid4(), UPDATED_AT)])
+
+    assert is_not_modified({"if-none-match": f'"other", W/{etag}'}, etag, None)
+    assert is_not_modified({"if-none-match": "*"}, etag, None)
+    assert not is_not_modified({"if-none-match": '"other"'}, etag, UPDATED_AT)
+
+
+def test_is_not_modified_with_if_modified_since():
+    headers = {"if-modified-since": http_date(UPDATED_AT)}
+
+    assert is_not_modified(headers, '"x"', UPDATED_AT)
+    assert not is_not_modified(headers, '"x"', UPDATED_AT.replace(second=1))
+    assert not is_not_modified({"if-modified-since": "garbage"}, '"x"', UPDATED_AT)
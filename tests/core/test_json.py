@@ -0,0 +1,49 @@
+import json
+from datetime import datetime, timezone
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+
+from store.core.core_json import FastJSONResponse, dumps
+from store.schemas.schemas_product import ProductOut, ProductPage
+
+NOW = datetime(2024, 1, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def _page() -> ProductPage:
+    product = ProductOut(
+        id=uuid4(),
+        name="Iphone 14 Pro Max",
+        description="Apple.",
+        quantity=10,
+        price=Decimal("8500.00"),
+        status=True,
+        created_at=NOW,
+        updated_at=NOW,
+    )
+    return ProductPage(items=[product], next_cursor="abc")
+
+
+def test_dumps_model_matches_pydantic_json():
+    page = _page()
+
+    assert dumps(page) == page.model_dump_json().encode()
+    assert FastJSONResponse(page).body == page.model_dump_json().encode()
+
+
+def test_dumps_plain_content_keeps_decimal_as_string():
+    product_id = uuid4()
+
+    body = dumps({"id": product_id, "price": Decimal("10.50"), "at": NOW})
+
+    assert json.loads(body) == {
+        "id": str(product_id),
+        "price": "10.50",
+        "at": "2024-01-01T12:00:00+00:00",
+    }
+
+
+def test_dumps_rejects_unknown_types():
+    with pytest.raises(TypeError):
+        dumps({"value": object()})
@@ -0,0 +1,50 @@
+import pytest
+
+from store.core.core_metrics import MetricsRegistry, track_usecase, usecase_duration
+
+
+def test_registry_renders_counters_and_histograms():
+    registry = MetricsRegistry()
+    requests = registry.counter("requests_total", "Requisições", ("route", "status"))
+    latency = registry.histogram("latency_seconds", "Latência", buckets=(0.1, 1.0))
+
+    requests.labels("/products/", "200").inc()
+    requests.labels("/products/", "200").inc()
+    latency.labels().observe(0.05)
+    latency.labels().observe(0.5)
+    latency.labels().observe(5)
+
+    text = registry.render()
+
+    assert "# TYPE requests_total counter" in text
+    assert 'requests_total{route="/products/",status="200"} 2' in text
+    assert 'latency_seconds_bucket{le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{le="1"} 2' in text
+    assert 'latency_seconds_bucket{le="+Inf"} 3' in text
+    assert "latency_seconds_count 3" in text
+
+
+def test_registry_renders_collectors():
+    registry = MetricsRegistry()
+    registry.collector(lambda: [("pool_size", "gauge", "Conexões", {"pool": "p"}, 3)])
+
+    assert 'pool_size{pool="p"} 3' in registry.render()
+
+
+@pytest.mark.asyncio
+async def test_track_usecase_counts_outcomes():
+    @track_usecase("test.failing")
+    async def failing():
+        raise ValueError
+
+    @track_usecase("test.generator")
+    async def generator():
+        yield 1
+        yield 2
+
+    with pytest.raises(ValueError):
+        await failing()
+    assert [item async for item in generator()] == [1, 2]
+
+    assert usecase_duration.labels("test.failing", "error").count == 1
+    assert usecase_duration.labels("test.generator", "ok").count == 1
@@ -0,0 +1,66 @@
+import asyncio
+
+import pytest
+
+from store.core.core_singleflight import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_execution():
+    flights = SingleFlight()
+    executions = 0
+
+    async def fetch():
+        nonlocal executions
+        executions += 1
+        await asyncio.sleep(0.01)
+        return executions
+
+    results = await asyncio.gather(*(flights.do("key", fetch) for _ in range(5)))
+
+    assert results == [1] * 5
+    assert flights.stats() == {"in_flight": 0, "calls": 1, "coalesced": 4}
+    # Terminada a chamada, a próxima executa de novo
+    assert await flights.do("key", fetch) == 2
+
+
+@pytest.mark.asyncio
+async def test_errors_are_shared_and_cancellation_does_not_abort_others():
+    flights = SingleFlight()
+    release = asyncio.Event()
+
+    async def failing():
+        await release.wait()
+        raise ValueError("boom")
+
+    leader = asyncio.ensure_future(flights.do("key", failing))
+    follower = asyncio.ensure_future(flights.do("key", failing))
+    await asyncio.sleep(0)
+    leader.cancel()
+    release.set()
+
+    with pytest.raises(ValueError):
+        await follower
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+
+
+@pytest.mark.asyncio
+async def test_forget_starts_a_new_call_for_later_callers():
+    flights = SingleFlight()
+    release = asyncio.Event()
+    values = iter(["old", "new"])
+
+    async def fetch():
+        value = next(values)
+        await release.wait()
+        return value
+
+    first = asyncio.ensure_future(flights.do(("get", 1), fetch))
+    await asyncio.sleep(0)
+    flights.forget_if(lambda key: key[0] == "get")
+    second = asyncio.ensure_future(flights.do(("get", 1), fetch))
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await asyncio.gather(first, second) == ["old", "new"]
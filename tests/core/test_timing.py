@@ -0,0 +1,38 @@
+import pytest
+
+from store.core import core_timing
+from store.core.core_timing import RequestTimings, record, timed_connection
+from store.db.db_postgres import db_client
+
+
+def test_request_timings_header_lists_phases_app_and_total():
+    timings = RequestTimings()
+    timings.add("db-exec", 0.002)
+    timings.add("db-exec", 0.001)
+
+    summary = timings.summary()
+    header = timings.header()
+
+    assert summary["db-exec"] == pytest.approx(3.0)
+    assert summary["app"] >= 0
+    assert header.startswith("db-exec;dur=3.000, app;dur=")
+    assert "total;dur=" in header
+
+
+def test_record_outside_request_is_ignored():
+    record("db-exec", 1.0)
+
+
+@pytest.mark.asyncio
+async def test_timed_connection_records_db_phases():
+    timings = RequestTimings()
+    token = core_timing._current.set(timings)
+    try:
+        async with timed_connection(db_client.pool) as conn:
+            async with conn.cursor() as cur:
+                await cur.execute("SELECT 1")
+                await cur.fetchone()
+    finally:
+        core_timing._current.reset(token)
+
+    assert set(timings.phases) == {"db-acquire", "db-exec", "db-fetch"}
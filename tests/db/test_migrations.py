@@ -0,0 +1,115 @@
+import os
+from decimal import Decimal
+from typing import Any
+
+import pytest
+
+from store.core.core_exceptions import MigrationException
+from store.db.db_migrations import (
+    Migration,
+    load_migrations,
+    migrate,
+    pending_migrations,
+)
+from store.db.db_postgres import db_client
+from store.schemas.schemas_product import ProductFilter
+from store.usecases.usecases_product import ProductUsecase
+
+
+def test_load_migrations_in_version_order():
+    versions = [migration.version for migration in load_migrations()]
+
+    assert versions == sorted(versions)
+    assert versions[:2] == [1, 2]
+
+
+def test_pending_migrations_rejects_changed_files():
+    migration = Migration(version=1, name="create", sql="SELECT 1;")
+
+    assert pending_migrations([migration], {}) == [migration]
+    assert pending_migrations([migration], {1: migration.checksum}) == []
+    with pytest.raises(MigrationException):
+        pending_migrations([migration], {1: "other"})
+
+
+@pytest.mark.asyncio
+async def test_migrate_is_idempotent():
+    # O conftest já aplicou tudo; uma nova execução não faz nada
+    assert await migrate(os.environ["DATABASE_URL"]) == []
+
+    async with db_client.pool.connection() as conn:
+        cursor = await conn.execute("SELECT max(version) FROM schema_migrations;")
+        (version,) = await cursor.fetchone()
+
+    assert version == load_migrations()[-1].version
+
+
+# Massa com distribuição parecida com a real: poucos inativos, poucos
+# itens com estoque baixo e poucos nomes com "Iphone"
+SAMPLE_ROWS = """
+INSERT INTO products (id, name, description, quantity, price, status,
+                      created_at, updated_at)
+SELECT gen_random_uuid(),
+       CASE WHEN g % 500 = 0 THEN 'Iphone ' || g ELSE 'Produto ' || g END,
+       'Descrição do produto ' || g,
+       CASE WHEN g % 100 = 0 THEN g % 10 ELSE 50 + g % 500 END,
+       (g % 10000) / 10.0, g % 10 <> 0,
+       now() - g * interval '1 minute', now()
+FROM generate_series(1, 20000) AS g;
+"""
+
+
+async def _plan(sql: str, values: Any) -> str:
+    """
+    Plano (texto) escolhido pelo planner, sem desligar seq scan, numa cópia
+    de products criada pelas migrations num schema próprio, com massa e
+    estatísticas controladas. Tudo é desfeito no fim: o ANALYZE não mexe
+    nas estatísticas da tabela usada pelos outros testes.
+    """
+    async with db_client.pool.connection() as conn:
+        async with conn.transaction(force_rollback=True):
+            await conn.execute("CREATE SCHEMA plan_check;")
+            await conn.execute("SET LOCAL search_path = plan_check, public;")
+            # Tabela, massa e só então índices e busca: índices criados
+            # sobre os dados, como numa tabela já vacuumizada (o GIN não
+            # fica com tudo na lista pendente)
+            table, *indexes = [m for m in load_migrations() if m.version <= 3]
+            await conn.execute(table.sql)
+            await conn.execute(SAMPLE_ROWS)
+            for migration in indexes:
+                await conn.execute(migration.sql)
+            await conn.execute("ANALYZE plan_check.products;")
+            cursor = await conn.execute(f"EXPLAIN {sql}", values)
+            return "\n".join(row[0] for row in await cursor.fetchall())
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "filters, index",
+    [
+        (ProductFilter(), "products_created_at_id_idx"),
+        (ProductFilter(sort="name", order="desc"), "products_name_id_idx"),
+        (ProductFilter(status=False), "products_status_created_at_id_idx"),
+        (ProductFilter(status=True, sort="name"), "products_status_name_id_idx"),
+        (
+            ProductFilter(min_price=Decimal("100"), max_price=Decimal("110")),
+            "products_price_idx",
+        ),
+        (ProductFilter(status=True, max_quantity=5), "products_low_stock_idx"),
+    ],
+)
+async def test_page_queries_use_indexes(filters, index):
+    sql, values = ProductUsecase(pool=db_client.pool)._page_sql(filters, "id")
+
+    assert index in await _plan(sql, values)
+
+
+@pytest.mark.asyncio
+async def test_search_uses_gin_index():
+    plan = await _plan(
+        "SELECT id FROM products, websearch_to_tsquery('simple', %s) AS query "
+        "WHERE search_vector @@ query;",
+        ("iphone",),
+    )
+
+    assert "products_search_idx" in plan
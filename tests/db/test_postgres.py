@@ -0,0 +1,253 @@
+import asyncio
+import json
+import os
+
+import pytest
+from psycopg.errors import QueryCanceled
+
+from store.core.core_changes import ChangePublisher
+from store.db.db_postgres import PostgresClient
+from store.db.db_warmup import WARMUP_STATEMENTS, warm_connection
+from store.schemas.schemas_product import ProductIn
+from store.usecases.usecases_product import ProductUsecase
+
+
+@pytest.mark.asyncio
+async def test_connect_applies_pool_settings_and_warms_up():
+    client = PostgresClient()
+    await client.connect(
+        os.environ["DATABASE_URL"], min_size=1, max_size=4, warmup_size=3
+    )
+    try:
+        stats = client.stats()
+
+        assert (stats["pool_min"], stats["pool_max"]) == (1, 4)
+        assert stats["pool_size"] == 3
+        assert stats["connections_in_use"] == 0
+    finally:
+        await client.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_stats_reports_connections_in_use():
+    client = PostgresClient()
+    await client.connect(os.environ["DATABASE_URL"], min_size=1, max_size=2)
+    try:
+        async with client.pool.connection():
+            stats = client.stats()
+
+        assert stats["connections_in_use"] == 1
+        assert stats["requests_num"] >= 1
+    finally:
+        await client.disconnect()
+
+
+def test_stats_requires_open_pool():
+    with pytest.raises(ConnectionError):
+        PostgresClient().stats()
+
+
+@pytest.mark.asyncio
+async def test_read_pool_without_replicas_is_primary():
+    client = PostgresClient()
+    await client.connect(os.environ["DATABASE_URL"], max_size=2)
+    try:
+        assert client.read_pool() is client.pool
+    finally:
+        await client.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_read_pool_round_robin_between_replicas():
+    dsn = os.environ["DATABASE_URL"]
+    client = PostgresClient()
+    # O mesmo banco faz o papel de duas réplicas
+    await client.connect(dsn, max_size=2, replica_dsns=[dsn, dsn])
+    try:
+        first, second = client.replica_pools
+
+        assert [client.read_pool() for _ in range(4)] == [
+            first,
+            second,
+            first,
+            second,
+        ]
+    finally:
+        await client.disconnect()
+
+    assert client.replica_pools == []
+    assert first.closed and second.closed
+
+
+@pytest.mark.asyncio
+async def test_read_pool_least_busy_replica():
+    dsn = os.environ["DATABASE_URL"]
+    client = PostgresClient()
+    await client.connect(
+        dsn, max_size=2, replica_dsns=[dsn, dsn], replica_selection="least_busy"
+    )
+    try:
+        first, second = client.replica_pools
+        async with first.connection():
+            assert client.read_pool() is second
+        async with second.connection():
+            assert client.read_pool() is first
+    finally:
+        await client.disconnect()
+
+
+async def _wait_listening(client: PostgresClient, channel: str) -> None:
+    for _ in range(100):
+        if channel in client.listening:
+            return
+        await asyncio.sleep(0.05)
+    raise AssertionError(f"LISTEN {channel} não foi ativado")
+
+
+@pytest.mark.asyncio
+async def test_subscribe_receives_product_changes():
+    client = PostgresClient()
+    await client.connect(os.environ["DATABASE_URL"], min_size=1, max_size=2)
+    received: asyncio.Queue = asyncio.Queue()
+    unsubscribe = client.subscribe("product_changes", received.put_nowait)
+    try:
+        await _wait_listening(client, "product_changes")
+        async with client.pool.connection() as conn:
+            cursor = await conn.execute(
+                "INSERT INTO products (id, name, quantity, price, status) "
+                "VALUES (gen_random_uuid(), 'Notify', 1, 1.00, true) RETURNING id;"
+            )
+            (product_id,) = await cursor.fetchone()
+            await conn.execute("DELETE FROM products WHERE id = %s;", (product_id,))
+
+        changes = [
+            json.loads(await asyncio.wait_for(received.get(), timeout=5))
+            for _ in range(2)
+        ]
+
+        assert changes == [
+            {"op": "insert", "id": str(product_id)},
+            {"op": "delete", "id": str(product_id)},
+        ]
+    finally:
+        unsubscribe()
+        await client.disconnect()
+
+    assert client.listening == set()
+    assert client.subscribers == {"product_changes": []}
+
+
+@pytest.mark.asyncio
+async def test_trigger_sends_one_notice_per_statement():
+    client = PostgresClient()
+    await client.connect(os.environ["DATABASE_URL"], min_size=1, max_size=2)
+    received: asyncio.Queue = asyncio.Queue()
+    unsubscribe = client.subscribe("product_changes", received.put_nowait)
+    try:
+        await _wait_listening(client, "product_changes")
+        async with client.pool.connection() as conn:
+            await conn.execute(
+                "INSERT INTO products (id, name, quantity, price, status) "
+                "SELECT gen_random_uuid(), 'Notify ' || g, 1, 1.00, true "
+                "FROM generate_series(1, 3) AS g;"
+            )
+
+        change = json.loads(await asyncio.wait_for(received.get(), timeout=5))
+        await asyncio.sleep(0.2)
+
+        assert change == {"op": "insert", "id": None, "count": 3}
+        assert received.empty()
+    finally:
+        unsubscribe()
+        await client.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_writes_publish_changes_after_commit_instead_of_trigger(product_data):
+    client = PostgresClient()
+    # Como no startup da App com o publicador: a trigger não notifica
+    await client.connect(
+        os.environ["DATABASE_URL"], min_size=1, max_size=2, notify_changes=False
+    )
+    received: asyncio.Queue = asyncio.Queue()
+    unsubscribe = client.subscribe("product_changes", received.put_nowait)
+    try:
+        await _wait_listening(client, "product_changes")
+        publisher = ChangePublisher(window=0.05)
+        usecase = ProductUsecase(pool=client.pool, publisher=publisher)
+
+        product = await usecase.create(body=ProductIn(**product_data))
+        await usecase.delete(id=product.id)
+        await publisher.drain()
+
+        changes = [
+            json.loads(await asyncio.wait_for(received.get(), timeout=5))
+            for _ in range(2)
+        ]
+        await asyncio.sleep(0.2)
+
+        assert changes == [
+            {"op": "insert", "id": str(product.id)},
+            {"op": "delete", "id": str(product.id)},
+        ]
+        # Um único envio para as duas escritas, e nenhum aviso da trigger
+        assert publisher.stats()["flushes"] == 1
+        assert received.empty()
+    finally:
+        unsubscribe()
+        await client.disconnect()
+
+
+async def _prepared_statements(*conns) -> tuple[int, int]:
+    """(statements preparados, execuções deles) somados nas conexões."""
+    total = executions = 0
+    for conn in conns:
+        cursor = await conn.execute(
+            "SELECT count(*), coalesce(sum(generic_plans + custom_plans), 0) "
+            "FROM pg_prepared_statements;",
+            prepare=False,
+        )
+        count, runs = await cursor.fetchone()
+        total, executions = total + count, executions + runs
+    return total, executions
+
+
+@pytest.mark.asyncio
+async def test_warm_connections_serve_first_request_prepared(product_inserted):
+    client = PostgresClient()
+    await client.connect(
+        os.environ["DATABASE_URL"],
+        min_size=1,
+        max_size=2,
+        warmup_size=2,
+        configure=warm_connection(prepare=True),
+    )
+    try:
+        # Antes da primeira requisição, toda conexão já tem as leituras
+        # preparadas (cada uma executada uma vez pelo aquecimento)
+        async with client.pool.connection() as a, client.pool.connection() as b:
+            warm = await _prepared_statements(a, b)
+        assert warm == (2 * len(WARMUP_STATEMENTS), 2 * len(WARMUP_STATEMENTS))
+
+        await ProductUsecase(pool=client.pool).get(id=product_inserted.id)
+
+        # A requisição executou um statement já preparado, sem preparar outro
+        async with client.pool.connection() as a, client.pool.connection() as b:
+            after = await _prepared_statements(a, b)
+        assert after == (warm[0], warm[1] + 1)
+    finally:
+        await client.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_statement_timeout_cancels_slow_queries():
+    client = PostgresClient()
+    await client.connect(
+        os.environ["DATABASE_URL"], min_size=1, max_size=1, statement_timeout=50
+    )
+    try:
+        async with client.pool.connection() as conn:
+            with pytest.raises(QueryCanceled):
+                await conn.execute("SELECT pg_sleep(1);")
+    finally:
+        await client.disconnect()
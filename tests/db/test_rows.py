@@ -0,0 +1,51 @@
+from datetime import datetime, timezone
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+
+from store.db.db_rows import model_row
+from store.schemas.schemas_product import ProductOut
+
+
+@pytest.mark.asyncio
+async def test_model_row_builds_schema_from_database_row(product_usecase, product_in):
+    product = await product_usecase.create(body=product_in)
+
+    async with product_usecase.pool.connection() as conn:
+        async with conn.cursor(row_factory=model_row(ProductOut)) as cur:
+            await cur.execute(
+                "SELECT id, name, description, price, quantity, status, "
+                "created_at, updated_at FROM products WHERE id = %s;",
+                (product.id,),
+            )
+            row = await cur.fetchone()
+
+    assert isinstance(row, ProductOut)
+    assert row == ProductOut.model_validate(row.model_dump())
+    assert row.price == Decimal("8500.00")
+
+
+def test_model_row_output_serializes_like_validated_model():
+    now = datetime.now(timezone.utc)
+    fields = {
+        "id": uuid4(),
+        "name": "Name",
+        "description": None,
+        "price": Decimal("1.50"),
+        "quantity": 1,
+        "status": True,
+        "created_at": now,
+        "updated_at": now,
+    }
+
+    class Column:
+        def __init__(self, name):
+            self.name = name
+
+    class Cursor:
+        description = [Column(name) for name in fields]
+
+    row = model_row(ProductOut)(Cursor())(tuple(fields.values()))
+
+    assert row.model_dump_json() == ProductOut(**fields).model_dump_json()
@@ -1,7 +1,11 @@
 from pydantic import ValidationError
 
 import pytest
-from store.schemas.schemas_product import ProductIn
+from store.schemas.schemas_product import (
+    ProductFilter,
+    ProductIn,
+    product_fields_schema,
+)
 from tests.factories import product_data
 
 
@@ -25,3 +29,14 @@ def test_schemas_return_raise():
         "input": {"name": "Iphone 14 Pro Max", "quantity": 10, "price": 8.5},
         "url": "https://errors.pydantic.dev/2.11/v/missing",
     }
+
+
+def test_schemas_fields_are_normalized_and_validated():
+    assert ProductFilter(fields=" price,id,price ").fields == "id,price"
+    assert product_fields_schema("id,price") is product_fields_schema("id,price")
+    assert list(product_fields_schema("id,price").model_fields) == ["id", "price"]
+
+    with pytest.raises(ValidationError, match="Unknown fields: cost"):
+        ProductFilter(fields="name,cost")
+    with pytest.raises(ValidationError):
+        ProductFilter(fields=" , ")
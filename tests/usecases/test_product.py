@@ -1,9 +1,36 @@
+import asyncio
+import json
+import os
 import pytest
+from psycopg import Error as PsycopgError
 from uuid import UUID, uuid4
 from datetime import datetime
 
-from store.schemas.schemas_product import ProductOut
-from store.core.core_exceptions import NotFoundException
+from decimal import Decimal
+
+from store.core.core_cache import LRUCache
+from store.core.core_coalescer import WriteCoalescer
+from store.core.core_cursor import encode_cursor
+from store.core.core_singleflight import SingleFlight
+from store.schemas.schemas_product import (
+    ProductBatchReserve,
+    ProductBatchUpdate,
+    ProductFilter,
+    ProductIn,
+    ProductOut,
+    ProductReserve,
+    ProductSearch,
+    ProductUpdate,
+)
+from store.usecases.usecases_product import ProductUsecase
+from psycopg_pool import AsyncConnectionPool
+from store.core.core_exceptions import (
+    InsufficientStockException,
+    InvalidCursorException,
+    InvalidRowException,
+    NotFoundException,
+)
+from store.db.db_postgres import db_client
 
 
 @pytest.mark.asyncio
@@ -42,10 +69,80 @@ async def test_get_product_not_found(product_usecase):
 
 @pytest.mark.asyncio
 async def test_query_products_success(product_usecase, products_inserted):
-    products = await product_usecase.query()
+    page = await product_usecase.query()
+
+    assert isinstance(page.items, list)
+    assert len(page.items) == len(products_inserted)
+    assert page.next_cursor is None
+
 
-    assert isinstance(products, list)
-    assert len(products) == len(products_inserted)
+@pytest.mark.asyncio
+async def test_query_products_paginates_with_cursor(product_usecase, products_inserted):
+    first = await product_usecase.query(filters=ProductFilter(limit=2))
+    assert [p.id for p in first.items] == [p.id for p in products_inserted[:2]]
+    assert first.next_cursor is not None
+
+    second = await product_usecase.query(
+        filters=ProductFilter(limit=2, cursor=first.next_cursor)
+    )
+    assert [p.id for p in second.items] == [products_inserted[2].id]
+    assert second.next_cursor is None
+
+
+@pytest.mark.asyncio
+async def test_query_products_sorted_by_name_desc(product_usecase, products_inserted):
+    filters = ProductFilter(limit=1, sort="name", order="desc")
+    names = []
+    while True:
+        page = await product_usecase.query(filters=filters)
+        names.extend(p.name for p in page.items)
+        if page.next_cursor is None:
+            break
+        filters = filters.model_copy(update={"cursor": page.next_cursor})
+
+    assert names == ["Product 3", "Product 2", "Product 1"]
+
+
+@pytest.mark.asyncio
+async def test_query_products_filters(product_usecase, product_in):
+    for price, quantity, status in (
+        (Decimal("4500.00"), 20, True),
+        (Decimal("6500.00"), 5, True),
+        (Decimal("7500.00"), 3, False),
+    ):
+        await product_usecase.create(
+            body=product_in.model_copy(
+                update={"price": price, "quantity": quantity, "status": status}
+            )
+        )
+
+    page = await product_usecase.query(
+        filters=ProductFilter(min_price=Decimal("5000"), max_price=Decimal("8000"))
+    )
+    assert sorted(p.price for p in page.items) == [
+        Decimal("6500.00"),
+        Decimal("7500.00"),
+    ]
+
+    page = await product_usecase.query(
+        filters=ProductFilter(status=True, max_quantity=10)
+    )
+    assert [p.quantity for p in page.items] == [5]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "not-a-cursor",
+        encode_cursor(
+            {"sort": "created_at", "order": "asc", "key": ["2024-01-01T00:00:00", 5]}
+        ),
+    ],
+)
+async def test_query_products_invalid_cursor(product_usecase, cursor):
+    with pytest.raises(InvalidCursorException):
+        await product_usecase.query(filters=ProductFilter(cursor=cursor))
 
 
 @pytest.mark.asyncio
@@ -83,3 +180,527 @@ async def test_delete_product_not_found(product_usecase):
         await product_usecase.delete(id=uuid4())
 
     assert "Product not found" in str(err.value)
+
+
+@pytest.mark.asyncio
+async def test_export_products_in_batches(product_usecase, products_inserted):
+    batches = [batch async for batch in product_usecase.export(batch_size=2)]
+
+    assert [len(batch) for batch in batches] == [2, 1]
+    assert [p.id for batch in batches for p in batch] == [
+        p.id for p in products_inserted
+    ]
+
+
+async def _aiter(items):
+    for item in items:
+        yield item
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_products(product_usecase, product_data):
+    items = [
+        {**product_data, "name": "Product 1"},
+        {"name": "Invalid", "quantity": 1},
+        '{"name": "Product 2", "quantity": 1, "price": "10.00", "status": true}',
+        "{not json",
+    ]
+
+    result = await product_usecase.bulk_create(items=_aiter(items), batch_size=2)
+
+    assert len(result.ids) == 2
+    assert [error.index for error in result.errors] == [1, 3]
+
+    page = await product_usecase.query()
+    assert sorted(p.id for p in page.items) == sorted(result.ids)
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_reports_column_limits_per_row(product_usecase, product_data):
+    items = [
+        {**product_data, "name": "x" * 256},
+        {**product_data, "price": Decimal("100000000.00")},
+        {**product_data, "quantity": 2**31},
+        {**product_data, "description": "x" * 1001},
+        product_data,
+    ]
+
+    result = await product_usecase.bulk_create(items=_aiter(items), batch_size=2)
+
+    assert [error.index for error in result.errors] == [0, 1, 2, 3]
+    assert len(result.ids) == 1
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_names_the_row_rejected_by_the_database(
+    product_usecase, product_data
+):
+    # NUL passa pelo schema, mas o Postgres não aceita em texto
+    items = [product_data, {"name": "Invalid"}, {**product_data, "name": "a\x00b"}]
+
+    with pytest.raises(InvalidRowException) as exc:
+        await product_usecase.bulk_create(items=_aiter(items), batch_size=2)
+
+    assert exc.value.index == 2
+    assert "Item 2" in exc.value.message
+    page = await product_usecase.query()
+    assert page.items == []
+
+
+@pytest.mark.asyncio
+async def test_batch_update_products(product_usecase, products_inserted):
+    missing_id = uuid4()
+    items = [
+        ProductBatchUpdate(id=products_inserted[0].id, price=Decimal("10.00")),
+        ProductBatchUpdate(id=products_inserted[1].id, quantity=1, status=False),
+        ProductBatchUpdate(id=products_inserted[0].id, quantity=7),
+        ProductBatchUpdate(id=missing_id, quantity=3),
+    ]
+
+    result = await product_usecase.batch_update(items=items)
+
+    assert [p.id for p in result.updated] == [
+        products_inserted[0].id,
+        products_inserted[1].id,
+    ]
+    assert result.not_found == [missing_id]
+
+    first, second = result.updated
+    assert (first.price, first.quantity) == (Decimal("10.00"), 7)
+    assert (second.quantity, second.status) == (1, False)
+    assert second.price == products_inserted[1].price
+
+
+@pytest.mark.asyncio
+async def test_get_product_uses_cache_and_update_invalidates(
+    product_usecase, product_inserted, product_up
+):
+    cache = LRUCache(max_size=10, ttl=60)
+    product_usecase.cache = cache
+
+    first = await product_usecase.get(id=product_inserted.id)
+    second = await product_usecase.get(id=product_inserted.id)
+    assert second is first
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    await product_usecase.update(id=product_inserted.id, body=product_up)
+    refreshed = await product_usecase.get(id=product_inserted.id)
+    assert refreshed.price == product_up.price
+
+    await product_usecase.delete(id=product_inserted.id)
+    with pytest.raises(NotFoundException):
+        await product_usecase.get(id=product_inserted.id)
+
+
+@pytest.mark.asyncio
+async def test_preload_cache_loads_most_recently_updated(
+    product_usecase, products_inserted
+):
+    cache = LRUCache(max_size=10, ttl=60)
+    product_usecase.cache = cache
+
+    assert await product_usecase.preload_cache(limit=2) == 2
+    assert cache.get(products_inserted[0].id) is None
+    assert (await product_usecase.get(id=products_inserted[2].id)).name == "Product 3"
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_sparse_fields_select_and_serialize_only_requested(
+    product_usecase, products_inserted
+):
+    page = await product_usecase.query(
+        filters=ProductFilter(fields="name,price", sort="name", limit=2)
+    )
+    first = page.items[0]
+
+    assert json.loads(first.model_dump_json()) == {
+        "name": "Product 1",
+        "price": "8500.00",
+    }
+    # Colunas internas (ETag, cursor) ficam acessíveis, mas fora do JSON
+    assert first.id == products_inserted[0].id
+    assert page.next_cursor is not None
+    next_page = await product_usecase.query(
+        filters=ProductFilter(
+            fields="name,price", sort="name", limit=2, cursor=page.next_cursor
+        )
+    )
+    assert [item.name for item in next_page.items] == ["Product 3"]
+
+    cache = LRUCache(max_size=10, ttl=60)
+    product_usecase.cache = cache
+    for _ in range(2):  # banco, depois projeção do item em cache
+        product = await product_usecase.get(id=products_inserted[1].id)
+        slim = await product_usecase.get(id=products_inserted[1].id, fields="id")
+        assert slim.model_dump(mode="json") == {"id": str(product.id)}
+        assert slim.updated_at == product.updated_at
+
+
+@pytest.mark.asyncio
+async def test_get_many_keeps_request_order_and_uses_cache(
+    product_usecase, products_inserted
+):
+    first, second, third = (product.id for product in products_inserted)
+    unknown = uuid4()
+    cache = LRUCache(max_size=10, ttl=60)
+    product_usecase.cache = cache
+    await product_usecase.get(id=second)
+
+    result = await product_usecase.get_many(ids=[third, unknown, second, third, first])
+
+    assert [product.id for product in result.items] == [third, second, first]
+    assert result.missing == [unknown]
+    # second veio do cache; os demais foram buscados e guardados nele
+    assert (cache.hits, len(cache)) == (1, 3)
+
+    slim = await product_usecase.get_many(ids=[first, unknown], fields="name")
+    assert json.loads(slim.model_dump_json()) == {
+        "items": [{"name": "Product 1"}],
+        "missing": [str(unknown)],
+    }
+
+
+@pytest.mark.asyncio
+async def test_update_product_ignores_null_fields(product_usecase, product_inserted):
+    updated = await product_usecase.update(
+        id=product_inserted.id, body=ProductUpdate(price=None, quantity=2)
+    )
+
+    assert updated.price == product_inserted.price
+    assert updated.quantity == 2
+
+
+@pytest.mark.asyncio
+async def test_usecase_prepares_fixed_statements_once_per_connection(
+    product_inserted,
+):
+    pool = AsyncConnectionPool(
+        os.environ["DATABASE_URL"], min_size=1, max_size=1, open=False
+    )
+    await pool.open()
+    try:
+        usecase = ProductUsecase(pool=pool)
+        for _ in range(3):
+            await usecase.get(id=product_inserted.id)
+
+        async with pool.connection() as conn:
+            cur = await conn.execute(
+                "SELECT count(*) FROM pg_prepared_statements "
+                "WHERE statement LIKE 'SELECT id, name%%WHERE id = $1%%';"
+            )
+            assert (await cur.fetchone())[0] == 1
+    finally:
+        await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_batch_update_without_pipeline_or_prepare(
+    product_usecase, products_inserted
+):
+    usecase = ProductUsecase(pool=product_usecase.pool, prepare=False, pipeline=False)
+
+    result = await usecase.batch_update(
+        items=[
+            ProductBatchUpdate(id=products_inserted[0].id, quantity=1),
+            ProductBatchUpdate(id=products_inserted[1].id, status=False),
+        ]
+    )
+
+    assert [p.id for p in result.updated] == [p.id for p in products_inserted[:2]]
+
+
+@pytest.mark.asyncio
+async def test_usecase_reads_from_replica_until_a_write(
+    product_usecase, product_inserted, product_up
+):
+    replica = AsyncConnectionPool(
+        os.environ["DATABASE_URL"], min_size=1, max_size=1, open=False
+    )
+    await replica.open()
+    try:
+        usecase = ProductUsecase(pool=product_usecase.pool, read_pool=replica)
+        assert usecase._reader() is replica
+
+        await usecase.get(id=product_inserted.id)
+        assert replica.get_stats()["requests_num"] == 1
+
+        await usecase.update(id=product_inserted.id, body=product_up)
+        assert usecase._reader() is product_usecase.pool
+
+        product = await usecase.get(id=product_inserted.id)
+        assert product.price == product_up.price
+        assert replica.get_stats()["requests_num"] == 1
+    finally:
+        await replica.close()
+
+
+@pytest.mark.asyncio
+async def test_cache_misses_are_filled_from_the_primary_not_a_lagging_replica(
+    product_usecase, product_inserted, product_up
+):
+    # Réplica atrasada: cópia de products tirada antes da escrita, lida
+    # pelo search_path das conexões do pool da réplica
+    async with product_usecase.pool.connection() as conn:
+        await conn.execute("CREATE SCHEMA lagging_replica;")
+        await conn.execute(
+            "CREATE TABLE lagging_replica.products AS SELECT * FROM products;"
+        )
+    replica = AsyncConnectionPool(
+        os.environ["DATABASE_URL"],
+        min_size=1,
+        max_size=1,
+        open=False,
+        kwargs={"options": "-c search_path=lagging_replica"},
+    )
+    await replica.open()
+    cache = LRUCache(max_size=10, ttl=60)
+    try:
+        writer = ProductUsecase(pool=product_usecase.pool, cache=cache)
+        await writer.get(id=product_inserted.id)
+        await writer.update(id=product_inserted.id, body=product_up)
+
+        # Requisição seguinte, já depois da invalidação: a falta vai ao
+        # primário, e a leitura seguinte sai do cache
+        reader = ProductUsecase(
+            pool=product_usecase.pool, read_pool=replica, cache=cache
+        )
+        first = await reader.get(id=product_inserted.id)
+        hits = cache.hits
+        second = await reader.get(id=product_inserted.id)
+        batch = await reader.get_many(ids=[product_inserted.id])
+
+        assert first.price == second.price == batch.items[0].price
+        assert first.price == product_up.price
+        assert cache.hits == hits + 2
+        assert replica.get_stats().get("requests_num", 0) == 0
+
+        # Sem cache, a réplica continua atendendo as leituras
+        uncached = ProductUsecase(pool=product_usecase.pool, read_pool=replica)
+        stale = await uncached.get(id=product_inserted.id)
+        assert stale.price == product_inserted.price
+    finally:
+        await replica.close()
+        async with product_usecase.pool.connection() as conn:
+            await conn.execute("DROP SCHEMA lagging_replica CASCADE;")
+
+
+async def _insert_search_products(product_usecase):
+    for name, description in [
+        ("Iphone 14 Pro Max", "Smartphone Apple"),
+        ("Capa para Iphone", "Acessório de silicone"),
+        ("Galaxy S23", "Smartphone Samsung, concorrente do Iphone"),
+        ("Notebook Dell", "Notebook para trabalho"),
+    ]:
+        await product_usecase.create(
+            body=ProductIn(
+                name=name,
+                description=description,
+                quantity=1,
+                price=Decimal("10.00"),
+                status=True,
+            )
+        )
+
+
+@pytest.mark.asyncio
+async def test_search_ranks_name_matches_first_and_paginates(product_usecase):
+    await _insert_search_products(product_usecase)
+
+    page = await product_usecase.search(ProductSearch(q="iphone", limit=2))
+
+    # Termo no nome (peso A) vem antes do termo só na descrição (peso B)
+    assert {p.name for p in page.items} == {"Iphone 14 Pro Max", "Capa para Iphone"}
+    assert page.next_cursor is not None
+
+    page = await product_usecase.search(
+        ProductSearch(q="iphone", limit=2, cursor=page.next_cursor)
+    )
+
+    assert [p.name for p in page.items] == ["Galaxy S23"]
+    assert page.next_cursor is None
+
+    with pytest.raises(InvalidCursorException):
+        await product_usecase.search(
+            ProductSearch(q="notebook", cursor=page.next_cursor or "invalid")
+        )
+
+
+@pytest.mark.asyncio
+async def test_search_tolerates_typos_with_pg_trgm(product_usecase):
+    # Checado aqui, e não num skipif: as extensões só são conhecidas depois
+    # que a fixture conecta ao banco
+    if "pg_trgm" not in db_client.extensions:
+        pytest.skip("pg_trgm não disponível")
+    await _insert_search_products(product_usecase)
+    product_usecase.fuzzy_search = True
+
+    page = await product_usecase.search(ProductSearch(q="notebok"))
+
+    assert [p.name for p in page.items] == ["Notebook Dell"]
+
+
+@pytest.mark.asyncio
+async def test_reserve_decrements_or_reports_shortage(
+    product_usecase, product_inserted
+):
+    product = await product_usecase.reserve(
+        id=product_inserted.id, body=ProductReserve(quantity=4)
+    )
+    assert product.quantity == product_inserted.quantity - 4
+
+    with pytest.raises(InsufficientStockException) as exc:
+        await product_usecase.reserve(
+            id=product_inserted.id, body=ProductReserve(quantity=100)
+        )
+    assert exc.value.shortages[0].available == product.quantity
+
+    with pytest.raises(NotFoundException):
+        await product_usecase.reserve(id=uuid4(), body=ProductReserve(quantity=1))
+
+
+@pytest.mark.asyncio
+async def test_concurrent_reserves_never_oversell(product_usecase, product_inserted):
+    # product_inserted tem 10 unidades; 30 clientes disputam a mesma linha
+    async def reserve():
+        try:
+            await product_usecase.reserve(
+                id=product_inserted.id, body=ProductReserve(quantity=1)
+            )
+            return True
+        except InsufficientStockException:
+            return False
+
+    results = await asyncio.gather(*(reserve() for _ in range(30)))
+    product = await product_usecase.get(id=product_inserted.id)
+
+    assert results.count(True) == product_inserted.quantity
+    assert product.quantity == 0
+
+
+@pytest.mark.asyncio
+async def test_reserve_batch_is_all_or_nothing(product_usecase, products_inserted):
+    first, second, _ = products_inserted
+    products = await product_usecase.reserve_batch(
+        items=[
+            ProductBatchReserve(id=first.id, quantity=2),
+            ProductBatchReserve(id=second.id, quantity=3),
+            ProductBatchReserve(id=first.id, quantity=1),
+        ]
+    )
+    assert [(p.id, p.quantity) for p in products] == [(first.id, 7), (second.id, 7)]
+
+    with pytest.raises(InsufficientStockException) as exc:
+        await product_usecase.reserve_batch(
+            items=[
+                ProductBatchReserve(id=first.id, quantity=1),
+                ProductBatchReserve(id=second.id, quantity=50),
+            ]
+        )
+    assert [s.id for s in exc.value.shortages] == [second.id]
+    assert (await product_usecase.get(id=first.id)).quantity == 7
+
+    with pytest.raises(NotFoundException):
+        await product_usecase.reserve_batch(
+            items=[ProductBatchReserve(id=uuid4(), quantity=1)]
+        )
+
+
+@pytest.mark.asyncio
+async def test_concurrent_reads_are_coalesced(product_inserted):
+    flights = SingleFlight()
+    usecases = [ProductUsecase(pool=db_client.pool, flights=flights) for _ in range(20)]
+
+    products = await asyncio.gather(
+        *(usecase.get(id=product_inserted.id) for usecase in usecases)
+    )
+    pages = await asyncio.gather(
+        *(usecase.query(filters=ProductFilter(limit=5)) for usecase in usecases)
+    )
+
+    assert {product.id for product in products} == {product_inserted.id}
+    assert all(page.items[0].id == product_inserted.id for page in pages)
+    assert flights.stats() == {"in_flight": 0, "calls": 2, "coalesced": 38}
+
+
+async def _aggregate_stats(product_usecase) -> dict:
+    async with product_usecase.pool.connection() as conn:
+        cursor = await conn.execute(
+            "SELECT count(*), count(*) FILTER (WHERE status), "
+            "coalesce(sum(quantity), 0), coalesce(sum(price * quantity), 0), "
+            "count(*) FILTER (WHERE quantity <= 0) FROM products;"
+        )
+        return dict(
+            zip(
+                [
+                    "product_count",
+                    "active_count",
+                    "stock_units",
+                    "inventory_value",
+                    "out_of_stock_count",
+                ],
+                await cursor.fetchone(),
+            )
+        )
+
+
+@pytest.mark.asyncio
+async def test_stats_follow_every_write_path(product_usecase, product_data):
+    product = await product_usecase.create(body=ProductIn(**product_data))
+    await product_usecase.bulk_create(
+        items=_aiter([{**product_data, "status": False}] * 3), batch_size=2
+    )
+    await product_usecase.update(id=product.id, body=ProductUpdate(quantity=0))
+    await product_usecase.batch_update(
+        items=[ProductBatchUpdate(id=product.id, price=Decimal("1.00"))]
+    )
+    other = await product_usecase.create(body=ProductIn(**product_data))
+    await product_usecase.reserve(id=other.id, body=ProductReserve(quantity=4))
+    await product_usecase.delete(id=other.id)
+
+    stats = await product_usecase.stats()
+
+    assert stats.model_dump() == await _aggregate_stats(product_usecase)
+    assert (stats.product_count, stats.active_count) == (4, 1)
+    assert stats.out_of_stock_count == 1
+
+
+@pytest.mark.asyncio
+async def test_rebuild_stats_repairs_drift(product_usecase, products_inserted):
+    async with product_usecase.pool.connection() as conn:
+        await conn.execute("UPDATE product_stats SET product_count = 100;")
+
+    stats = await product_usecase.rebuild_stats()
+
+    assert stats.model_dump() == await _aggregate_stats(product_usecase)
+    assert stats.product_count == 3
+
+
+@pytest.mark.asyncio
+async def test_coalesced_creates_use_one_insert_and_isolate_errors(
+    product_usecase, product_in
+):
+    coalescer = WriteCoalescer(window=0.01, max_batch=256)
+    product_usecase.coalescer = coalescer
+    bodies = [
+        product_in.model_copy(update={"name": f"Coalesced {i}"}) for i in range(20)
+    ]
+
+    created = await asyncio.gather(*(product_usecase.create(body=b) for b in bodies))
+
+    assert [product.name for product in created] == [b.name for b in bodies]
+    assert coalescer.stats() == {"batches": 1, "items": 20, "pending": 0}
+    fetched = await product_usecase.get(id=created[7].id)
+    assert fetched.name == "Coalesced 7"
+
+    # Nome acima de VARCHAR(255): só esse chamador recebe o erro
+    too_long = product_in.model_copy(update={"name": "x" * 300})
+    results = await asyncio.gather(
+        product_usecase.create(body=bodies[0]),
+        product_usecase.create(body=too_long),
+        return_exceptions=True,
+    )
+
+    assert results[0].name == "Coalesced 0"
+    assert isinstance(results[1], PsycopgError)
+    assert (await product_usecase.stats()).product_count == 21